@@ -0,0 +1,131 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Page vs. buddy allocator on GVSoC
+=================================
+
+Builds the same model as `host_driven` project with `memory_allocator=page` and
+`memory_allocator=buddy` and reports the allocation and free cycles spent while creating the
+graph executor (SetupStorage allocates every tensor) and running the model, as well as the
+occupancy and fragmentation of the buddy arena.
+"""
+
+import os
+import sys
+import logging
+from pathlib import Path
+
+import numpy as np
+
+import tvm
+
+logging.basicConfig(level="WARNING", stream=sys.stdout)
+
+DIR = Path(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, str(DIR / "template_project"))
+
+from microtvm_gvsoc import create_graph_executor, memory_stats  # noqa: E402
+
+PULP_GCC_DIR = os.environ.get("PULP_GCC_DIR", None)
+assert PULP_GCC_DIR, "Missing environment variable: PULP_GCC_DIR"
+
+PULP_LLVM_DIR = os.environ.get("PULP_LLVM_DIR", None)
+assert PULP_LLVM_DIR, "Missing environment variable: PULP_LLVM_DIR (you can assign it with dummy value if llvm is not used.)"
+
+PULP_FREERTOS_DIR = os.environ.get("PULP_FREERTOS_DIR", None)
+assert PULP_FREERTOS_DIR, "Missing environment variable: PULP_FREERTOS_DIR"
+
+project_options = {
+    "project_type": "host_driven",
+    "verbose": False,
+    "debug": False,
+    "pulp_freertos_path": PULP_FREERTOS_DIR,
+    "pulp_gcc_path": PULP_GCC_DIR,
+    "pulp_llvm_path": PULP_LLVM_DIR,
+    "toolchain": "llvm",
+    "arch": "rv32imac",
+    "abi": "ilp32",
+    # The allocation and free cycles are only counted by profiling builds.
+    "profiling": True,
+}
+
+####################
+# Defining the model
+####################
+
+# A chain of small layers, so that the graph executor holds many tensors at the same time.
+data_shape = (1, 8, 16, 16)
+data = tvm.relay.var("data", tvm.relay.TensorType(data_shape, "float32"))
+y = data
+params = {}
+for i in range(6):
+    weight = tvm.relay.var(f"weight{i}", tvm.relay.TensorType((8, 8, 3, 3), "float32"))
+    y = tvm.relay.nn.relu(tvm.relay.nn.conv2d(y, weight, padding=(1, 1), kernel_size=(3, 3)))
+    params[f"weight{i}"] = np.random.rand(8, 8, 3, 3).astype("float32")
+relay_mod = tvm.IRModule.from_expr(tvm.relay.Function(tvm.relay.analysis.free_vars(y), y))
+relay_mod = tvm.relay.transform.InferType()(relay_mod)
+input_data = np.random.rand(*data_shape).astype("float32")
+
+TARGET = tvm.target.target.micro("host")
+RUNTIME = tvm.relay.backend.Runtime("crt", {"system-lib": True})
+EXECUTOR = tvm.relay.backend.Executor("graph", {"link-params": True})
+
+with tvm.transform.PassContext(opt_level=3, config={"tir.disable_vectorize": True}):
+    lowered = tvm.relay.build(relay_mod, target=TARGET, executor=EXECUTOR, runtime=RUNTIME, params=params)
+
+temp_dir = tvm.contrib.utils.tempdir()
+results = {}
+for allocator in ("page", "buddy"):
+    project = tvm.micro.generate_project(
+        str(DIR / "template_project"),
+        lowered,
+        temp_dir / allocator,
+        {**project_options, "memory_allocator": allocator},
+    )
+    project.build()
+    project.flash()
+
+    with tvm.micro.Session(project.transport()) as session:
+        memory_stats(session, reset=True)
+        executor = create_graph_executor(session)
+        create = memory_stats(session, reset=True)
+        executor.set_input("data", input_data)
+        executor.run()
+        executor.get_output(0).numpy()
+        run = memory_stats(session)
+    results[allocator] = (create, run)
+
+####################
+# Report
+####################
+
+print(f"{'allocator':<10} {'phase':<7} {'allocs':>7} {'frees':>7} {'cyc/alloc':>10} {'cyc/free':>9} {'max alloc':>10}")
+for allocator, phases in results.items():
+    for phase, stats in zip(("create", "run"), phases):
+        print(
+            f"{allocator:<10} {phase:<7} {stats['num_allocs']:>7} {stats['num_frees']:>7} "
+            f"{stats['mean_alloc_cycles']:>10.1f} {stats['mean_free_cycles']:>9.1f} {stats['max_alloc_cycles']:>10}"
+        )
+
+stats = results["buddy"][1]
+print(
+    f"buddy arena: {stats['allocated_bytes']} of {stats['pool_bytes']} bytes allocated, "
+    f"peak {stats['peak_allocated_bytes']}, largest free block {stats['largest_free_bytes']}, "
+    f"internal fragmentation {(stats['internal_fragmentation'] or 0.0):.1%}, "
+    f"external fragmentation {(stats['external_fragmentation'] or 0.0):.1%}"
+)
@@ -0,0 +1,174 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Graph vs. AOT executor on GVSoC
+===============================
+
+Builds the same conv2d model for the `host_driven` (graph executor), `aot_host_driven` and
+`aot_standalone` project types and reports the executor startup time, the per-inference time
+and the section sizes of the firmware binaries.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+from pathlib import Path
+
+import numpy as np
+from elftools.elf.elffile import ELFFile
+
+import tvm
+
+logging.basicConfig(level="WARNING", stream=sys.stdout)
+
+DIR = Path(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, str(DIR / "template_project"))
+
+from microtvm_gvsoc import create_graph_executor  # noqa: E402
+
+PULP_GCC_DIR = os.environ.get("PULP_GCC_DIR", None)
+assert PULP_GCC_DIR, "Missing environment variable: PULP_GCC_DIR"
+
+PULP_LLVM_DIR = os.environ.get("PULP_LLVM_DIR", None)
+assert PULP_LLVM_DIR, "Missing environment variable: PULP_LLVM_DIR (you can assign it with dummy value if llvm is not used.)"
+
+PULP_FREERTOS_DIR = os.environ.get("PULP_FREERTOS_DIR", None)
+assert PULP_FREERTOS_DIR, "Missing environment variable: PULP_FREERTOS_DIR"
+
+# Number of inferences the per-inference time is averaged over.
+NUMBER = int(os.environ.get("AOT_NUMBER", 10))
+
+project_options = {
+    "verbose": False,
+    "debug": False,
+    "pulp_freertos_path": PULP_FREERTOS_DIR,
+    "pulp_gcc_path": PULP_GCC_DIR,
+    "pulp_llvm_path": PULP_LLVM_DIR,
+    "toolchain": "llvm",
+    "arch": "rv32imac",
+    "abi": "ilp32",
+}
+
+SECTIONS = (".text", ".rodata", ".data", ".bss")
+
+####################
+# Defining the model
+####################
+
+data_shape = (1, 3, 16, 16)
+weight_shape = (8, 3, 3, 3)
+data = tvm.relay.var("data", tvm.relay.TensorType(data_shape, "float32"))
+weight = tvm.relay.var("weight", tvm.relay.TensorType(weight_shape, "float32"))
+y = tvm.relay.nn.conv2d(data, weight, padding=(1, 1), kernel_size=(3, 3))
+y = tvm.relay.nn.relu(y)
+relay_mod = tvm.IRModule.from_expr(tvm.relay.Function([data, weight], y))
+relay_mod = tvm.relay.transform.InferType()(relay_mod)
+params = {"weight": np.random.rand(*weight_shape).astype("float32")}
+input_data = np.random.rand(*data_shape).astype("float32")
+
+TARGET = tvm.target.target.micro("host")
+
+# project_type -> (executor, runtime) the model is built with
+CONFIGS = {
+    "host_driven": (
+        tvm.relay.backend.Executor("graph", {"link-params": True}),
+        tvm.relay.backend.Runtime("crt", {"system-lib": True}),
+    ),
+    "aot_host_driven": (
+        tvm.relay.backend.Executor("aot"),
+        tvm.relay.backend.Runtime("crt", {"system-lib": True}),
+    ),
+    "aot_standalone": (
+        tvm.relay.backend.Executor("aot", {"interface-api": "c", "unpacked-api": True}),
+        tvm.relay.backend.Runtime("crt"),
+    ),
+}
+
+
+def section_sizes(binary):
+    with open(binary, "rb") as binary_f:
+        elf = ELFFile(binary_f)
+        sizes = dict.fromkeys(SECTIONS, 0)
+        for section in elf.iter_sections():
+            for name in SECTIONS:
+                if section.name == name or section.name.startswith(name + "."):
+                    sizes[name] += section["sh_size"]
+        return sizes
+
+
+def measure(session, project_type):
+    start = time.monotonic()
+    if project_type == "host_driven":
+        # Loads the binary graph compiled into the firmware, the graph JSON is not sent.
+        executor = create_graph_executor(session)
+    else:
+        executor = tvm.micro.create_local_aot_executor(session)
+    create_time = time.monotonic() - start
+
+    executor.set_input("data", input_data)
+    # Measured on the target by the firmware timer, without the RPC round trips.
+    timer = executor.module.time_evaluator("run", session.device, number=NUMBER)
+    run_time = timer().mean
+    return create_time, run_time
+
+
+temp_dir = tvm.contrib.utils.tempdir()
+results = {}
+for project_type, (executor, runtime) in CONFIGS.items():
+    with tvm.transform.PassContext(opt_level=3, config={"tir.disable_vectorize": True}):
+        lowered = tvm.relay.build(relay_mod, target=TARGET, executor=executor, runtime=runtime, params=params)
+
+    project = tvm.micro.generate_project(
+        str(DIR / "template_project"),
+        lowered,
+        temp_dir / project_type,
+        {**project_options, "project_type": project_type},
+    )
+    project.build()
+    results[project_type] = {"sizes": section_sizes(temp_dir / project_type / "build" / "app")}
+    project.flash()
+    if project_type == "aot_standalone":
+        # No RPC server, flash runs the firmware and collects the cycles it prints.
+        with open(temp_dir / project_type / "build" / "standalone_results.json") as results_f:
+            standalone_results = json.load(results_f)
+        results[project_type]["run"] = standalone_results["run_cycles"] / standalone_results["core_freq_hz"]
+        continue
+
+    with tvm.micro.Session(project.transport()) as session:
+        results[project_type]["create"], results[project_type]["run"] = measure(session, project_type)
+
+####################
+# Report
+####################
+
+print(f"{'project_type':<16} {'create [ms]':>12} {'run [ms]':>10} " + " ".join(f"{name:>9}" for name in SECTIONS))
+for project_type, result in results.items():
+    create = f"{result['create'] * 1e3:.1f}" if "create" in result else "-"
+    run = f"{result['run'] * 1e3:.3f}" if "run" in result else "-"
+    print(
+        f"{project_type:<16} {create:>12} {run:>10} "
+        + " ".join(f"{result['sizes'][name]:>9}" for name in SECTIONS)
+    )
+
+graph, aot = results["host_driven"], results["aot_host_driven"]
+print(
+    f"AOT saves {(graph['create'] - aot['create']) * 1e3:.1f} ms executor startup and "
+    f"{(graph['run'] - aot['run']) / graph['run']:.1%} per inference"
+)
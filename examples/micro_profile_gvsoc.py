@@ -0,0 +1,111 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Per-operator profiling with PULP performance counters
+=====================================================
+
+Builds a small conv2d model with the `profiling` project option and prints the performance
+counters (cycles, instructions, loads/stores, stalls, branches, TCDM contention, ...) of
+every fused function, recorded on the simulated target.
+"""
+
+import os
+import sys
+import logging
+from pathlib import Path
+
+import numpy as np
+
+import tvm
+
+logging.basicConfig(level="WARNING", stream=sys.stdout)
+
+DIR = Path(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, str(DIR / "template_project"))
+
+from microtvm_gvsoc import format_profile_table, profile_operators  # noqa: E402
+
+PULP_GCC_DIR = os.environ.get("PULP_GCC_DIR", None)
+assert PULP_GCC_DIR, "Missing environment variable: PULP_GCC_DIR"
+
+PULP_LLVM_DIR = os.environ.get("PULP_LLVM_DIR", None)
+assert PULP_LLVM_DIR, "Missing environment variable: PULP_LLVM_DIR (you can assign it with dummy value if llvm is not used.)"
+
+PULP_FREERTOS_DIR = os.environ.get("PULP_FREERTOS_DIR", None)
+assert PULP_FREERTOS_DIR, "Missing environment variable: PULP_FREERTOS_DIR"
+
+# Number of calls per operator the counters are averaged over.
+NUMBER = int(os.environ.get("PROFILE_NUMBER", 1))
+
+project_options = {
+    "project_type": "host_driven",
+    "verbose": False,
+    "debug": False,
+    "pulp_freertos_path": PULP_FREERTOS_DIR,
+    "pulp_gcc_path": PULP_GCC_DIR,
+    "pulp_llvm_path": PULP_LLVM_DIR,
+    "toolchain": "llvm",
+    "arch": "rv32imac",
+    "abi": "ilp32",
+    "profiling": True,
+}
+
+####################
+# Defining the model
+####################
+
+data_shape = (1, 3, 16, 16)
+weight_shape = (8, 3, 3, 3)
+data = tvm.relay.var("data", tvm.relay.TensorType(data_shape, "float32"))
+weight = tvm.relay.var("weight", tvm.relay.TensorType(weight_shape, "float32"))
+y = tvm.relay.nn.conv2d(data, weight, padding=(1, 1), kernel_size=(3, 3))
+y = tvm.relay.nn.relu(y)
+y = tvm.relay.nn.max_pool2d(y, pool_size=(2, 2), strides=(2, 2))
+relay_mod = tvm.IRModule.from_expr(tvm.relay.Function([data, weight], y))
+relay_mod = tvm.relay.transform.InferType()(relay_mod)
+params = {"weight": np.random.rand(*weight_shape).astype("float32")}
+
+TARGET = tvm.target.target.micro("host")
+RUNTIME = tvm.relay.backend.Runtime("crt", {"system-lib": True})
+
+with tvm.transform.PassContext(opt_level=3, config={"tir.disable_vectorize": True}):
+    lowered = tvm.relay.build(relay_mod, target=TARGET, runtime=RUNTIME, params=params)
+
+temp_dir = tvm.contrib.utils.tempdir()
+project = tvm.micro.generate_project(
+    str(DIR / "template_project"),
+    lowered,
+    temp_dir / "project",
+    project_options,
+)
+project.build()
+project.flash()
+
+####################
+# Profile the model
+####################
+
+with tvm.micro.Session(project.transport()) as session:
+    graph_json = lowered.get_graph_json()
+    debug_mod = tvm.micro.create_local_debug_executor(graph_json, session.get_system_lib(), session.device)
+    debug_mod.set_input(**lowered.get_params())
+    debug_mod.set_input("data", np.random.rand(*data_shape).astype("float32"))
+
+    profile = profile_operators(session, graph_json, debug_mod, number=NUMBER)
+
+print(format_profile_table(profile))
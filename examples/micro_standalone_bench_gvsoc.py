@@ -0,0 +1,115 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Standalone latency benchmark on GVSoC
+=====================================
+
+Builds a conv2d model as `standalone_bench` project with embedded inputs, runs warmup and
+timed inferences on the simulated target without any RPC session and prints the min, median
+and p99 latency.
+"""
+
+import os
+import sys
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+
+import tvm
+
+logging.basicConfig(level="WARNING", stream=sys.stdout)
+
+DIR = Path(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+
+PULP_GCC_DIR = os.environ.get("PULP_GCC_DIR", None)
+assert PULP_GCC_DIR, "Missing environment variable: PULP_GCC_DIR"
+
+PULP_LLVM_DIR = os.environ.get("PULP_LLVM_DIR", None)
+assert PULP_LLVM_DIR, "Missing environment variable: PULP_LLVM_DIR (you can assign it with dummy value if llvm is not used.)"
+
+PULP_FREERTOS_DIR = os.environ.get("PULP_FREERTOS_DIR", None)
+assert PULP_FREERTOS_DIR, "Missing environment variable: PULP_FREERTOS_DIR"
+
+# Number of untimed and timed inferences.
+WARMUP = int(os.environ.get("BENCH_WARMUP", 2))
+ITERATIONS = int(os.environ.get("BENCH_ITERATIONS", 20))
+
+temp_dir = tvm.contrib.utils.tempdir()
+input_path = temp_dir / "input.npy"
+
+project_options = {
+    "project_type": "standalone_bench",
+    "verbose": False,
+    "debug": False,
+    "pulp_freertos_path": PULP_FREERTOS_DIR,
+    "pulp_gcc_path": PULP_GCC_DIR,
+    "pulp_llvm_path": PULP_LLVM_DIR,
+    "toolchain": "llvm",
+    "arch": "rv32imac",
+    "abi": "ilp32",
+    "bench_input_npy": str(input_path),
+    "bench_warmup": WARMUP,
+    "bench_iterations": ITERATIONS,
+}
+
+####################
+# Defining the model
+####################
+
+data_shape = (1, 3, 16, 16)
+weight_shape = (8, 3, 3, 3)
+data = tvm.relay.var("data", tvm.relay.TensorType(data_shape, "float32"))
+weight = tvm.relay.var("weight", tvm.relay.TensorType(weight_shape, "float32"))
+y = tvm.relay.nn.conv2d(data, weight, padding=(1, 1), kernel_size=(3, 3))
+y = tvm.relay.nn.relu(y)
+relay_mod = tvm.IRModule.from_expr(tvm.relay.Function([data, weight], y))
+relay_mod = tvm.relay.transform.InferType()(relay_mod)
+params = {"weight": np.random.rand(*weight_shape).astype("float32")}
+np.save(input_path, np.random.rand(*data_shape).astype("float32"))
+
+TARGET = tvm.target.target.micro("host")
+EXECUTOR = tvm.relay.backend.Executor("aot", {"interface-api": "c", "unpacked-api": True})
+RUNTIME = tvm.relay.backend.Runtime("crt")
+
+with tvm.transform.PassContext(opt_level=3, config={"tir.disable_vectorize": True}):
+    lowered = tvm.relay.build(relay_mod, target=TARGET, executor=EXECUTOR, runtime=RUNTIME, params=params)
+
+project = tvm.micro.generate_project(
+    str(DIR / "template_project"),
+    lowered,
+    temp_dir / "project",
+    project_options,
+)
+project.build()
+
+####################
+# Run the benchmark
+####################
+
+# There is no RPC server in standalone projects, flash runs the firmware to completion.
+project.flash()
+
+with open(temp_dir / "project" / "build" / "standalone_results.json") as results_f:
+    results = json.load(results_f)
+
+print(json.dumps(results, indent=2))
+for stat in ("min", "median", "p99"):
+    cycles = results[f"{stat}_cycles"]
+    print(f"{stat:>6}: {cycles:>10} cycles {cycles / results['core_freq_hz'] * 1e3:>8.3f} ms")
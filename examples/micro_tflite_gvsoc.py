@@ -43,6 +43,9 @@ from tvm.contrib import graph_executor, utils
 from tvm import relay
 
 DIR = Path(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, str(DIR / "template_project"))
+
+from microtvm_gvsoc import create_graph_executor  # noqa: E402
 
 PULP_GCC_DIR = os.environ.get("PULP_GCC_DIR", None)
 assert PULP_GCC_DIR, "Missing environment variable: PULP_GCC_DIR"
@@ -64,6 +67,8 @@ project_options = {
     "pulp_llvm_path": PULP_LLVM_DIR,
     "toolchain": "llvm", # llvm for compilation with llvm, gcc for complition with gcc
     "memory_size_bytes": 2**17,
+    # Compile the parameters into the firmware instead of uploading them with set_input.
+    "embed_params": True,
 }
 
 model_url = "https://people.linaro.org/~tom.gall/sine_model.tflite"
@@ -172,11 +177,8 @@ generated_project.build()
 generated_project.flash()
 
 with tvm.micro.Session(transport_context_manager=generated_project.transport()) as session:
-    graph_mod = tvm.micro.create_local_graph_executor(
-        module.get_graph_json(), session.get_system_lib(), session.device
-    )
-
-    graph_mod.set_input(**module.get_params())
+    # Loads the binary graph and the embedded parameters compiled into the firmware.
+    graph_mod = create_graph_executor(session)
 
     graph_mod.set_input(input_tensor, tvm.nd.array(np.array([0.5], dtype="float32")))
     graph_mod.run()
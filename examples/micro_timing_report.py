@@ -0,0 +1,103 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Timing report for microTVM GVSoC projects
+=========================================
+
+Aggregates the JSON-lines records written by the project API server when the `timing_log`
+project option is set. Pass the log files or directories to search for `timing.jsonl`:
+
+    python micro_timing_report.py /tmp/tvm-autotune-logs/timing.jsonl
+    python micro_timing_report.py /path/to/projects/
+"""
+
+import argparse
+import collections
+import json
+import pathlib
+import statistics
+
+
+def _load_records(paths):
+    records = []
+    for path in map(pathlib.Path, paths):
+        files = sorted(path.rglob("timing.jsonl")) if path.is_dir() else [path]
+        for log_file in files:
+            with open(log_file) as f:
+                records.extend(json.loads(line) for line in f if line.strip())
+    return records
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="timing.jsonl files or directories containing them")
+    args = parser.parse_args()
+
+    records = _load_records(args.paths)
+    if not records:
+        parser.error("no timing records found")
+
+    # (event, metric) -> values
+    durations = collections.defaultdict(list)
+    counters = collections.Counter()
+    num_events = collections.Counter()
+    for record in records:
+        event = record["event"]
+        num_events[event] += 1
+        for key, value in record.items():
+            if key.endswith("_sec"):
+                durations[(event, key[: -len("_sec")])].append(value)
+            elif key.startswith("bytes_") or key in ("reads", "writes", "polls"):
+                counters[key] += value
+            elif isinstance(value, bool) and value:
+                counters[f"{event}.{key}"] += 1
+
+    wall_time = sum(sum(values) for (_, name), values in durations.items() if name == "total")
+    print(f"{len(records)} records: " + ", ".join(f"{n} x {e}" for e, n in sorted(num_events.items())))
+    print()
+    header = f"{'phase':<34} {'count':>6} {'total [s]':>10} {'share':>6} {'mean [s]':>9} {'p50 [s]':>9} {'p95 [s]':>9} {'max [s]':>9}"
+    print(header)
+    print("-" * len(header))
+    for (event, name), values in sorted(durations.items()):
+        total = sum(values)
+        share = total / wall_time if wall_time else 0.0
+        print(
+            f"{event + '.' + name:<34} {len(values):>6} {total:>10.3f} {share:>6.1%} {statistics.mean(values):>9.3f} "
+            f"{_percentile(values, 0.5):>9.3f} {_percentile(values, 0.95):>9.3f} {max(values):>9.3f}"
+        )
+
+    if counters:
+        print()
+        for key, value in sorted(counters.items()):
+            print(f"{key:<34} {value:>12}")
+        read_time = sum(durations.get(("session", "read_transport"), []))
+        write_time = sum(durations.get(("session", "write_transport"), []))
+        if write_time:
+            print(f"{'write throughput [MB/s]':<34} {counters['bytes_written'] / write_time / 1e6:>12.3f}")
+        if read_time:
+            # read_transport includes waiting for the target to execute.
+            print(f"{'read throughput [MB/s]':<34} {counters['bytes_read'] / read_time / 1e6:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
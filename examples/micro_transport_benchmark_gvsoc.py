@@ -0,0 +1,146 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Transport throughput benchmark for microTVM on GVSoC
+====================================================
+
+Measures how fast tensors can be moved between the host and the simulated target by
+timing repeated `set_input` (host -> target) and `get_output` (target -> host) calls
+on a trivial elementwise model. Results are reported in MB/s.
+
+The same number of inferences is then issued with `microtvm_gvsoc.run_batch`, which moves all
+inputs in one transfer, runs them in a single RPC call and reads all outputs and cycle counts
+back in one transfer.
+"""
+
+import os
+import sys
+import time
+import logging
+from pathlib import Path
+
+import numpy as np
+
+import tvm
+
+logging.basicConfig(level="WARNING", stream=sys.stdout)
+
+DIR = Path(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, str(DIR / "template_project"))
+
+from microtvm_gvsoc import create_graph_executor, run_batch  # noqa: E402
+
+PULP_GCC_DIR = os.environ.get("PULP_GCC_DIR", None)
+assert PULP_GCC_DIR, "Missing environment variable: PULP_GCC_DIR"
+
+PULP_LLVM_DIR = os.environ.get("PULP_LLVM_DIR", None)
+assert PULP_LLVM_DIR, "Missing environment variable: PULP_LLVM_DIR (you can assign it with dummy value if llvm is not used.)"
+
+PULP_FREERTOS_DIR = os.environ.get("PULP_FREERTOS_DIR", None)
+assert PULP_FREERTOS_DIR, "Missing environment variable: PULP_FREERTOS_DIR"
+
+# Number of float32 elements in the transferred tensor (64 KiB by default).
+NUM_ELEMENTS = int(os.environ.get("BENCH_NUM_ELEMENTS", 16384))
+NUM_REPEATS = int(os.environ.get("BENCH_NUM_REPEATS", 5))
+
+project_options = {
+    "project_type": "host_driven",
+    "verbose": False,
+    "debug": False,
+    "pulp_freertos_path": PULP_FREERTOS_DIR,
+    "pulp_gcc_path": PULP_GCC_DIR,
+    "pulp_llvm_path": PULP_LLVM_DIR,
+    "toolchain": "llvm",
+    "arch": "rv32imac",
+    "abi": "ilp32",
+    "memory_size_bytes": 2**18,
+}
+
+####################
+# Defining the model
+####################
+
+data_shape = (NUM_ELEMENTS,)
+data = tvm.relay.var("data", tvm.relay.TensorType(data_shape, "float32"))
+f = tvm.relay.Function([data], tvm.relay.add(data, tvm.relay.const(1.0, "float32")))
+relay_mod = tvm.IRModule.from_expr(f)
+relay_mod = tvm.relay.transform.InferType()(relay_mod)
+
+TARGET = tvm.target.target.micro("host")
+RUNTIME = tvm.relay.backend.Runtime("crt", {"system-lib": True})
+
+with tvm.transform.PassContext(opt_level=3, config={"tir.disable_vectorize": True}):
+    lowered = tvm.relay.build(relay_mod, target=TARGET, runtime=RUNTIME)
+
+temp_dir = tvm.contrib.utils.tempdir()
+project = tvm.micro.generate_project(
+    str(DIR / "template_project"),
+    lowered,
+    temp_dir / "project",
+    project_options,
+)
+project.build()
+project.flash()
+
+###################
+# Run the benchmark
+###################
+
+
+def _mb_per_sec(num_bytes, seconds):
+    return num_bytes / seconds / 1e6 if seconds > 0 else float("inf")
+
+
+data_np = np.random.rand(*data_shape).astype("float32")
+num_bytes = data_np.nbytes
+
+with tvm.micro.Session(project.transport()) as session:
+    # Runs on the device, from the graph compiled into the firmware.
+    graph_mod = create_graph_executor(session)
+
+    upload_times = []
+    download_times = []
+    loop_start = time.monotonic()
+    for _ in range(NUM_REPEATS):
+        start = time.monotonic()
+        graph_mod.set_input("data", data_np)
+        upload_times.append(time.monotonic() - start)
+
+        graph_mod.run()
+
+        start = time.monotonic()
+        output = graph_mod.get_output(0).numpy()
+        download_times.append(time.monotonic() - start)
+    unbatched_time = time.monotonic() - loop_start
+
+    np.testing.assert_allclose(output, data_np + 1.0, rtol=1e-5)
+
+    batch_np = np.random.rand(NUM_REPEATS, *data_shape).astype("float32")
+    start = time.monotonic()
+    outputs, cycles = run_batch(session, graph_mod, {"data": batch_np}, data_shape, "float32")
+    batched_time = time.monotonic() - start
+
+    np.testing.assert_allclose(outputs, batch_np + 1.0, rtol=1e-5)
+
+print(f"Transferred {num_bytes} bytes x {NUM_REPEATS} repeats")
+print(f"set_input:  best {_mb_per_sec(num_bytes, min(upload_times)):.3f} MB/s, "
+      f"mean {_mb_per_sec(num_bytes, np.mean(upload_times)):.3f} MB/s")
+print(f"get_output: best {_mb_per_sec(num_bytes, min(download_times)):.3f} MB/s, "
+      f"mean {_mb_per_sec(num_bytes, np.mean(download_times)):.3f} MB/s")
+print(f"{NUM_REPEATS} inferences: set_input/get_output {unbatched_time:.3f} s, "
+      f"run_batch {batched_time:.3f} s ({np.mean(cycles):.0f} cycles per run)")
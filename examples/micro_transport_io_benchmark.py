@@ -0,0 +1,113 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+Host-side transport I/O microbenchmark
+======================================
+
+Compares the pipe I/O of the project API server (PipeTransport) against the previous
+implementation, which called select() before every single read or write and returned
+whatever a single os.read() produced. No simulator is needed: `cat` is used as an echo
+peer, and tensors are sent in packet-sized chunks and read back the way the RPC session does.
+"""
+
+import collections
+import fcntl
+import os
+import select
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+DIR = Path(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+sys.path.insert(0, str(DIR / "template_project"))
+
+from microtvm_api_server import PipeTransport  # noqa: E402
+
+TENSOR_SIZE_BYTES = int(os.environ.get("BENCH_TENSOR_SIZE_BYTES", 4 * 1024 * 1024))
+CHUNK_SIZE_BYTES = int(os.environ.get("BENCH_CHUNK_SIZE_BYTES", 4096))
+READ_SIZE_BYTES = int(os.environ.get("BENCH_READ_SIZE_BYTES", 128))
+
+
+class LegacyTransport:
+    """The select()-per-call implementation previously used by read_transport/write_transport."""
+
+    def __init__(self, read_fd, write_fd):
+        self._read_fd = read_fd
+        self._write_fd = write_fd
+        self.stats = collections.Counter()
+
+    def close(self):
+        pass
+
+    def _await_ready(self, rlist, wlist):
+        self.stats["polls"] += 1
+        select.select(rlist, wlist, rlist + wlist, None)
+
+    def read(self, n, end_time=None):
+        self._await_ready([self._read_fd], [])
+        self.stats["reads"] += 1
+        return os.read(self._read_fd, n)
+
+    def write(self, data, end_time=None):
+        while data:
+            self._await_ready([], [self._write_fd])
+            self.stats["writes"] += 1
+            data = data[os.write(self._write_fd, data) :]
+
+
+def _set_nonblock(fd):
+    fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+
+def run(transport_cls):
+    proc = subprocess.Popen(["cat"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0)
+    _set_nonblock(proc.stdin.fileno())
+    _set_nonblock(proc.stdout.fileno())
+    transport = transport_cls(proc.stdout.fileno(), proc.stdin.fileno())
+
+    payload = os.urandom(CHUNK_SIZE_BYTES)
+    num_chunks = TENSOR_SIZE_BYTES // CHUNK_SIZE_BYTES
+    start = time.monotonic()
+    for _ in range(num_chunks):
+        transport.write(payload)
+        received = 0
+        while received < len(payload):
+            received += len(transport.read(READ_SIZE_BYTES))
+    elapsed = time.monotonic() - start
+
+    stats = transport.stats
+    transport.close()
+    proc.terminate()
+    proc.wait()
+
+    num_mb = 2 * num_chunks * CHUNK_SIZE_BYTES / 1e6
+    syscalls = stats["polls"] + stats["reads"] + stats["writes"]
+    print(
+        f"{transport_cls.__name__:>15}: {elapsed * 1e3:8.1f} ms, {num_mb / elapsed:7.2f} MB/s, "
+        f"{syscalls / num_mb:9.0f} syscalls/MB "
+        f"(polls {stats['polls']}, reads {stats['reads']}, writes {stats['writes']})"
+    )
+
+
+print(
+    f"Echoing {TENSOR_SIZE_BYTES} bytes in {CHUNK_SIZE_BYTES} byte packets, "
+    f"read_transport(n={READ_SIZE_BYTES})"
+)
+run(LegacyTransport)
+run(PipeTransport)
@@ -2,13 +2,19 @@ SET(GVSOC_LIB_DIR ${PULP_FREERTOS_DIR})
 SET(GVSOC_TARGET_LIB_DIR ${GVSOC_LIB_DIR}/target/pulp)
 
 MACRO(GVSOC_PULP_SETTINGS_PRE)
-    SET(GVSOC_PULP_INCLUDES
-            ${GVSOC_TARGET_LIB_DIR}/include
-            ${PULP_FREERTOS_DIR}/template/hello_world
-            ${GVSOC_LIB_DIR}/target/arch
-            ${GVSOC_LIB_DIR}/libc/malloc/include
-            ${GVSOC_LIB_DIR}/drivers/include
-    )
+    IF("${TOOLCHAIN}" STREQUAL "host")
+        # Built against the libc of the build machine, without the PULP headers.
+        SET(GVSOC_PULP_INCLUDES)
+    ELSE()
+        # NOTE: keep in sync with Handler.GVSOC_PULP_INCLUDE_DIRS in microtvm_api_server.py
+        SET(GVSOC_PULP_INCLUDES
+                ${GVSOC_TARGET_LIB_DIR}/include
+                ${PULP_FREERTOS_DIR}/template/hello_world
+                ${GVSOC_LIB_DIR}/target/arch
+                ${GVSOC_LIB_DIR}/libc/malloc/include
+                ${GVSOC_LIB_DIR}/drivers/include
+        )
+    ENDIF()
 
     SET(CMAKE_EXPORT_COMPILE_COMMANDS ON)
 ENDMACRO()
@@ -31,7 +37,7 @@ MACRO(ADD_EXECUTABLE_GVSOC_PULP_INTERNAL TARGET_NAME ADD_PLATFORM_FILES)
     GVSOC_PULP_SETTINGS_PRE()
 
     # prevent linker argument duplicates when calling macro for multiple targets
-    IF(NOT GVSOC_PULP_MACRO_ALREADY_EXECUTED)
+    IF(NOT GVSOC_PULP_MACRO_ALREADY_EXECUTED AND NOT "${TOOLCHAIN}" STREQUAL "host")
         SET(CMAKE_EXE_LINKER_FLAGS
             "${CMAKE_EXE_LINKER_FLAGS} -nostartfiles \
             -T ${GVSOC_TARGET_LIB_DIR}/link.ld \
@@ -43,16 +49,28 @@ MACRO(ADD_EXECUTABLE_GVSOC_PULP_INTERNAL TARGET_NAME ADD_PLATFORM_FILES)
 
     SET(ARGS "${ARGN}")
     SET(SRC_FILES ${ARGS})
-    IF(${ADD_PLATFORM_FILES})
-        LIST(APPEND SRC_FILES
-            ${GVSOC_TARGET_LIB_DIR}/system_metal.c
-            ${GVSOC_TARGET_LIB_DIR}/crt0.S
-            ${GVSOC_TARGET_LIB_DIR}/vectors_metal.S
-	        ${GVSOC_LIB_DIR}/libc/malloc/malloc_internal.c
-            ${GVSOC_LIB_DIR}/libc/malloc/cl_l1_malloc.c
-            ${GVSOC_LIB_DIR}/libc/syscalls.c
-            ${GVSOC_LIB_DIR}/libc/pulp_malloc.c
-        )
+    # The host build uses the startup files and libc of the build machine.
+    IF(${ADD_PLATFORM_FILES} AND NOT "${TOOLCHAIN}" STREQUAL "host")
+        IF(CRT_PREBUILT_DIR)
+            # Use the platform objects from the CRT library cache instead of compiling them again.
+            FILE(GLOB GVSOC_PLATFORM_OBJS ${CRT_PREBUILT_DIR}/platform/*)
+            LIST(APPEND SRC_FILES ${GVSOC_PLATFORM_OBJS})
+        ELSE()
+            # NOTE: keep in sync with Handler.GVSOC_PLATFORM_SRCS in microtvm_api_server.py
+            IF(NOT TARGET gvsoc_platform)
+                ADD_LIBRARY(gvsoc_platform OBJECT
+                    ${GVSOC_TARGET_LIB_DIR}/system_metal.c
+                    ${GVSOC_TARGET_LIB_DIR}/crt0.S
+                    ${GVSOC_TARGET_LIB_DIR}/vectors_metal.S
+                    ${GVSOC_LIB_DIR}/libc/malloc/malloc_internal.c
+                    ${GVSOC_LIB_DIR}/libc/malloc/cl_l1_malloc.c
+                    ${GVSOC_LIB_DIR}/libc/syscalls.c
+                    ${GVSOC_LIB_DIR}/libc/pulp_malloc.c
+                )
+                GVSOC_PULP_SETTINGS_POST(gvsoc_platform)
+            ENDIF()
+            LIST(APPEND SRC_FILES $<TARGET_OBJECTS:gvsoc_platform>)
+        ENDIF()
     ENDIF()
 
     ADD_EXECUTABLE(${TARGET_NAME} ${SRC_FILES})
@@ -0,0 +1,13 @@
+# Contains toolchain configurations and settings for building the firmware natively for the
+# build machine, e.g. x86 Linux. The resulting app runs without GVSoC and talks RPC over its
+# stdin/stdout (see MICROTVM_HOST in src/host_driven/main.cc).
+
+# The compilers are the CMake defaults for the build machine, set CC and CXX to pick others.
+
+SET(CV_CFLAGS "\
+-fsigned-char -ffunction-sections -fdata-sections \
+-Wall -Wextra -Wshadow -Wformat=2 -Wundef -Wno-unused-parameter")
+
+SET(CMAKE_CXX_FLAGS "${CMAKE_CXX_FLAGS} ${CV_CFLAGS} -DMICROTVM_HOST ")
+SET(CMAKE_C_FLAGS "${CMAKE_C_FLAGS} ${CV_CFLAGS} -DMICROTVM_HOST ")
+SET(CMAKE_EXE_LINKER_FLAGS "${CMAKE_EXE_LINKER_FLAGS} -Wl,--gc-sections")
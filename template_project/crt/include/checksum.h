@@ -98,6 +98,7 @@ uint16_t update_crc_16(uint16_t crc, unsigned char c);
 uint32_t update_crc_32(uint32_t crc, unsigned char c);
 uint64_t update_crc_64_ecma(uint64_t crc, unsigned char c);
 uint16_t update_crc_ccitt(uint16_t crc, unsigned char c);
+uint16_t update_crc_ccitt_block(uint16_t crc, const unsigned char* input_str, size_t num_bytes);
 uint16_t update_crc_dnp(uint16_t crc, unsigned char c);
 uint16_t update_crc_kermit(uint16_t crc, unsigned char c);
 uint16_t update_crc_sick(uint16_t crc, unsigned char c, unsigned char prev_byte);
@@ -0,0 +1,91 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * \file tvm/runtime/crt/buddy_allocator.h
+ * \brief Buddy allocator with constant-time allocate and free, an alternative to the page
+ * allocator whose free list and page lookups are linear in the number of live allocations.
+ */
+
+#ifndef TVM_RUNTIME_CRT_BUDDY_ALLOCATOR_H_
+#define TVM_RUNTIME_CRT_BUDDY_ALLOCATOR_H_
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+#include <stddef.h>
+#include <stdint.h>
+#include <tvm/runtime/crt/error_codes.h>
+#include <tvm/runtime/crt/page_allocator.h>
+
+/*! \brief Occupancy and fragmentation counters of a buddy allocator. */
+typedef struct BuddyMemoryManagerStats {
+  /*! \brief Bytes of the memory pool usable for blocks. */
+  size_t pool_bytes;
+  /*! \brief Bytes in allocated blocks. */
+  size_t allocated_bytes;
+  /*! \brief Maximum of allocated_bytes since creation or the last reset. */
+  size_t peak_allocated_bytes;
+  /*! \brief Bytes in free blocks. */
+  size_t free_bytes;
+  /*! \brief Size of the largest free block, i.e. the largest allocation that can succeed. */
+  size_t largest_free_bytes;
+  /*! \brief Sum of the requested bytes of all allocations since creation or the last reset. */
+  uint64_t requested_bytes_total;
+  /*! \brief Sum of the block sizes handed out for these allocations. */
+  uint64_t block_bytes_total;
+} BuddyMemoryManagerStats;
+
+/*!
+ * \brief Create a buddy allocator over a memory pool.
+ *
+ * Blocks are power-of-two multiples of 2^min_block_bytes_log2 bytes. The allocator state and one
+ * byte per minimum block are kept at the start of the pool.
+ *
+ * \param manager Pointer, initialized with the new MemoryManager.
+ * \param memory_pool Pointer to the global memory pool used by the CRT.
+ * \param memory_pool_size_bytes Size of `memory_pool`, in bytes.
+ * \param min_block_bytes_log2 log2 of the smallest block size, in bytes.
+ * \return kTvmErrorNoError on success.
+ */
+tvm_crt_error_t BuddyMemoryManagerCreate(MemoryManagerInterface** manager, uint8_t* memory_pool,
+                                         size_t memory_pool_size_bytes,
+                                         size_t min_block_bytes_log2);
+
+/*!
+ * \brief Read the counters of a buddy allocator.
+ *
+ * \param manager MemoryManager created with BuddyMemoryManagerCreate.
+ * \param stats Receives the counters.
+ */
+void BuddyMemoryManager_GetStats(MemoryManagerInterface* manager, BuddyMemoryManagerStats* stats);
+
+/*!
+ * \brief Restart peak_allocated_bytes at the current allocated_bytes and clear the totals.
+ *
+ * \param manager MemoryManager created with BuddyMemoryManagerCreate.
+ */
+void BuddyMemoryManager_ResetStats(MemoryManagerInterface* manager);
+
+#ifdef __cplusplus
+}  // extern "C"
+#endif
+
+#endif  // TVM_RUNTIME_CRT_BUDDY_ALLOCATOR_H_
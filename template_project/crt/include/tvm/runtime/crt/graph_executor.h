@@ -56,6 +56,12 @@ typedef struct TVMGraphExecutorGraphAttr {
 
 typedef struct TVMGraphExecutor TVMGraphExecutor;
 
+// Parameter compiled into the firmware, bound in place to its storage pool entry.
+typedef struct TVMGraphExecutorEmbeddedParam {
+  uint32_t storage_id;
+  const void* data;
+} TVMGraphExecutorEmbeddedParam;
+
 // public functions
 /*!
  * \brief Allocate a new GraphExecutor with TVMPlatformMemoryAllocate and initialize it.
@@ -69,6 +75,31 @@ typedef struct TVMGraphExecutor TVMGraphExecutor;
 int TVMGraphExecutor_Create(const char* sym_json, TVMModuleHandle module_handle,
                             const DLDevice* devices, TVMGraphExecutor** executor);
 
+/*!
+ * \brief Allocate a new GraphExecutor for a binary graph and initialize it.
+ *
+ * \param graph Binary graph, 8-byte aligned. Needs to outlive the executor, which uses parts
+ *     of it in place.
+ * \param graph_size Size of the binary graph in bytes.
+ * \param module_handle TVM Module that exposes the functions to call.
+ * \param devices runtime execution device.
+ * \param executor Pointer which receives a pointer to the newly-created instance.
+ * \return 0 if successful.
+ */
+int TVMGraphExecutor_CreateFromBinary(const uint8_t* graph, size_t graph_size,
+                                      TVMModuleHandle module_handle, const DLDevice* devices,
+                                      TVMGraphExecutor** executor);
+
+/*!
+ * \brief Set the parameters compiled into the firmware. Executors created afterwards use them as
+ * the data of their storage pool entries, like linked parameters, instead of allocating them.
+ *
+ * \param params Parameters, valid for the lifetime of the program.
+ * \param params_count Number of parameters.
+ */
+void TVMGraphExecutor_SetEmbeddedParams(const TVMGraphExecutorEmbeddedParam* params,
+                                        size_t params_count);
+
 int TVMGraphExecutor_GetInputIndex(TVMGraphExecutor* executor, const char* name);
 
 /*!
@@ -82,8 +113,9 @@ int TVMGraphExecutor_GetNumInputs();
  * \param executor The graph executor.
  * \param name The name of the input.
  * \param data_in The input data.
+ * \return 0 on success, -1 if the input is a linked or embedded parameter, which is read-only.
  */
-void TVMGraphExecutor_SetInput(TVMGraphExecutor* executor, const char* name, DLTensor* data_in);
+int TVMGraphExecutor_SetInput(TVMGraphExecutor* executor, const char* name, DLTensor* data_in);
 
 /*!
  * \brief get number of output tensors allocated.
@@ -105,7 +137,8 @@ int TVMGraphExecutor_GetOutput(TVMGraphExecutor* executor, const int32_t index,
  * \param executor The graph executor.
  * \param param_blob A binary blob of parameter.
  * \param param_size The parameter size.
- * \return The result of this function execution.
+ * \return The result of this function execution. Loading a linked or embedded parameter fails,
+ *     their data is read-only.
  */
 int TVMGraphExecutor_LoadParams(TVMGraphExecutor* executor, const char* param_blob,
                                 const uint32_t param_size);
@@ -28,6 +28,8 @@
 extern "C" {
 #endif
 
+#include <stddef.h>
+#include <stdint.h>
 #include <tvm/runtime/crt/error_codes.h>
 
 /*!
@@ -35,6 +37,15 @@ extern "C" {
  */
 tvm_crt_error_t TVMGraphExecutorModule_Register();
 
+/*!
+ * \brief Set the binary graph "tvm.graph_executor.create" uses when called with an empty graph
+ * JSON, so the graph needs neither be sent to nor parsed on the device.
+ *
+ * \param graph Binary graph, 8-byte aligned and valid for the lifetime of the program.
+ * \param graph_size Size of the binary graph in bytes.
+ */
+void TVMGraphExecutorModule_SetBinaryGraph(const uint8_t* graph, size_t graph_size);
+
 #ifdef __cplusplus
 }  // extern "C"
 #endif
@@ -106,13 +106,73 @@ typedef struct TVMGraphExecutor {
   /*! \brief Operator on each node. */
   TVMPackedFunc* op_execs;
   uint32_t op_execs_count;
+  /*! \brief Binary graph the integer arrays point into, NULL if the graph was loaded from JSON. */
+  const uint8_t* graph_binary;
 } TVMGraphExecutor;
 
+// Binary graph: the graph JSON converted at project generation time (microtvm_api_server.py).
+// All fields are little-endian uint32, all offsets are in bytes from the start of the binary,
+// which needs to be 8-byte aligned. The integer arrays have the layout of the executor fields
+// and are used in place, only the nodes and output entries are copied.
+#define TVM_GRAPH_BINARY_MAGIC 0x474D5654  // "TVMG"
+#define TVM_GRAPH_BINARY_VERSION 1
+
+typedef struct TVMGraphBinaryHeader {
+  uint32_t magic;
+  uint32_t version;
+  // Padding of the shape and dltype rows, must match TVM_CRT_MAX_NDIM and
+  // TVM_CRT_MAX_STRLEN_DLTYPE.
+  uint32_t max_ndim;
+  uint32_t max_strlen_dltype;
+  uint32_t nodes_count;
+  uint32_t node_inputs_count;
+  uint32_t input_nodes_count;
+  uint32_t node_row_ptr_count;
+  uint32_t outputs_count;
+  // Number of data entries, the length of storage_id, dltype, shape and ndim.
+  uint32_t entries_count;
+  // 0 if the graph has no device_index attribute.
+  uint32_t device_index_count;
+  uint32_t nodes_offset;         // TVMGraphBinaryNode[nodes_count]
+  uint32_t node_inputs_offset;   // TVMGraphBinaryNodeEntry[node_inputs_count]
+  uint32_t input_nodes_offset;   // uint32_t[input_nodes_count]
+  uint32_t node_row_ptr_offset;  // uint32_t[node_row_ptr_count]
+  uint32_t outputs_offset;       // TVMGraphBinaryNodeEntry[outputs_count]
+  uint32_t storage_id_offset;    // uint32_t[entries_count]
+  uint32_t device_index_offset;  // uint32_t[device_index_count]
+  uint32_t dltype_offset;        // char[entries_count][max_strlen_dltype]
+  uint32_t shape_offset;         // int64_t[entries_count][max_ndim], 8-byte aligned
+  uint32_t ndim_offset;          // uint32_t[entries_count]
+  uint32_t strings_offset;       // NUL-terminated strings, ends with a NUL
+  uint32_t strings_size;
+  uint32_t size;
+} TVMGraphBinaryHeader;
+
+typedef struct TVMGraphBinaryNodeEntry {
+  uint32_t node_id;
+  uint32_t index;
+  uint32_t version;
+} TVMGraphBinaryNodeEntry;
+
+typedef struct TVMGraphBinaryNode {
+  // Offsets into the strings.
+  uint32_t op_type;
+  uint32_t name;
+  uint32_t func_name;
+  uint32_t num_inputs;
+  uint32_t num_outputs;
+  uint32_t flatten_data;
+  // Index of the first input in the node inputs.
+  uint32_t inputs_begin;
+  uint32_t inputs_count;
+} TVMGraphBinaryNode;
+
 typedef DLTensor* DLTensorPtr;
 
 // private functions
 uint32_t TVMGraphExecutor_GetEntryId(TVMGraphExecutor* executor, uint32_t nid, uint32_t index);
-void TVMGraphExecutor_SetInput(TVMGraphExecutor* executor, const char* name, DLTensor* data_in);
+int TVMGraphExecutor_IsLinkedParamEntry(TVMGraphExecutor* executor, uint32_t eid);
+int TVMGraphExecutor_SetInput(TVMGraphExecutor* executor, const char* name, DLTensor* data_in);
 int TVMGraphExecutor_LoadParams(TVMGraphExecutor* executor, const char* param_blob,
                                 const uint32_t param_size);
 void TVMGraphExecutor_Run(TVMGraphExecutor* executor);
@@ -122,6 +182,7 @@ int32_t TVMGraphExecutor_CreateTVMOp(TVMGraphExecutor* executor, const TVMOpPara
                                      DLTensorPtr* args, const uint32_t args_count,
                                      TVMPackedFunc* pf);
 int TVMGraphExecutor_Load(TVMGraphExecutor* executor, JSONReader* reader);
+int TVMGraphExecutor_LoadBinary(TVMGraphExecutor* executor, const uint8_t* graph, size_t graph_size);
 
 #ifdef __cplusplus
 }
@@ -723,6 +723,155 @@ int TVMGraphExecutor_Load(TVMGraphExecutor* executor, JSONReader* reader) {
   return status;
 }
 
+// Return whether count items of item_size bytes at offset lie within the binary graph.
+static int GraphBinary_InBounds(const TVMGraphBinaryHeader* header, uint32_t offset,
+                                uint32_t count, size_t item_size) {
+  return offset <= header->size && count <= (header->size - offset) / item_size;
+}
+
+// Copy the string at offset into the strings of the binary graph into out.
+static int GraphBinary_CopyString(const TVMGraphBinaryHeader* header, const uint8_t* graph,
+                                  uint32_t offset, char* out, size_t out_size) {
+  if (offset >= header->strings_size) {
+    fprintf(stderr, "binary graph string offset out of range\n");
+    return -1;
+  }
+  const char* str = (const char*)(graph + header->strings_offset + offset);
+  size_t len = strlen(str);
+  if (len >= out_size) {
+    fprintf(stderr, "binary graph string too long: %s\n", str);
+    return -1;
+  }
+  memcpy(out, str, len + 1);
+  return 0;
+}
+
+int TVMGraphExecutor_LoadBinary(TVMGraphExecutor* executor, const uint8_t* graph,
+                                size_t graph_size) {
+  const TVMGraphBinaryHeader* header = (const TVMGraphBinaryHeader*)graph;
+  if (((uintptr_t)graph & 7) != 0 || graph_size < sizeof(TVMGraphBinaryHeader) ||
+      header->magic != TVM_GRAPH_BINARY_MAGIC || header->version != TVM_GRAPH_BINARY_VERSION ||
+      header->size != graph_size) {
+    fprintf(stderr, "invalid binary graph\n");
+    return -1;
+  }
+  if (header->max_ndim != TVM_CRT_MAX_NDIM ||
+      header->max_strlen_dltype != TVM_CRT_MAX_STRLEN_DLTYPE) {
+    fprintf(stderr, "binary graph was generated for another crt_config.h\n");
+    return -1;
+  }
+  if (!GraphBinary_InBounds(header, header->nodes_offset, header->nodes_count,
+                            sizeof(TVMGraphBinaryNode)) ||
+      !GraphBinary_InBounds(header, header->node_inputs_offset, header->node_inputs_count,
+                            sizeof(TVMGraphBinaryNodeEntry)) ||
+      !GraphBinary_InBounds(header, header->input_nodes_offset, header->input_nodes_count,
+                            sizeof(uint32_t)) ||
+      !GraphBinary_InBounds(header, header->node_row_ptr_offset, header->node_row_ptr_count,
+                            sizeof(uint32_t)) ||
+      !GraphBinary_InBounds(header, header->outputs_offset, header->outputs_count,
+                            sizeof(TVMGraphBinaryNodeEntry)) ||
+      !GraphBinary_InBounds(header, header->storage_id_offset, header->entries_count,
+                            sizeof(uint32_t)) ||
+      !GraphBinary_InBounds(header, header->device_index_offset, header->device_index_count,
+                            sizeof(uint32_t)) ||
+      !GraphBinary_InBounds(header, header->dltype_offset, header->entries_count,
+                            TVM_CRT_MAX_STRLEN_DLTYPE) ||
+      !GraphBinary_InBounds(header, header->shape_offset, header->entries_count,
+                            sizeof(int64_t) * TVM_CRT_MAX_NDIM) ||
+      !GraphBinary_InBounds(header, header->ndim_offset, header->entries_count,
+                            sizeof(uint32_t)) ||
+      !GraphBinary_InBounds(header, header->strings_offset, header->strings_size, 1) ||
+      header->strings_size == 0 || graph[header->strings_offset + header->strings_size - 1] != 0 ||
+      (header->shape_offset & 7) != 0) {
+    fprintf(stderr, "invalid binary graph layout\n");
+    return -1;
+  }
+
+  // Nodes hold the names inline and the inputs as separate allocation, they are copied.
+  DLDevice dev = {kDLCPU, 0};
+  tvm_crt_error_t err = TVMPlatformMemoryAllocate(
+      sizeof(TVMGraphExecutorNode) * header->nodes_count, dev, (void**)&executor->nodes);
+  if (err != kTvmErrorNoError) {
+    fprintf(stderr, "memory allocate error: %08x", err);
+    return -1;
+  }
+  const TVMGraphBinaryNode* binary_nodes =
+      (const TVMGraphBinaryNode*)(graph + header->nodes_offset);
+  const TVMGraphBinaryNodeEntry* node_inputs =
+      (const TVMGraphBinaryNodeEntry*)(graph + header->node_inputs_offset);
+  for (uint32_t nid = 0; nid < header->nodes_count; ++nid) {
+    const TVMGraphBinaryNode* binary_node = binary_nodes + nid;
+    TVMGraphExecutorNode* node = executor->nodes + nid;
+    *node = TVMGraphExecutorNodeCreate();
+    executor->nodes_count++;
+    if (GraphBinary_CopyString(header, graph, binary_node->op_type, node->op_type,
+                               sizeof(node->op_type)) != 0 ||
+        GraphBinary_CopyString(header, graph, binary_node->name, node->name,
+                               sizeof(node->name)) != 0 ||
+        GraphBinary_CopyString(header, graph, binary_node->func_name, node->param.func_name,
+                               sizeof(node->param.func_name)) != 0) {
+      return -1;
+    }
+    node->param.num_inputs = binary_node->num_inputs;
+    node->param.num_outputs = binary_node->num_outputs;
+    node->param.flatten_data = binary_node->flatten_data;
+    if (binary_node->inputs_begin > header->node_inputs_count ||
+        binary_node->inputs_count > header->node_inputs_count - binary_node->inputs_begin) {
+      fprintf(stderr, "binary graph node inputs out of range\n");
+      return -1;
+    }
+    if (binary_node->inputs_count == 0) {
+      continue;
+    }
+    err = TVMPlatformMemoryAllocate(sizeof(TVMGraphExecutorNodeEntry) * binary_node->inputs_count,
+                                    dev, (void**)&node->inputs);
+    if (err != kTvmErrorNoError) {
+      fprintf(stderr, "memory allocate error: %08x", err);
+      return -1;
+    }
+    for (uint32_t idx = 0; idx < binary_node->inputs_count; ++idx) {
+      const TVMGraphBinaryNodeEntry* entry = node_inputs + binary_node->inputs_begin + idx;
+      node->inputs[idx].node_id = entry->node_id;
+      node->inputs[idx].index = entry->index;
+      node->inputs[idx].version = entry->version;
+    }
+    node->inputs_count = binary_node->inputs_count;
+  }
+
+  err = TVMPlatformMemoryAllocate(sizeof(TVMGraphExecutorNodeEntry) * header->outputs_count, dev,
+                                  (void**)&executor->outputs);
+  if (err != kTvmErrorNoError) {
+    fprintf(stderr, "memory allocate error: %08x", err);
+    return -1;
+  }
+  const TVMGraphBinaryNodeEntry* outputs =
+      (const TVMGraphBinaryNodeEntry*)(graph + header->outputs_offset);
+  for (uint32_t idx = 0; idx < header->outputs_count; ++idx) {
+    executor->outputs[idx].node_id = outputs[idx].node_id;
+    executor->outputs[idx].index = outputs[idx].index;
+    executor->outputs[idx].version = outputs[idx].version;
+  }
+  executor->outputs_count = header->outputs_count;
+
+  // The integer arrays are only read by the executor and used in place.
+  executor->graph_binary = graph;
+  executor->input_nodes = (uint32_t*)(graph + header->input_nodes_offset);
+  executor->input_nodes_count = header->input_nodes_count;
+  executor->node_row_ptr = (uint32_t*)(graph + header->node_row_ptr_offset);
+  executor->node_row_ptr_count = header->node_row_ptr_count;
+  TVMGraphExecutorGraphAttr* attrs = &executor->attrs;
+  attrs->storage_id = (uint32_t*)(graph + header->storage_id_offset);
+  attrs->device_index = header->device_index_count == 0
+                            ? NULL
+                            : (uint32_t*)(graph + header->device_index_offset);
+  attrs->dltype = (char*)(graph + header->dltype_offset);
+  attrs->dltype_count = header->entries_count;
+  attrs->shape = (int64_t*)(graph + header->shape_offset);
+  attrs->ndim = (uint32_t*)(graph + header->ndim_offset);
+  attrs->shape_count = header->entries_count;
+  return 0;
+}
+
 uint32_t TVMGraphExecutor_GetEntryId(TVMGraphExecutor* executor, uint32_t nid, uint32_t index) {
   return executor->node_row_ptr[nid] + index;
 }
@@ -756,19 +905,37 @@ int TVMGraphExecutor_GetInputIndex(TVMGraphExecutor* executor, const char* name)
   return rv;
 }
 
+/*!
+ * \brief Return whether a data entry is bound to a linked or embedded parameter.
+ * \param executor The graph executor.
+ * \param eid The data entry id.
+ * \return 1 if the entry points into read-only parameter data, 0 otherwise.
+ */
+int TVMGraphExecutor_IsLinkedParamEntry(TVMGraphExecutor* executor, uint32_t eid) {
+  uint32_t storage_id = executor->attrs.storage_id[eid];
+  return executor->storage_pool[storage_id].is_linked_param != 0;
+}
+
 /*!
  * \brief set input to the graph based on name.
  * \param executor The graph executor.
  * \param name The name of the input.
  * \param data_in The input data.
+ * \return 0 on success, -1 if the input is a linked or embedded parameter.
  */
-void TVMGraphExecutor_SetInput(TVMGraphExecutor* executor, const char* name, DLTensor* data_in) {
+int TVMGraphExecutor_SetInput(TVMGraphExecutor* executor, const char* name, DLTensor* data_in) {
   uint32_t index = TVMGraphExecutor_GetInputIndex(executor, name);
   if (index >= executor->input_nodes_count) {
     fprintf(stderr, "given index is greater than num of input nodes.\n");
   }
   uint32_t eid = TVMGraphExecutor_GetEntryId(executor, executor->input_nodes[index], 0);
+  if (TVMGraphExecutor_IsLinkedParamEntry(executor, eid)) {
+    fprintf(stderr, "Error: input '%s' is a linked or embedded parameter and is read-only.\n",
+            name);
+    return -1;
+  }
   executor->data_entry[eid].dl_tensor.data = data_in->data;
+  return 0;
 }
 
 /*!
@@ -839,6 +1006,12 @@ int TVMGraphExecutor_LoadParams(TVMGraphExecutor* executor, const char* param_bl
       fprintf(stderr, "`entry_id`=%ld is greater than expected(%ld).\n", eid,
               executor->data_entry_count);
       status = -1;
+    } else if (TVMGraphExecutor_IsLinkedParamEntry(executor, eid)) {
+      // Linked and embedded parameters live in read-only memory that was never allocated.
+      fprintf(stderr, "Error: param %s is a linked or embedded parameter and is read-only.\n",
+              names + TVM_CRT_MAX_STRLEN_PARAM_NAME * idx);
+      status = -1;
+      break;
     }
 
     if (executor->data_entry[eid].dl_tensor.shape) {
@@ -915,6 +1088,25 @@ int TVMGraphExecutor_GetOutput(TVMGraphExecutor* executor, const int32_t idx, DL
   return status;
 }
 
+static const TVMGraphExecutorEmbeddedParam* g_embedded_params = NULL;
+static size_t g_embedded_params_count = 0;
+
+void TVMGraphExecutor_SetEmbeddedParams(const TVMGraphExecutorEmbeddedParam* params,
+                                        size_t params_count) {
+  g_embedded_params = params;
+  g_embedded_params_count = params_count;
+}
+
+// Return the embedded parameter stored in storage_id, or NULL.
+static const void* TVMGraphExecutor_LookupEmbeddedParam(uint32_t storage_id) {
+  for (size_t idx = 0; idx < g_embedded_params_count; ++idx) {
+    if (g_embedded_params[idx].storage_id == storage_id) {
+      return g_embedded_params[idx].data;
+    }
+  }
+  return NULL;
+}
+
 int TVMGraphExecutor_SetupStorage(TVMGraphExecutor* executor) {
   TVMPackedFunc lookup_linked_param;
   int lookup_linked_param_valid;
@@ -984,22 +1176,22 @@ int TVMGraphExecutor_SetupStorage(TVMGraphExecutor* executor) {
     TVMGraphExecutorPoolEntry pit = pool_entry[idx];
     DLDevice dev = executor->devices[0];
     uint8_t did_find_linked_param = 0;
-    if (lookup_linked_param_valid) {
+    // Embedded parameters are bound like linked parameters, in place and never released.
+    void* linked_param_data = (void*)TVMGraphExecutor_LookupEmbeddedParam(idx);
+    if (linked_param_data == NULL && lookup_linked_param_valid) {
       lookup_linked_param.args.values[0].v_int64 = idx;
       CHECK_EQ(lookup_linked_param.Call(&lookup_linked_param), 0, "lookup_linked_param");
-
-      void* linked_param_data = lookup_linked_param.ret_value.values[0].v_handle;
-      if (linked_param_data != NULL) {
-        executor->storage_pool[executor->storage_pool_count].is_linked_param = 1;
-        DLTensor* tensor = &executor->storage_pool[executor->storage_pool_count].array.dl_tensor;
-        tensor->data = linked_param_data;
-        tensor->device = dev;
-        tensor->ndim = attrs->ndim[pit.entry_id];
-        tensor->shape = attrs->shape + idx * TVM_CRT_MAX_NDIM;
-        tensor->strides = NULL;
-        tensor->byte_offset = 0;
-        did_find_linked_param = 1;
-      }
+      linked_param_data = lookup_linked_param.ret_value.values[0].v_handle;
+    }
+    if (linked_param_data != NULL) {
+      DLTensor* tensor = &executor->storage_pool[executor->storage_pool_count].array.dl_tensor;
+      tensor->data = linked_param_data;
+      tensor->device = dev;
+      tensor->ndim = attrs->ndim[pit.entry_id];
+      tensor->shape = attrs->shape + idx * TVM_CRT_MAX_NDIM;
+      tensor->strides = NULL;
+      tensor->byte_offset = 0;
+      did_find_linked_param = 1;
     }
     if (did_find_linked_param == 0) {
       DLDataType dtype = {kDLFloat, 32, 1};
@@ -1011,6 +1203,8 @@ int TVMGraphExecutor_SetupStorage(TVMGraphExecutor* executor) {
                                     &executor->storage_pool[executor->storage_pool_count].array);
       CHECK_EQ(status, 0, "fail to create storage_pool with idx=%ld\n", idx);
     }
+    // The storage pool is not zeroed, Release frees the entries without this flag.
+    executor->storage_pool[executor->storage_pool_count].is_linked_param = did_find_linked_param;
     executor->storage_pool_count++;
   }
 
@@ -1161,6 +1355,21 @@ int32_t TVMGraphExecutor_CreateTVMOp(TVMGraphExecutor* executor, const TVMOpPara
  * executed on.
  * \return 0 on success.
  */
+static int TVMGraphExecutor_Setup(TVMGraphExecutor* executor, TVMModuleHandle module_handle,
+                                  const DLDevice* devs) {
+  executor->module_handle = module_handle;
+  executor->devices[0] = devs[0];
+
+  int status;
+  status = TVMGraphExecutor_SetupStorage(executor);
+  if (status != 0) {
+    return status;
+  }
+  status = TVMGraphExecutor_SetupOpExecs(executor);
+
+  return status;
+}
+
 int TVMGraphExecutor_Init(TVMGraphExecutor* executor, const char* graph_json,
                           TVMModuleHandle module_handle, const DLDevice* devs) {
   JSONReader reader;
@@ -1174,17 +1383,7 @@ int TVMGraphExecutor_Init(TVMGraphExecutor* executor, const char* graph_json,
   if (err != kTvmErrorNoError) {
     return -1;
   }
-  executor->module_handle = module_handle;
-  executor->devices[0] = devs[0];
-
-  int status;
-  status = TVMGraphExecutor_SetupStorage(executor);
-  if (status != 0) {
-    return status;
-  }
-  status = TVMGraphExecutor_SetupOpExecs(executor);
-
-  return status;
+  return TVMGraphExecutor_Setup(executor, module_handle, devs);
 }
 
 int TVMGraphExecutor_Create(const char* sym_json, TVMModuleHandle module_handle,
@@ -1201,6 +1400,24 @@ int TVMGraphExecutor_Create(const char* sym_json, TVMModuleHandle module_handle,
   return TVMGraphExecutor_Init(*executor, sym_json, module_handle, devs);
 }
 
+int TVMGraphExecutor_CreateFromBinary(const uint8_t* graph, size_t graph_size,
+                                      TVMModuleHandle module_handle, const DLDevice* devs,
+                                      TVMGraphExecutor** executor) {
+  DLDevice dev = {kDLCPU, 0};
+  tvm_crt_error_t err = TVMPlatformMemoryAllocate(sizeof(TVMGraphExecutor), dev, (void**)executor);
+  if (err != kTvmErrorNoError) {
+    fprintf(stderr, "memory allocate error: %08x", err);
+    return -1;
+  }
+
+  memset(*executor, 0, sizeof(TVMGraphExecutor));
+  int status = TVMGraphExecutor_LoadBinary(*executor, graph, graph_size);
+  if (status != 0) {
+    return status;
+  }
+  return TVMGraphExecutor_Setup(*executor, module_handle, devs);
+}
+
 int TVMGraphExecutor_Release(TVMGraphExecutor** pptr) {
   int status = 0;
   int32_t idx;
@@ -1216,9 +1433,12 @@ int TVMGraphExecutor_Release(TVMGraphExecutor** pptr) {
   if (status != 0) {
     return status;
   }
-  status = TVMGraphExecutorGraphAttr_Release(&(executor->attrs));
-  if (status != 0) {
-    return status;
+  // The arrays of a binary graph point into the graph itself.
+  if (executor->graph_binary == NULL) {
+    status = TVMGraphExecutorGraphAttr_Release(&(executor->attrs));
+    if (status != 0) {
+      return status;
+    }
   }
   for (idx = 0; idx < executor->storage_pool_count; ++idx) {
     if (executor->storage_pool[idx].is_linked_param == 0) {
@@ -1234,13 +1454,15 @@ int TVMGraphExecutor_Release(TVMGraphExecutor** pptr) {
       return status;
     }
   }
-  status = TVMPlatformMemoryFree(executor->input_nodes, dev);
-  if (status != 0) {
-    return status;
-  }
-  status = TVMPlatformMemoryFree(executor->node_row_ptr, dev);
-  if (status != 0) {
-    return status;
+  if (executor->graph_binary == NULL) {
+    status = TVMPlatformMemoryFree(executor->input_nodes, dev);
+    if (status != 0) {
+      return status;
+    }
+    status = TVMPlatformMemoryFree(executor->node_row_ptr, dev);
+    if (status != 0) {
+      return status;
+    }
   }
   status = TVMPlatformMemoryFree(executor->outputs, dev);
   if (status != 0) {
@@ -38,6 +38,14 @@ typedef struct {
 
 static GraphExecutorModule graph_executor;
 
+static const uint8_t* g_binary_graph = NULL;
+static size_t g_binary_graph_size = 0;
+
+void TVMGraphExecutorModule_SetBinaryGraph(const uint8_t* graph, size_t graph_size) {
+  g_binary_graph = graph;
+  g_binary_graph_size = graph_size;
+}
+
 int32_t TVMGraphExecutorModule_Create(TVMValue* args, int* tcodes, int nargs, TVMValue* ret_values,
                                       int* ret_tcodes, void* resource_handle) {
   if (graph_executor.executor != NULL) {
@@ -58,8 +66,14 @@ int32_t TVMGraphExecutorModule_Create(TVMValue* args, int* tcodes, int nargs, TV
   }
 
   DLDevice dev = {(DLDeviceType)args[2].v_int64, (int)args[3].v_int64};
-  int ret_value =
-      TVMGraphExecutor_Create(args[0].v_str, args[1].v_handle, &dev, &graph_executor.executor);
+  int ret_value;
+  if (args[0].v_str[0] == '\0' && g_binary_graph != NULL) {
+    ret_value = TVMGraphExecutor_CreateFromBinary(g_binary_graph, g_binary_graph_size,
+                                                  args[1].v_handle, &dev, &graph_executor.executor);
+  } else {
+    ret_value =
+        TVMGraphExecutor_Create(args[0].v_str, args[1].v_handle, &dev, &graph_executor.executor);
+  }
   if (ret_value != 0) {
     return ret_value;
   }
@@ -95,6 +109,11 @@ int32_t TVMGraphExecutorModule_GetInput(TVMValue* args, int* tcodes, int nargs,
 
   uint32_t eid = TVMGraphExecutor_GetEntryId(graph_executor.executor,
                                              graph_executor.executor->input_nodes[index], 0);
+  // The host writes inputs through the returned tensor, linked and embedded parameters are
+  // read-only.
+  if (TVMGraphExecutor_IsLinkedParamEntry(graph_executor.executor, eid)) {
+    return kTvmErrorFunctionCallInvalidArg;
+  }
 
   TVMNDArray* array = &graph_executor.executor->data_entry[eid];
 
@@ -212,7 +231,10 @@ int32_t TVMGraphExecutorModule_SetInput(TVMValue* args, int* tcodes, int nargs,
     return kTvmErrorFunctionCallWrongArgType;
   }
 
-  TVMGraphExecutor_SetInput(graph_executor.executor, args[0].v_str, (DLTensor*)args[1].v_handle);
+  if (TVMGraphExecutor_SetInput(graph_executor.executor, args[0].v_str,
+                                (DLTensor*)args[1].v_handle) != 0) {
+    return kTvmErrorFunctionCallInvalidArg;
+  }
 
   ret_tcodes[0] = kTVMNullptr;
   return 0;
@@ -0,0 +1,230 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+// LINT_C_FILE
+
+/*!
+ * \file buddy_allocator.c
+ * \brief Buddy memory manager
+ *
+ * Free blocks of order k (2^k minimum blocks) are kept in a doubly-linked list per order, stored
+ * inside the free blocks themselves, and a bitmask records which lists are non-empty. Allocate
+ * takes the smallest non-empty order with one count-trailing-zeros and splits it down, Free
+ * merges a block with its buddy as long as the buddy is free. Both take at most one step per
+ * order and never search the allocations. A byte per minimum block holds the order and state of
+ * the block starting there, and is zero inside blocks.
+ */
+
+#include <string.h>
+#include <tvm/runtime/crt/buddy_allocator.h>
+#include <tvm/runtime/crt/logging.h>
+
+#include "crt_config.h"
+
+#ifndef TVM_RUNTIME_ALLOC_ALIGNMENT_BYTES
+#define TVM_RUNTIME_ALLOC_ALIGNMENT_BYTES 16
+#endif
+
+#define BUDDY_MAX_ORDERS 32
+#define BUDDY_ORDER_MASK 0x3f
+#define BUDDY_BLOCK_FREE 0x40
+#define BUDDY_BLOCK_ALLOCATED 0x80
+
+typedef struct BuddyFreeBlock {
+  struct BuddyFreeBlock* prev;
+  struct BuddyFreeBlock* next;
+} BuddyFreeBlock;
+
+typedef struct BuddyMemoryManager {
+  MemoryManagerInterface interface;
+  uint8_t* blocks;
+  uint8_t* block_info;
+  size_t num_blocks;
+  size_t block_bytes_log2;
+  /*! \brief Bit k is set if free_lists[k] is not empty. */
+  uint32_t free_orders;
+  BuddyFreeBlock* free_lists[BUDDY_MAX_ORDERS];
+  BuddyMemoryManagerStats stats;
+} BuddyMemoryManager;
+
+static BuddyFreeBlock* Buddy_Block(BuddyMemoryManager* mgr, size_t index) {
+  return (BuddyFreeBlock*)(mgr->blocks + (index << mgr->block_bytes_log2));
+}
+
+static void Buddy_PushFree(BuddyMemoryManager* mgr, size_t index, uint32_t order) {
+  BuddyFreeBlock* block = Buddy_Block(mgr, index);
+  block->prev = NULL;
+  block->next = mgr->free_lists[order];
+  if (block->next != NULL) {
+    block->next->prev = block;
+  }
+  mgr->free_lists[order] = block;
+  mgr->free_orders |= 1u << order;
+  mgr->block_info[index] = BUDDY_BLOCK_FREE | order;
+}
+
+static void Buddy_RemoveFree(BuddyMemoryManager* mgr, size_t index, uint32_t order) {
+  BuddyFreeBlock* block = Buddy_Block(mgr, index);
+  if (block->prev != NULL) {
+    block->prev->next = block->next;
+  } else {
+    mgr->free_lists[order] = block->next;
+  }
+  if (block->next != NULL) {
+    block->next->prev = block->prev;
+  }
+  if (mgr->free_lists[order] == NULL) {
+    mgr->free_orders &= ~(1u << order);
+  }
+  mgr->block_info[index] = 0;
+}
+
+tvm_crt_error_t BuddyMemoryManager_Allocate(MemoryManagerInterface* interface, size_t num_bytes,
+                                            DLDevice dev, void** out_ptr) {
+  BuddyMemoryManager* mgr = (BuddyMemoryManager*)interface;
+  *out_ptr = NULL;
+
+  size_t num_blocks = (num_bytes + ((size_t)1 << mgr->block_bytes_log2) - 1) >>
+                      mgr->block_bytes_log2;
+  uint32_t order = 0;
+  while (((size_t)1 << order) < num_blocks) {
+    order++;
+  }
+  if (order >= BUDDY_MAX_ORDERS) {
+    return kTvmErrorPlatformNoMemory;
+  }
+  uint32_t candidates = mgr->free_orders & ~((1u << order) - 1);
+  if (candidates == 0) {
+    return kTvmErrorPlatformNoMemory;
+  }
+
+  uint32_t free_order = __builtin_ctz(candidates);
+  size_t index = ((uint8_t*)mgr->free_lists[free_order] - mgr->blocks) >> mgr->block_bytes_log2;
+  Buddy_RemoveFree(mgr, index, free_order);
+  // Return the upper halves to the free lists until the block has the requested order.
+  while (free_order > order) {
+    free_order--;
+    Buddy_PushFree(mgr, index + ((size_t)1 << free_order), free_order);
+  }
+  mgr->block_info[index] = BUDDY_BLOCK_ALLOCATED | order;
+
+  size_t block_bytes = (size_t)1 << (order + mgr->block_bytes_log2);
+  mgr->stats.allocated_bytes += block_bytes;
+  if (mgr->stats.allocated_bytes > mgr->stats.peak_allocated_bytes) {
+    mgr->stats.peak_allocated_bytes = mgr->stats.allocated_bytes;
+  }
+  mgr->stats.requested_bytes_total += num_bytes;
+  mgr->stats.block_bytes_total += block_bytes;
+  mgr->interface.vleak_size++;
+  *out_ptr = Buddy_Block(mgr, index);
+  return kTvmErrorNoError;
+}
+
+tvm_crt_error_t BuddyMemoryManager_Free(MemoryManagerInterface* interface, void* ptr,
+                                        DLDevice dev) {
+  BuddyMemoryManager* mgr = (BuddyMemoryManager*)interface;
+
+  // Pointers below the blocks wrap around to an offset beyond them.
+  size_t offset = (size_t)((uint8_t*)ptr - mgr->blocks);
+  size_t index = offset >> mgr->block_bytes_log2;
+  CHECK_LT(index, mgr->num_blocks, "pointer was not allocated by the buddy allocator.");
+  CHECK_EQ(index << mgr->block_bytes_log2, offset, "pointer is not the start of a block.");
+  uint8_t info = mgr->block_info[index];
+  CHECK_NE((info & BUDDY_BLOCK_ALLOCATED), 0, "pointer is not an allocated block.");
+  uint32_t order = info & BUDDY_ORDER_MASK;
+  mgr->stats.allocated_bytes -= (size_t)1 << (order + mgr->block_bytes_log2);
+
+  // Merge with the buddy while it is a free block of the same order. The pool is split into
+  // aligned power-of-two blocks, so a buddy beyond its end never exists.
+  while (order + 1 < BUDDY_MAX_ORDERS) {
+    size_t buddy = index ^ ((size_t)1 << order);
+    if (buddy + ((size_t)1 << order) > mgr->num_blocks ||
+        mgr->block_info[buddy] != (BUDDY_BLOCK_FREE | order)) {
+      break;
+    }
+    Buddy_RemoveFree(mgr, buddy, order);
+    mgr->block_info[index] = 0;
+    index = index < buddy ? index : buddy;
+    order++;
+  }
+  Buddy_PushFree(mgr, index, order);
+  mgr->interface.vleak_size--;
+  return kTvmErrorNoError;
+}
+
+void BuddyMemoryManager_GetStats(MemoryManagerInterface* interface,
+                                 BuddyMemoryManagerStats* stats) {
+  BuddyMemoryManager* mgr = (BuddyMemoryManager*)interface;
+  *stats = mgr->stats;
+  stats->free_bytes = stats->pool_bytes - stats->allocated_bytes;
+  stats->largest_free_bytes = 0;
+  if (mgr->free_orders != 0) {
+    uint32_t largest_order = 31 - __builtin_clz(mgr->free_orders);
+    stats->largest_free_bytes = (size_t)1 << (largest_order + mgr->block_bytes_log2);
+  }
+}
+
+void BuddyMemoryManager_ResetStats(MemoryManagerInterface* interface) {
+  BuddyMemoryManager* mgr = (BuddyMemoryManager*)interface;
+  mgr->stats.peak_allocated_bytes = mgr->stats.allocated_bytes;
+  mgr->stats.requested_bytes_total = 0;
+  mgr->stats.block_bytes_total = 0;
+}
+
+static uint8_t* Buddy_AlignUp(uint8_t* ptr) {
+  uintptr_t addr = (uintptr_t)ptr + TVM_RUNTIME_ALLOC_ALIGNMENT_BYTES - 1;
+  return (uint8_t*)(addr & ~(uintptr_t)(TVM_RUNTIME_ALLOC_ALIGNMENT_BYTES - 1));
+}
+
+tvm_crt_error_t BuddyMemoryManagerCreate(MemoryManagerInterface** interface, uint8_t* memory_pool,
+                                         size_t memory_pool_size_bytes,
+                                         size_t min_block_bytes_log2) {
+  // The state, then the block info array, then the blocks, each starting at an aligned address.
+  uint8_t* pool_end = memory_pool + memory_pool_size_bytes;
+  uint8_t* block_info = Buddy_AlignUp(memory_pool) + sizeof(BuddyMemoryManager);
+  // A free block holds its list links.
+  if (((size_t)1 << min_block_bytes_log2) < sizeof(BuddyFreeBlock) ||
+      block_info + TVM_RUNTIME_ALLOC_ALIGNMENT_BYTES > pool_end) {
+    return kTvmErrorPlatformNoMemory;
+  }
+  memset(memory_pool, 0, memory_pool_size_bytes);
+
+  BuddyMemoryManager* manager = (BuddyMemoryManager*)Buddy_AlignUp(memory_pool);
+  *interface = &manager->interface;
+  manager->interface.Allocate = BuddyMemoryManager_Allocate;
+  manager->interface.Free = BuddyMemoryManager_Free;
+  manager->block_bytes_log2 = min_block_bytes_log2;
+
+  size_t available_bytes = pool_end - block_info - (TVM_RUNTIME_ALLOC_ALIGNMENT_BYTES - 1);
+  size_t num_blocks = available_bytes / (((size_t)1 << min_block_bytes_log2) + 1);
+  manager->block_info = block_info;
+  manager->blocks = Buddy_AlignUp(block_info + num_blocks);
+  manager->num_blocks = num_blocks;
+  manager->stats.pool_bytes = num_blocks << min_block_bytes_log2;
+
+  // Cover the pool with the largest aligned power-of-two blocks, largest first.
+  size_t index = 0;
+  for (int order = BUDDY_MAX_ORDERS - 1; order >= 0; order--) {
+    if (index + ((size_t)1 << order) <= num_blocks) {
+      Buddy_PushFree(manager, index, order);
+      index += (size_t)1 << order;
+    }
+  }
+  return kTvmErrorNoError;
+}
@@ -36,6 +36,7 @@
 #include <stdlib.h>
 
 #include "../tab/gentab_ccitt.inc"
+#include "../tab/gentab_ccitt_slice4.inc"
 #include "checksum.h"
 
 static uint16_t crc_ccitt_generic(const unsigned char* input_str, size_t num_bytes,
@@ -90,19 +91,9 @@ uint16_t crc_ccitt_ffff(const unsigned char* input_str, size_t num_bytes) {
 
 static uint16_t crc_ccitt_generic(const unsigned char* input_str, size_t num_bytes,
                                   uint16_t start_value) {
-  uint16_t crc;
-  const unsigned char* ptr;
-  size_t a;
+  if (input_str == NULL) return start_value;
 
-  crc = start_value;
-  ptr = input_str;
-
-  if (ptr != NULL)
-    for (a = 0; a < num_bytes; a++) {
-      crc = (crc << 8) ^ crc_tabccitt[((crc >> 8) ^ (uint16_t)*ptr++) & 0x00FF];
-    }
-
-  return crc;
+  return update_crc_ccitt_block(start_value, input_str, num_bytes);
 
 } /* crc_ccitt_generic */
 
@@ -117,3 +108,54 @@ uint16_t update_crc_ccitt(uint16_t crc, unsigned char c) {
   return (crc << 8) ^ crc_tabccitt[((crc >> 8) ^ (uint16_t)c) & 0x00FF];
 
 } /* update_crc_ccitt */
+
+#if defined(__riscv_zbc) || defined(__riscv_zbkc)
+/*
+ * static uint16_t crc_ccitt_clmul32( uint32_t m );
+ *
+ * Returns m(x) * x^16 mod P(x) for the CCITT polynomial, computed by Barrett reduction with
+ * the carry-less multiplications of the RISC-V bit-manipulation extensions. The quotient
+ * m * x^16 / P is m ^ clmulh(m, mu) with floor(x^48 / P) = x^32 + mu.
+ */
+
+static inline uint16_t crc_ccitt_clmul32(uint32_t m) {
+  uint32_t q, r;
+  __asm__("clmulh %0, %1, %2" : "=r"(q) : "r"(m), "r"(0x11303471u));
+  q ^= m;
+  __asm__("clmul %0, %1, %2" : "=r"(r) : "r"(q), "r"((uint32_t)CRC_POLY_CCITT));
+  return (uint16_t)r;
+
+} /* crc_ccitt_clmul32 */
+#endif
+
+/*
+ * uint16_t update_crc_ccitt_block( uint16_t crc, const unsigned char *input_str, size_t num_bytes );
+ *
+ * The function update_crc_ccitt_block() continues the CRC-CCITT value crc over a byte string,
+ * giving the same result as calling update_crc_ccitt() for every byte. Four bytes are processed
+ * at once, with carry-less multiplications on cores with the Zbc (or Zbkc) extension and with
+ * the slice-by-4 tables otherwise.
+ */
+
+uint16_t update_crc_ccitt_block(uint16_t crc, const unsigned char* input_str, size_t num_bytes) {
+  const unsigned char* ptr = input_str;
+
+  for (; num_bytes >= 4; num_bytes -= 4, ptr += 4) {
+#if defined(__riscv_zbc) || defined(__riscv_zbkc)
+    uint32_t m = ((uint32_t)crc << 16) ^ ((uint32_t)ptr[0] << 24) ^ ((uint32_t)ptr[1] << 16) ^
+                 ((uint32_t)ptr[2] << 8) ^ (uint32_t)ptr[3];
+    crc = crc_ccitt_clmul32(m);
+#else
+    crc = crc_tabccitt_slice4[2][((crc >> 8) ^ ptr[0]) & 0x00FF] ^
+          crc_tabccitt_slice4[1][(crc ^ ptr[1]) & 0x00FF] ^ crc_tabccitt_slice4[0][ptr[2]] ^
+          crc_tabccitt[ptr[3]];
+#endif
+  }
+
+  for (; num_bytes > 0; num_bytes--) {
+    crc = (crc << 8) ^ crc_tabccitt[((crc >> 8) ^ (uint16_t)*ptr++) & 0x00FF];
+  }
+
+  return crc;
+
+} /* update_crc_ccitt_block */
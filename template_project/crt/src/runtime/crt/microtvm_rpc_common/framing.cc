@@ -48,11 +48,7 @@ namespace micro_rpc {
 
 uint16_t crc16_compute(const uint8_t* data, size_t data_size_bytes, uint16_t* previous_crc) {
   uint16_t crc = (previous_crc != nullptr ? *previous_crc : 0xffff);
-  for (size_t i = 0; i < data_size_bytes; ++i) {
-    crc = update_crc_ccitt(crc, data[i]);
-  }
-
-  return crc;
+  return update_crc_ccitt_block(crc, data, data_size_bytes);
 }
 
 template <typename E>
@@ -57,7 +57,7 @@
 #define TVM_CRT_MAX_FUNCTION_NAME_LENGTH_BYTES 30
 
 /*! \brief Log2 of the page size (bytes) for a virtual memory page. */
-#define TVM_CRT_PAGE_BITS 10  // 1 kB
+#define TVM_CRT_PAGE_BITS 8  // 256 B
 
 /*! \brief Number of pages on device. */
 #define TVM_CRT_MAX_PAGES 1200
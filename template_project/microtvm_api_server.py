@@ -16,10 +16,14 @@
 # under the License.
 
 import atexit
+import bisect
 import collections
 import collections.abc
+import contextlib
 import enum
 import fcntl
+import gzip
+import hashlib
 import logging
 import os
 import os.path
@@ -27,8 +31,10 @@ import pathlib
 import queue
 import re
 import select
+import selectors
 import shlex
 import shutil
+import struct
 import subprocess
 import sys
 import tarfile
@@ -37,6 +43,7 @@ import threading
 import time
 import json
 import signal
+import socket
 
 import yaml
 
@@ -54,7 +61,105 @@ BUILD_DIR = API_SERVER_DIR / "build"
 
 MODEL_LIBRARY_FORMAT_RELPATH = "model.tar"
 
-MEMORY_SIZE_BYTES = 2 * 1024 * 1024
+# Model Library Format members the firmware build consumes, relative to the tarball root.
+MODEL_LIBRARY_FORMAT_BUILD_MEMBERS = (
+    "codegen/host/src/",
+    "codegen/host/include/",
+    "codegen/host/lib/",
+    "executor-config/graph/",
+    "metadata.json",
+)
+
+# Page size of the CRT page allocator.
+# NOTE: keep in sync with TVM_CRT_PAGE_BITS in crt_config/crt_config.h
+PAGE_ALLOCATOR_PAGE_BYTES = 1 << 8
+
+# Memory the RPC server and the executor allocate besides the tensors in host-driven projects,
+# four packets of TVM_CRT_MAX_PACKET_SIZE_BYTES (see crt_config/crt_config.h).
+HOST_DRIVEN_RUNTIME_BYTES = 4 * 4096
+
+# Memory the graph executor allocates per node of the graph JSON (node, entry and attribute
+# structs).
+GRAPH_EXECUTOR_NODE_BYTES = 512
+
+# Share added on top of the arena estimate. The runtime allocations above are approximations,
+# which depend on the TVM version and the graph, so the estimate is not a tight bound.
+ARENA_ESTIMATE_MARGIN = 0.25
+
+# L2 memory of the PULP configuration, and the part of it taken by code, data, stacks and heap
+# of the runtime. Whatever is left can hold the arena and the model.
+L2_SIZE_BYTES = 512 * 1024
+L2_RESERVED_BYTES = 128 * 1024
+
+# Linker script of the PULP target in pulp_freertos_path. Its MEMORY command has the region of
+# the cluster L1 TCDM, which the fabric controller reaches through the SoC interconnect.
+PULP_LINK_SCRIPT_RELPATH = "target/pulp/link.ld"
+L1_MEMORY_REGION = "L1"
+
+# Linker script fragment placing the arena and the weights, relative to the project dir.
+MEMORY_PLACEMENT_SCRIPT_RELPATH = "memory_placement.ld"
+
+MEMORY_PLACEMENTS = ("l2", "auto")
+
+# Core clock frequency of the default GVSoC PULP configuration.
+CORE_FREQ_HZ = 100000000
+
+# PULP performance counter events in the order of their PCER bits, selected with profiling_events.
+# NOTE: keep in sync with PERF_COUNTER_EVENTS in microtvm_gvsoc.py
+PERF_COUNTER_EVENTS = (
+    "cycles",
+    "instr",
+    "ld_stall",
+    "jmp_stall",
+    "imiss",
+    "ld",
+    "st",
+    "jump",
+    "branch",
+    "taken_branch",
+    "rvc",
+    "ld_ext",
+    "st_ext",
+    "ld_ext_cyc",
+    "st_ext_cyc",
+    "tcdm_cont",
+)
+
+GVSOC_CONFIG_FILE = "pulp@config_file=chips/pulp/pulp.json"
+
+# Records the hash of the inputs of the last egvsoc.sh "prepare" step run in the build dir.
+GVSOC_PREPARE_STAMP_RELPATH = ".gvsoc_prepare_stamp"
+
+# Named pipes used for RPC traffic with rpc_transport=fifo, relative to the build dir.
+# NOTE: keep in sync with RPC_FIFO_* in src/host_driven/main.cc
+RPC_FIFO_HOST_TO_DEVICE_RELPATH = "rpc_h2d.fifo"
+RPC_FIFO_DEVICE_TO_HOST_RELPATH = "rpc_d2h.fifo"
+
+# Simulator console output is written here with rpc_transport=fifo, relative to the build dir.
+GVSOC_CONSOLE_LOG_RELPATH = "gvsoc_console.log"
+
+# Default location of the timing log, relative to the project dir.
+TIMING_LOG_RELPATH = "timing.jsonl"
+
+# Output of the simulator pool daemon of a project, relative to the build dir.
+SIMULATOR_POOL_LOG_RELPATH = "simulator_pool.log"
+
+# A simulator pool daemon shuts down after this long without a checked-out simulator.
+SIMULATOR_POOL_IDLE_TIMEOUT_SEC = 300
+
+# How long an API server waits for a simulator pool daemon it started to accept connections.
+SIMULATOR_POOL_START_TIMEOUT_SEC = 10
+
+# Command line argument which runs this script as the simulator pool daemon of a project.
+SIMULATOR_POOL_DAEMON_ARG = "--simulator-pool-daemon"
+
+# With trace_file, GVSoC writes the instruction trace into this named pipe and the API server
+# compresses it into INSN_TRACE_RELPATH + suffix and summarizes it in INSN_HOTSPOTS_RELPATH.
+# All relative to the build dir.
+INSN_TRACE_FIFO_RELPATH = "insn_trace.fifo"
+INSN_TRACE_RELPATH = "insn_trace.log"
+INSN_HOTSPOTS_RELPATH = "insn_hotspots.txt"
+TRACE_COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
 
 IS_TEMPLATE = not (API_SERVER_DIR / MODEL_LIBRARY_FORMAT_RELPATH).exists()
 
@@ -79,16 +184,23 @@ class CMakeCache(collections.abc.Mapping):
         self._dict = None
 
     def __iter__(self):
-        return iter(self._dict)
+        return iter(self._get_dict())
 
     def __getitem__(self, key):
+        return self._get_dict()[key]
+
+    def __len__(self):
+        return len(self._get_dict())
+
+    def _get_dict(self):
         if self._dict is None:
             self._dict = self._read_cmake_cache()
 
-        return self._dict[key]
+        return self._dict
 
-    def __len__(self):
-        return len(self._dict)
+    def reload(self):
+        """Discard the cached values so that the file is read again on the next access."""
+        self._dict = None
 
     def _read_cmake_cache(self):
         """Read a CMakeCache.txt-like file and return a dictionary of values."""
@@ -112,15 +224,1293 @@ class CMakeCache(collections.abc.Mapping):
 CMAKE_CACHE = CMakeCache(BUILD_DIR / "CMakeCache.txt")
 
 
+class BuildJobServer:
+    """Host-wide budget of build jobs shared by concurrently running builds.
+
+    Every job slot is a lock file in a shared directory and a build owns one job per slot it
+    holds an exclusive flock on. The kernel drops the locks if a build process dies, so slots
+    cannot leak.
+    """
+
+    POLL_INTERVAL_SEC = 0.1
+
+    def __init__(self, num_slots, lock_dir=None):
+        self._num_slots = num_slots
+        self._lock_dir = pathlib.Path(
+            lock_dir or os.path.join(tempfile.gettempdir(), f"microtvm-gvsoc-jobs-{os.getuid()}")
+        )
+        self._held = []
+
+    def acquire(self, max_jobs):
+        """Grab up to max_jobs free slots, waiting until at least one is available."""
+        self._lock_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            for slot in range(self._num_slots):
+                if len(self._held) >= max_jobs:
+                    break
+                fd = os.open(self._lock_dir / f"slot{slot}", os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    os.close(fd)
+                    continue
+                self._held.append(fd)
+
+            if self._held:
+                _LOG.debug("acquired %d of %d build job slots", len(self._held), self._num_slots)
+                return len(self._held)
+
+            time.sleep(self.POLL_INTERVAL_SEC)
+
+    def release(self):
+        for fd in self._held:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+        self._held = []
+
+
+class SimulatorPool:
+    """Pre-launched GVSoC instances which are parked until a transport is opened.
+
+    A parked simulator has already paid for the Python startup, the platform config and the ELF
+    load and waits for the first RPC bytes on its stdin. Simulators are never reused after a
+    session, the pool is refilled with fresh instances instead, see SimulatorPoolDaemon.
+    """
+
+    def __init__(self, size, launch_func):
+        self._size = size
+        self._launch_func = launch_func
+        self._parked = collections.deque()
+        self.hits = 0
+        self.misses = 0
+
+    def fill(self):
+        while len(self._parked) < self._size:
+            self._parked.append(self._launch_func())
+
+    def checkout(self):
+        while self._parked:
+            proc = self._parked.popleft()
+            if proc.poll() is None:
+                self.hits += 1
+                return proc
+
+            _LOG.warning("parked simulator exited with code %s, discarding it", proc.returncode)
+
+        self.misses += 1
+        return self._launch_func()
+
+    def shutdown(self):
+        while self._parked:
+            proc = self._parked.popleft()
+            proc.terminate()
+            proc.wait()
+
+    def stats(self):
+        return {
+            "size": self._size,
+            "parked": len(self._parked),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def simulator_pool_address(build_dir):
+    """Return the abstract unix socket address of the simulator pool daemon of a build dir."""
+    digest = hashlib.sha256(str(pathlib.Path(build_dir).resolve()).encode()).hexdigest()
+    return f"\0microtvm-gvsoc-simulator-pool-{digest[:32]}"
+
+
+class SimulatorPoolDaemon:
+    """Serves a SimulatorPool to all API server processes of a project over a unix socket.
+
+    Every connection checks out one simulator: the daemon sends the pool statistics and passes
+    the pipe ends of the simulator's stdout and stdin with SCM_RIGHTS, while it stays the parent
+    of the process. When the client closes the connection, the simulator is terminated and only
+    then replaced, so that the new instance does not compete with a running session. A request
+    for another pool key (options or binary changed) or the removal of `binary_path` makes the
+    daemon stop accepting connections and exit once the running sessions are closed. It also
+    exits after `idle_timeout_sec` without checked-out simulators.
+    """
+
+    def __init__(self, listen_sock, pool, pool_key, binary_path, idle_timeout_sec):
+        self._listen_sock = listen_sock
+        self._pool = pool
+        self._pool_key = pool_key
+        self._binary_path = pathlib.Path(binary_path)
+        self._idle_timeout_sec = idle_timeout_sec
+        self._selector = selectors.DefaultSelector()
+        self._sessions = {}
+
+    def serve(self):
+        self._selector.register(self._listen_sock, selectors.EVENT_READ)
+        idle_since = time.monotonic()
+        try:
+            self._pool.fill()
+            while self._listen_sock is not None or self._sessions:
+                for key, _ in self._selector.select(timeout=1):
+                    if key.fileobj is self._listen_sock:
+                        self._checkout()
+                    else:
+                        self._release(key.fileobj)
+                if self._sessions:
+                    idle_since = time.monotonic()
+                elif time.monotonic() - idle_since > self._idle_timeout_sec:
+                    _LOG.info("simulator pool: idle, shutting down")
+                    break
+                if self._listen_sock is not None and not self._binary_path.exists():
+                    _LOG.info("simulator pool: %s removed, shutting down", self._binary_path)
+                    self._close_listen_sock()
+                    self._pool.shutdown()
+        finally:
+            self._close_listen_sock()
+            for conn in list(self._sessions):
+                self._release(conn)
+            self._pool.shutdown()
+            self._selector.close()
+
+    def _close_listen_sock(self):
+        if self._listen_sock is not None:
+            self._selector.unregister(self._listen_sock)
+            self._listen_sock.close()
+            self._listen_sock = None
+
+    def _checkout(self):
+        conn, _ = self._listen_sock.accept()
+        request = json.loads(conn.recv(4096) or b"{}")
+        if request.get("pool_key") != self._pool_key:
+            _LOG.info("simulator pool: options or binary changed, shutting down")
+            # Free the address first, so that the client can start a daemon for its key.
+            self._close_listen_sock()
+            self._pool.shutdown()
+            conn.sendall(json.dumps({"stale": True}).encode())
+            conn.close()
+            return
+
+        proc = self._pool.checkout()
+        reply = json.dumps(dict(self._pool.stats(), pid=proc.pid)).encode()
+        socket.send_fds(conn, [reply], [proc.stdout.fileno(), proc.stdin.fileno()])
+        # The client holds the pipes from now on.
+        proc.stdout.close()
+        proc.stdin.close()
+        self._sessions[conn] = proc
+        self._selector.register(conn, selectors.EVENT_READ)
+
+    def _release(self, conn):
+        """Terminate the simulator of a closed connection and launch its replacement."""
+        self._selector.unregister(conn)
+        proc = self._sessions.pop(conn)
+        proc.terminate()
+        proc.wait()
+        # Closing the connection tells the client that the simulator is gone.
+        conn.close()
+        if self._listen_sock is not None:
+            self._pool.fill()
+
+
+class PooledSimulator:
+    """A simulator checked out of the SimulatorPoolDaemon of the project.
+
+    Offers terminate() and wait() like the Popen of a simulator launched by the API server
+    itself. Terminating closes the pipes and the connection, upon which the daemon terminates
+    the process and closes its side of the connection.
+    """
+
+    def __init__(self, conn, read_fd, write_fd, stats):
+        self._conn = conn
+        self.read_fd = read_fd
+        self.write_fd = write_fd
+        self.pid = stats["pid"]
+        self.stats = stats
+
+    def terminate(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+        self._conn.shutdown(socket.SHUT_WR)
+
+    def wait(self):
+        while self._conn.recv(4096):
+            pass
+        self._conn.close()
+
+
+def checkout_pooled_simulator(address, pool_key):
+    """Check out a simulator from the daemon at `address`.
+
+    Returns a PooledSimulator, or None if no daemon listens there or it serves another pool key,
+    in which case it is shutting down.
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(address)
+        conn.sendall(json.dumps({"pool_key": pool_key}).encode())
+        reply, fds, _, _ = socket.recv_fds(conn, 4096, 2)
+    except (ConnectionRefusedError, FileNotFoundError):
+        conn.close()
+        return None
+
+    stats = json.loads(reply or b"{}")
+    if len(fds) != 2:
+        for fd in fds:
+            os.close(fd)
+        conn.close()
+        if not stats.get("stale"):
+            raise RuntimeError(f"simulator pool: unexpected reply {reply!r}")
+        return None
+
+    return PooledSimulator(conn, fds[0], fds[1], stats)
+
+
+def run_simulator_pool_daemon(config):
+    """Entry point of the simulator pool daemon, see Handler._checkout_pooled_simulator."""
+    listen_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        listen_sock.bind(config["address"])
+    except OSError:
+        # Another daemon won the race for the address.
+        listen_sock.close()
+        return
+    listen_sock.listen()
+
+    def launch():
+        return subprocess.Popen(
+            config["args"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+            cwd=config["cwd"],
+            env=dict(os.environ, **config["env"]),
+        )
+
+    pool = SimulatorPool(config["size"], launch)
+    SimulatorPoolDaemon(
+        listen_sock,
+        pool,
+        config["pool_key"],
+        config["binary_path"],
+        config.get("idle_timeout_sec", SIMULATOR_POOL_IDLE_TIMEOUT_SEC),
+    ).serve()
+
+
+class PipeTransport:
+    """Non-blocking I/O on the simulator's stdout/stdin pipes.
+
+    Both file descriptors are registered with a persistent selector (epoll on Linux) once per
+    session. Reads fetch as much as the pipe has ready into a read-ahead buffer, from which
+    subsequent read() calls are served without touching the pipe. Writes are attempted directly
+    and only wait on the selector if the pipe is full.
+    """
+
+    READ_AHEAD_SIZE_BYTES = 64 * 1024
+
+    def __init__(self, read_fd, write_fd):
+        self._read_fd = read_fd
+        self._write_fd = write_fd
+        self._read_selector = selectors.DefaultSelector()
+        self._read_selector.register(read_fd, selectors.EVENT_READ)
+        self._write_selector = selectors.DefaultSelector()
+        self._write_selector.register(write_fd, selectors.EVENT_WRITE)
+        self._read_buffer = bytearray()
+        self._read_pos = 0
+        self.stats = collections.Counter()
+
+    def close(self):
+        self._read_selector.close()
+        self._write_selector.close()
+
+    def _wait(self, selector, end_time):
+        timeout_sec = None if end_time is None else max(0, end_time - time.monotonic())
+        self.stats["polls"] += 1
+        if not selector.select(timeout_sec):
+            raise server.IoTimeoutError()
+
+    def _fill(self, end_time):
+        while True:
+            try:
+                self.stats["reads"] += 1
+                data = os.read(self._read_fd, self.READ_AHEAD_SIZE_BYTES)
+            except BlockingIOError:
+                self._wait(self._read_selector, end_time)
+                continue
+            except BrokenPipeError:
+                data = b""
+
+            if not data:
+                raise server.TransportClosedError()
+
+            self.stats["bytes_read"] += len(data)
+            del self._read_buffer[: self._read_pos]
+            self._read_pos = 0
+            self._read_buffer += data
+            return
+
+    def read(self, n, end_time=None):
+        if self._read_pos == len(self._read_buffer):
+            self._fill(end_time)
+
+        to_return = bytes(self._read_buffer[self._read_pos : self._read_pos + n])
+        self._read_pos += len(to_return)
+        return to_return
+
+    def write(self, data, end_time=None):
+        data = memoryview(data)
+        while data:
+            try:
+                self.stats["writes"] += 1
+                num_written = os.write(self._write_fd, data)
+            except BlockingIOError:
+                self._wait(self._write_selector, end_time)
+                continue
+            except BrokenPipeError:
+                num_written = 0
+
+            if not num_written:
+                raise server.TransportClosedError()
+
+            self.stats["bytes_written"] += num_written
+            data = data[num_written:]
+
+
+class TimingLog:
+    """Phase durations and counters of one API call, appended as a JSON line to a log file.
+
+    With path=None, timings are still collected but never written.
+    """
+
+    def __init__(self, path, event):
+        self._path = path
+        self._start = time.monotonic()
+        self.record = {"event": event, "time": time.time(), "pid": os.getpid()}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(f"{name}_sec", time.monotonic() - start)
+
+    def add(self, key, value):
+        self.record[key] = self.record.get(key, 0) + value
+
+    def elapsed(self):
+        return time.monotonic() - self._start
+
+    def write(self):
+        if self._path is None:
+            return
+
+        self.record["total_sec"] = self.elapsed()
+        with open(self._path, "a") as f:
+            f.write(json.dumps(self.record) + "\n")
+
+
+def read_elf_symbols(elf_path):
+    """Return the sorted (address, size, name) of all function symbols of an ELF file."""
+    from elftools.elf.elffile import ELFFile  # only needed for trace_file
+
+    symbols = []
+    with open(elf_path, "rb") as f:
+        symtab = ELFFile(f).get_section_by_name(".symtab")
+        for symbol in symtab.iter_symbols() if symtab else ():
+            if symbol["st_info"]["type"] == "STT_FUNC" and symbol["st_size"] > 0:
+                symbols.append((symbol["st_value"], symbol["st_size"], symbol.name))
+
+    return sorted(symbols)
+
+
+# Input sections in a GNU ld map file. Long section names are followed by a line break.
+LINKER_MAP_SECTION_RE = re.compile(
+    r"^ (?P<section>\.text\S*)\s+0x(?P<address>[0-9a-f]+)\s+0x(?P<size>[0-9a-f]+)"
+    r"\s+(?P<object>\S+)$",
+    re.MULTILINE,
+)
+
+
+def read_linker_map_sections(map_path):
+    """Return the sorted (address, size, object file) of the .text input sections of a map file."""
+    text = pathlib.Path(map_path).read_text(errors="replace")
+    text = re.sub(r"^ (\.text\S*)\n\s+", r" \1 ", text, flags=re.MULTILINE)
+    sections = []
+    for m in LINKER_MAP_SECTION_RE.finditer(text):
+        size = int(m.group("size"), 16)
+        if size > 0:
+            sections.append((int(m.group("address"), 16), size, m.group("object")))
+
+    return sorted(sections)
+
+
+class AddressSymbolizer:
+    """Maps code addresses to functions of the app ELF and to object files from linker.map."""
+
+    def __init__(self, elf_path, map_path):
+        self._symbols = read_elf_symbols(elf_path) if os.path.exists(elf_path) else []
+        self._sections = read_linker_map_sections(map_path) if os.path.exists(map_path) else []
+
+    @staticmethod
+    def _lookup(ranges, address):
+        idx = bisect.bisect_right(ranges, (address, float("inf"))) - 1
+        if idx >= 0 and ranges[idx][0] <= address < ranges[idx][0] + ranges[idx][1]:
+            return ranges[idx]
+
+        return None
+
+    def function(self, address):
+        """Return (name, offset) of the function containing address, or (None, None)."""
+        symbol = self._lookup(self._symbols, address)
+        return (symbol[2], address - symbol[0]) if symbol else (None, None)
+
+    def object_file(self, address):
+        section = self._lookup(self._sections, address)
+        return section[2] if section else None
+
+
+class InstructionTraceReader:
+    """Drains the GVSoC instruction trace from a named pipe on a background thread.
+
+    The trace is compressed on the fly chunk by chunk, so memory use stays bounded no matter
+    how long the simulation runs, and the executed PCs are counted into a histogram.
+    """
+
+    CHUNK_SIZE_BYTES = 1024 * 1024
+
+    # The PC follows the privilege mode in every instruction trace line.
+    PC_RE = re.compile(rb" [MSU] ([0-9a-f]{8}) ")
+
+    def __init__(self, fifo_path, output_path, compression="gzip"):
+        self._fifo_path = fifo_path
+        self._output_path = output_path
+        self._compression = compression
+        self.histogram = collections.Counter()
+        self.bytes_read = 0
+        if not os.path.exists(fifo_path):
+            os.mkfifo(fifo_path)
+        self._thread = threading.Thread(target=self._run, name="insn-trace-reader", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _open_output(self):
+        if self._compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise RuntimeError("trace_compression=zstd needs the zstandard package") from None
+            return zstandard.ZstdCompressor().stream_writer(open(self._output_path, "wb"))
+
+        return gzip.open(self._output_path, "wb", compresslevel=6)
+
+    def _run(self):
+        # Blocks until the simulator opens the write end, and read() sees EOF once it exits.
+        with open(self._fifo_path, "rb", buffering=0) as fifo, self._open_output() as out:
+            tail = b""
+            while True:
+                chunk = fifo.read(self.CHUNK_SIZE_BYTES)
+                if not chunk:
+                    break
+                self.bytes_read += len(chunk)
+                out.write(chunk)
+                # Only complete lines are scanned, the rest is carried over to the next chunk.
+                lines_end = chunk.rfind(b"\n") + 1
+                if lines_end == 0:
+                    tail += chunk
+                    continue
+                self.histogram.update(self.PC_RE.findall(tail + chunk[:lines_end]))
+                tail = chunk[lines_end:]
+            self.histogram.update(self.PC_RE.findall(tail))
+
+    def stop(self, timeout_sec=30):
+        """Wait until the trace is drained. Call after the simulator was terminated."""
+        self._thread.join(0.5)
+        if self._thread.is_alive():
+            # The simulator may never have opened the pipe, unblock the reader with an empty writer.
+            try:
+                os.close(os.open(self._fifo_path, os.O_WRONLY | os.O_NONBLOCK))
+            except OSError:
+                pass
+        self._thread.join(timeout_sec)
+
+    def write_hotspots(self, path, symbolizer, top_n=50):
+        """Write the histogram aggregated per function and object file, and the hottest PCs."""
+        total = sum(self.histogram.values()) or 1
+        per_function = collections.Counter()
+        per_object = collections.Counter()
+        for pc, count in self.histogram.items():
+            address = int(pc, 16)
+            name, _ = symbolizer.function(address)
+            per_function[name or "<unknown>"] += count
+            per_object[symbolizer.object_file(address) or "<unknown>"] += count
+
+        with open(path, "w") as f:
+            f.write(
+                f"# {total} instructions, {len(self.histogram)} distinct PCs, "
+                f"{self.bytes_read} trace bytes\n"
+            )
+            for title, counter in (("function", per_function), ("object", per_object)):
+                f.write(f"\n{'count':>12} {'share':>7}  {title}\n")
+                for name, count in counter.most_common(top_n):
+                    f.write(f"{count:>12} {count / total:>7.2%}  {name}\n")
+
+            f.write(f"\n{'count':>12} {'share':>7}  pc\n")
+            for pc, count in self.histogram.most_common(top_n):
+                name, offset = symbolizer.function(int(pc, 16))
+                location = f"{name}+0x{offset:x}" if name else "<unknown>"
+                f.write(f"{count:>12} {count / total:>7.2%}  {pc.decode()} {location}\n")
+
+
 class BoardError(Exception):
     """Raised when an attached board cannot be opened (i.e. missing /dev nodes, etc)."""
 
 
-PROJECT_TYPES = []
-if IS_TEMPLATE:
-    for d in (API_SERVER_DIR / "src").iterdir():
-        if d.is_dir():
-            PROJECT_TYPES.append(d.name)
+# Firmware sources (directory under src/) and executor of every project type.
+PROJECT_TYPES = {
+    "host_driven": ("host_driven", "graph"),
+    "aot_host_driven": ("host_driven", "aot"),
+    "aot_standalone": ("aot_standalone", "aot"),
+    "standalone_bench": ("standalone_bench", "aot"),
+}
+
+# Project types without RPC server, their firmware runs to completion on flash.
+STANDALONE_PROJECT_TYPES = ("aot_standalone", "standalone_bench")
+
+# Header generated for standalone projects, relative to the project dir.
+AOT_MODEL_IO_HEADER_RELPATH = "include/aot_model_io.h"
+
+# Header with the benchmark settings of standalone_bench projects, relative to the project dir.
+BENCH_CONFIG_HEADER_RELPATH = "include/bench_config.h"
+
+# Results of the last run of a standalone project, relative to the build dir.
+STANDALONE_RESULTS_RELPATH = "standalone_results.json"
+
+# Header with the memory plan and allocator of the project, relative to the project dir.
+MEMORY_PLAN_HEADER_RELPATH = "include/memory_plan.h"
+
+# The same plan with the arena size passed to CMake by build, relative to the project dir. The
+# arena size is not written into CMakeLists.txt, which keys the CRT library cache.
+MEMORY_PLAN_JSON_RELPATH = "memory_plan.json"
+
+# NOTE: keep in sync with TVM_RUNTIME_ALLOC_ALIGNMENT_BYTES in the CRT stack allocator.
+ALLOC_ALIGNMENT_BYTES = 16
+
+MEMORY_ALLOCATORS = ("page", "stack", "buddy")
+
+# Default number of untimed and timed inferences of standalone_bench projects.
+BENCH_WARMUP = 10
+BENCH_ITERATIONS = 100
+
+# Console lines of the standalone firmware which are collected into the results.
+STANDALONE_RESULT_RE = re.compile(r"^(?P<key>[a-z0-9][a-z0-9 ]*): (?P<value>[0-9]+)$")
+STANDALONE_DONE_RE = re.compile(r"^microTVM GVSoC .* - done$")
+
+
+def _sanitize_c_name(name):
+    """Mirror the sanitization TVM applies to input and output names in the C interface."""
+    return re.sub(r"[^0-9a-zA-Z_]", "_", name)
+
+
+def _c_byte_array_lines(declaration, data):
+    """Define the C array `declaration` as initialized with `data`, 16 hex bytes per line."""
+    lines = [f"{declaration} = {{"]
+    for offset in range(0, len(data), 16):
+        row = data[offset : offset + 16]
+        lines.append("    " + ", ".join(f"0x{byte:02x}" for byte in row) + ",")
+    lines.append("};")
+    return lines
+
+
+def _get_main_func_metadata(metadata):
+    module_metadata = metadata["modules"]["default"] if "modules" in metadata else metadata
+    return module_metadata["memory"]["functions"]["main"][0]
+
+
+def load_bench_inputs(metadata, npy_path):
+    """Read the input data of a standalone_bench project, returns a dict of input name to bytes.
+
+    A .npy file holds the only input of the model, a .npz file one array per input name.
+    """
+    import numpy as np
+
+    inputs = _get_main_func_metadata(metadata)["inputs"]
+    if str(npy_path).endswith(".npz"):
+        with np.load(npy_path) as npz:
+            arrays = {name: npz[name] for name in npz.files}
+    else:
+        if len(inputs) != 1:
+            raise ValueError(f"The model has {len(inputs)} inputs, provide them as .npz file")
+        arrays = {next(iter(inputs)): np.load(npy_path)}
+
+    data = {}
+    for name, array in arrays.items():
+        if name not in inputs:
+            raise ValueError(
+                f"{npy_path} contains {name}, which is no model input ({list(inputs)})"
+            )
+        info = inputs[name]
+        if array.dtype != np.dtype(info["dtype"]) or array.nbytes != info["size"]:
+            raise ValueError(
+                f"Input {name} needs {info['size']} bytes of {info['dtype']}, "
+                f"got {array.nbytes} bytes of {array.dtype}"
+            )
+        data[name] = np.ascontiguousarray(array).tobytes()
+
+    return data
+
+
+def write_aot_model_io_header(metadata, header_path, input_data=None):
+    """Write static buffers for the model inputs and outputs and a function binding them to the
+    structs of the generated C interface (tvmgen_default_run).
+
+    `input_data` optionally maps input names to the bytes their buffers are initialized with,
+    other buffers are zero.
+    """
+    main_func = _get_main_func_metadata(metadata)
+    input_data = input_data or {}
+    lines = [
+        "// Generated by microtvm_api_server.py from model/metadata.json",
+        "#ifndef AOT_MODEL_IO_H_",
+        "#define AOT_MODEL_IO_H_",
+        "",
+        '#include "tvmgen_default.h"',
+        "",
+    ]
+    bind = []
+    for kind in ("inputs", "outputs"):
+        for name, info in main_func[kind].items():
+            c_name = _sanitize_c_name(name)
+            buffer_name = f"g_aot_{kind}_{c_name}"
+            declaration = (
+                f"static uint8_t {buffer_name}[{info['size']}] __attribute__((aligned(16)))"
+            )
+            if kind == "inputs" and name in input_data:
+                lines.extend(_c_byte_array_lines(declaration, input_data[name]))
+            else:
+                lines.append(f"{declaration};")
+            bind.append(f"  {kind}->{c_name} = {buffer_name};")
+
+    lines.extend(
+        [
+            "",
+            "static void aot_model_io_bind(struct tvmgen_default_inputs* inputs,",
+            "                              struct tvmgen_default_outputs* outputs) {",
+            *bind,
+            "}",
+            "",
+            "#endif  // AOT_MODEL_IO_H_",
+            "",
+        ]
+    )
+    pathlib.Path(header_path).parent.mkdir(parents=True, exist_ok=True)
+    pathlib.Path(header_path).write_text("\n".join(lines))
+
+
+def _align_up(num_bytes, alignment=ALLOC_ALIGNMENT_BYTES):
+    return (num_bytes + alignment - 1) // alignment * alignment
+
+
+def compute_memory_plan(metadata):
+    """Derive the runtime memory needs of the model from metadata.json.
+
+    Returns a dict with the workspace of the main function, the size of its inputs and outputs,
+    the largest operator workspace (with the sizes of the input, output and operator workspace
+    tensors in it) and the arena a stack allocator needs. Operators are called
+    one after another and allocate their workspace on top of the tensors of the main function,
+    so the peak is the main workspace plus the largest operator workspace. Every allocation is
+    padded to ALLOC_ALIGNMENT_BYTES.
+    """
+    module_metadata = metadata["modules"]["default"] if "modules" in metadata else metadata
+    functions = module_metadata["memory"]["functions"]
+    main_funcs = functions["main"]
+    workspace_bytes = sum(func["workspace_size_bytes"] for func in main_funcs)
+    io_bytes = sum(func.get("io_size_bytes", 0) for func in main_funcs)
+    constants_bytes = sum(func.get("constants_size_bytes", 0) for func in main_funcs)
+    num_io = sum(len(func.get("inputs", {})) + len(func.get("outputs", {})) for func in main_funcs)
+    io_tensor_bytes = [
+        tensor["size"]
+        for func in main_funcs
+        for tensors in (func.get("inputs", {}), func.get("outputs", {}))
+        for tensor in tensors.values()
+    ]
+    operator_workspaces = [
+        [workspace["workspace_size_bytes"] for workspace in func.get("workspace", [])]
+        for func in functions.get("operator_functions", [])
+    ]
+    operator_workspace_bytes = [
+        sum(_align_up(size) for size in workspaces) for workspaces in operator_workspaces
+    ]
+    max_operator_workspace_bytes = max(operator_workspace_bytes, default=0)
+    max_operator_workspaces = []
+    if operator_workspaces:
+        max_operator_workspaces = operator_workspaces[
+            operator_workspace_bytes.index(max_operator_workspace_bytes)
+        ]
+    # Upper bound of the padding of the tensors of the main function, at most one per operator.
+    padding_bytes = ALLOC_ALIGNMENT_BYTES * (len(operator_workspace_bytes) + 1)
+    return {
+        "workspace_bytes": workspace_bytes,
+        "io_bytes": io_bytes,
+        "constants_bytes": constants_bytes,
+        "num_io": num_io,
+        "io_tensor_bytes": io_tensor_bytes,
+        "num_operators": len(operator_workspace_bytes),
+        "max_operator_workspace_bytes": max_operator_workspace_bytes,
+        "max_operator_workspaces": max_operator_workspaces,
+        "stack_arena_bytes": (
+            _align_up(workspace_bytes) + max_operator_workspace_bytes + padding_bytes
+        ),
+    }
+
+
+def _power_of_two_block_bytes(num_bytes):
+    """Return the size of the buddy allocator block holding `num_bytes`, a power-of-two number of
+    pages.
+    """
+    num_pages = max(1, -(-num_bytes // PAGE_ALLOCATOR_PAGE_BYTES))
+    return (1 << (num_pages - 1).bit_length()) * PAGE_ALLOCATOR_PAGE_BYTES
+
+
+def estimate_page_arena_bytes(
+    plan, project_type, num_graph_nodes=0, params_in_arena=True, power_of_two_blocks=False
+):
+    """Estimate the memory_size_bytes the page allocator needs, see compute_memory_plan.
+
+    On top of the tensors every allocation is rounded up to a page, host-driven projects allocate
+    the RPC buffers and their executor, and the graph executor additionally holds the inputs,
+    outputs and parameters and the parsed graph JSON in the arena. Unless `params_in_arena` is
+    False (e.g. with embed_params), the host uploads the parameters in NDArrays of the arena, so
+    they are counted twice. With `power_of_two_blocks`, the estimate is for the buddy allocator,
+    which rounds every allocation up to a power-of-two number of pages instead.
+    ARENA_ESTIMATE_MARGIN is added to the result.
+    """
+    executor = PROJECT_TYPES[project_type][1]
+    tensor_bytes = plan["workspace_bytes"] + plan["max_operator_workspace_bytes"]
+    num_allocations = plan["num_operators"] + 1
+    allocations = [plan["workspace_bytes"], *plan["max_operator_workspaces"]]
+    runtime_bytes = 0
+    graph_executor_bytes = 0
+    if project_type not in STANDALONE_PROJECT_TYPES:
+        tensor_bytes += plan["io_bytes"]
+        num_allocations += plan["num_io"]
+        allocations.extend(plan["io_tensor_bytes"])
+        runtime_bytes += HOST_DRIVEN_RUNTIME_BYTES
+    if executor == "graph":
+        if params_in_arena:
+            tensor_bytes += 2 * plan["constants_bytes"]
+            allocations.extend([plan["constants_bytes"]] * 2)
+        graph_executor_bytes = GRAPH_EXECUTOR_NODE_BYTES * num_graph_nodes
+
+    if power_of_two_blocks:
+        # The node structs of the graph executor are arrays over the nodes, each rounded up.
+        arena_bytes = sum(_power_of_two_block_bytes(size) for size in allocations if size)
+        arena_bytes += runtime_bytes + 2 * graph_executor_bytes
+        # The buddy allocator keeps a byte of block state per page inside the arena.
+        arena_bytes += arena_bytes // PAGE_ALLOCATOR_PAGE_BYTES
+    else:
+        arena_bytes = tensor_bytes + PAGE_ALLOCATOR_PAGE_BYTES * num_allocations
+        arena_bytes += runtime_bytes + graph_executor_bytes
+        # The page allocator keeps its page table inside the arena, add 1/8 for it.
+        arena_bytes += arena_bytes // 8
+    arena_bytes += int(arena_bytes * ARENA_ESTIMATE_MARGIN)
+    return _align_up(arena_bytes, PAGE_ALLOCATOR_PAGE_BYTES)
+
+
+def read_memory_regions(link_script_path):
+    """Return the regions of the MEMORY command of a linker script as name -> (origin, length).
+
+    Only regions whose origin and length are plain numbers, optionally with a K or M suffix, are
+    returned.
+    """
+    script = re.sub(r"/\*.*?\*/", "", pathlib.Path(link_script_path).read_text(), flags=re.S)
+    memory = re.search(r"\bMEMORY\s*\{(.*?)\}", script, flags=re.S)
+    if not memory:
+        return {}
+
+    def parse_number(text):
+        multiplier = {"K": 1024, "M": 1024 * 1024}.get(text[-1].upper(), 1)
+        return int(text[:-1] if multiplier > 1 else text, 0) * multiplier
+
+    regions = {}
+    region_re = (
+        r"(\w+)\s*(?:\([^)]*\))?\s*:\s*(?:ORIGIN|org|o)\s*=\s*([^,]+),"
+        r"\s*(?:LENGTH|len|l)\s*=\s*([^,\n]+)"
+    )
+    for name, origin, length in re.findall(region_re, memory.group(1)):
+        try:
+            regions[name] = (parse_number(origin.strip()), parse_number(length.strip()))
+        except ValueError:
+            continue
+    return regions
+
+
+def plan_memory_placement(
+    plan, arena_bytes, project_type, placement, l2_size_bytes, l1_size_bytes=0
+):
+    """Decide where the arena and the linked weights go and check that the model fits into L2.
+
+    With placement "auto", they are placed into the `l1_size_bytes` of L1 if they fit. Returns a
+    dict mapping "arena" and "weights" to "l1" or "l2". Raises RuntimeError if the arena, the
+    static input/output buffers and the weights exceed the L2 left to the model.
+    """
+    static_bytes = plan["constants_bytes"]
+    if project_type in STANDALONE_PROJECT_TYPES:
+        static_bytes += plan["io_bytes"]
+    available_bytes = l2_size_bytes - L2_RESERVED_BYTES
+    if arena_bytes + static_bytes > available_bytes:
+        raise RuntimeError(
+            f"The model needs an arena of {arena_bytes} bytes and {static_bytes} bytes of weights "
+            f"and static buffers, but only {available_bytes} bytes of the {l2_size_bytes} bytes of "
+            f"L2 are left besides the {L2_RESERVED_BYTES} bytes reserved for the runtime"
+        )
+
+    result = {"arena": "l2", "weights": "l2"}
+    if placement == "auto":
+        l1_free_bytes = l1_size_bytes
+        # The arena is accessed by every operator, so it gets the L1 first.
+        if arena_bytes <= l1_free_bytes:
+            result["arena"] = "l1"
+            l1_free_bytes -= arena_bytes
+        if 0 < plan["constants_bytes"] <= l1_free_bytes:
+            result["weights"] = "l1"
+
+    return result
+
+
+def write_memory_placement_script(script_path, placement):
+    """Write a linker script fragment moving the sections placed in L1 out of the default .bss
+    and .rodata into the L1_MEMORY_REGION of the target linker script, or remove it if everything
+    stays in L2.
+
+    NOTE: the section names are set in src/*/main.cc (arena) and by the TVM C codegen (weights).
+    """
+    script_path = pathlib.Path(script_path)
+    if "l1" not in placement.values():
+        script_path.unlink(missing_ok=True)
+        return
+
+    lines = [
+        "/* Generated by microtvm_api_server.py, places the arena and weights into L1. */",
+        "SECTIONS",
+        "{",
+    ]
+    if placement["weights"] == "l1":
+        lines.extend(
+            [
+                "  .tvm_l1_rodata : ALIGN(16)",
+                "  {",
+                "    *(.rodata.tvm)",
+                f"  }} > {L1_MEMORY_REGION}",
+            ]
+        )
+    if placement["arena"] == "l1":
+        lines.extend(
+            [
+                "  .tvm_l1_bss (NOLOAD) : ALIGN(16)",
+                "  {",
+                "    *(.bss.tvm_arena)",
+                f"  }} > {L1_MEMORY_REGION}",
+            ]
+        )
+    # Inserted before .text, so that these statements match before the wildcards of the default
+    # .rodata and .bss output sections.
+    lines.extend(["}", "INSERT BEFORE .text;", ""])
+    script_path.write_text("\n".join(lines))
+
+
+def write_memory_plan_header(plan, header_path, memory_allocator):
+    """Write the memory plan and the allocator of a project, see compute_memory_plan."""
+    lines = [
+        "// Generated by microtvm_api_server.py from model/metadata.json",
+        "#ifndef MEMORY_PLAN_H_",
+        "#define MEMORY_PLAN_H_",
+        "",
+        f"#define MEMORY_PLAN_WORKSPACE_BYTES {plan['workspace_bytes']}",
+        f"#define MEMORY_PLAN_IO_BYTES {plan['io_bytes']}",
+        f"#define MEMORY_PLAN_MAX_OPERATOR_WORKSPACE_BYTES {plan['max_operator_workspace_bytes']}",
+        f"#define MEMORY_PLAN_ARENA_BYTES {plan['stack_arena_bytes']}",
+    ]
+    if memory_allocator == "stack":
+        lines.append("#define MEMORY_PLAN_STACK_ALLOCATOR 1")
+    elif memory_allocator == "buddy":
+        lines.append("#define MEMORY_PLAN_BUDDY_ALLOCATOR 1")
+    lines.extend(["", "#endif  // MEMORY_PLAN_H_", ""])
+    pathlib.Path(header_path).parent.mkdir(parents=True, exist_ok=True)
+    pathlib.Path(header_path).write_text("\n".join(lines))
+
+
+def write_bench_config_header(header_path, warmup, iterations):
+    """Write the number of untimed and timed inferences of a standalone_bench project."""
+    if warmup < 0:
+        raise ValueError(f"bench_warmup must not be negative, got {warmup}")
+    if iterations <= 0:
+        raise ValueError(f"bench_iterations must be positive, got {iterations}")
+    pathlib.Path(header_path).parent.mkdir(parents=True, exist_ok=True)
+    pathlib.Path(header_path).write_text(
+        "\n".join(
+            [
+                "// Generated by microtvm_api_server.py",
+                "#ifndef BENCH_CONFIG_H_",
+                "#define BENCH_CONFIG_H_",
+                "",
+                f"#define BENCH_WARMUP {warmup}",
+                f"#define BENCH_ITERATIONS {iterations}",
+                "",
+                "#endif  // BENCH_CONFIG_H_",
+                "",
+            ]
+        )
+    )
+
+
+def parse_standalone_output(output):
+    """Collect the "<key>: <integer>" console lines of a standalone firmware into a dict."""
+    results = {}
+    done = False
+    for line in output.splitlines():
+        line = line.strip()
+        match = STANDALONE_RESULT_RE.match(line)
+        if match:
+            results[match.group("key").replace(" ", "_")] = int(match.group("value"))
+        elif STANDALONE_DONE_RE.match(line):
+            done = True
+
+    if not done:
+        raise RuntimeError("Standalone firmware did not finish, console output:\n" + output[-2000:])
+    return results
+
+
+# Header holding the graph of host_driven projects in the binary layout of the CRT graph
+# executor, relative to the project dir.
+GRAPH_BINARY_HEADER_RELPATH = "include/graph_binary.h"
+
+# NOTE: keep in sync with TVMGraphBinaryHeader in
+# crt/include/tvm/runtime/crt/internal/graph_executor/graph_executor.h
+GRAPH_BINARY_MAGIC = 0x474D5654
+GRAPH_BINARY_VERSION = 1
+GRAPH_BINARY_HEADER_WORDS = 24
+
+# NOTE: keep in sync with TVM_CRT_MAX_NDIM and TVM_CRT_MAX_STRLEN_DLTYPE in crt_config/crt_config.h
+GRAPH_BINARY_MAX_NDIM = 6
+GRAPH_BINARY_MAX_STRLEN_DLTYPE = 10
+
+
+def pack_graph_binary(graph):
+    """Pack a graph JSON (as loaded by json.load) into the binary graph TVMGraphExecutor_LoadBinary
+    maps, see TVMGraphBinaryHeader for the layout.
+
+    Strings are deduplicated, shapes and dltypes are padded to the fixed rows of the executor.
+    """
+    strings = bytearray()
+    string_offsets = {}
+
+    def add_string(value):
+        if value not in string_offsets:
+            string_offsets[value] = len(strings)
+            strings.extend(value.encode() + b"\0")
+        return string_offsets[value]
+
+    nodes = []
+    node_inputs = []
+    for node in graph["nodes"]:
+        attrs = node.get("attrs", {})
+        nodes.extend(
+            [
+                add_string(node["op"]),
+                add_string(node["name"]),
+                add_string(attrs.get("func_name", "")),
+                int(attrs.get("num_inputs", 0)),
+                int(attrs.get("num_outputs", 0)),
+                int(attrs.get("flatten_data", 0)),
+                len(node_inputs) // 3,
+                len(node["inputs"]),
+            ]
+        )
+        for entry in node["inputs"]:
+            node_inputs.extend((list(entry) + [0])[:3])
+    outputs = []
+    for entry in graph["heads"]:
+        outputs.extend((list(entry) + [0])[:3])
+
+    graph_attrs = graph["attrs"]
+    storage_ids = graph_attrs["storage_id"][1]
+    dltypes = graph_attrs["dltype"][1]
+    shapes = graph_attrs["shape"][1]
+    device_indices = graph_attrs["device_index"][1] if "device_index" in graph_attrs else []
+    if not len(storage_ids) == len(dltypes) == len(shapes):
+        raise ValueError("storage_id, dltype and shape of the graph attrs differ in length")
+    dltype_rows = bytearray()
+    for dltype in dltypes:
+        if len(dltype) >= GRAPH_BINARY_MAX_STRLEN_DLTYPE:
+            raise ValueError(f"dltype {dltype} exceeds TVM_CRT_MAX_STRLEN_DLTYPE")
+        dltype_rows.extend(dltype.encode().ljust(GRAPH_BINARY_MAX_STRLEN_DLTYPE, b"\0"))
+    shape_rows = []
+    for shape in shapes:
+        if len(shape) > GRAPH_BINARY_MAX_NDIM:
+            raise ValueError(f"shape {shape} exceeds TVM_CRT_MAX_NDIM")
+        shape_rows.extend(list(shape) + [0] * (GRAPH_BINARY_MAX_NDIM - len(shape)))
+
+    # (name, data) in the order of the offsets in TVMGraphBinaryHeader.
+    sections = [
+        ("nodes", struct.pack(f"<{len(nodes)}I", *nodes)),
+        ("node_inputs", struct.pack(f"<{len(node_inputs)}I", *node_inputs)),
+        ("input_nodes", struct.pack(f"<{len(graph['arg_nodes'])}I", *graph["arg_nodes"])),
+        ("node_row_ptr", struct.pack(f"<{len(graph['node_row_ptr'])}I", *graph["node_row_ptr"])),
+        ("outputs", struct.pack(f"<{len(outputs)}I", *outputs)),
+        ("storage_id", struct.pack(f"<{len(storage_ids)}I", *storage_ids)),
+        ("device_index", struct.pack(f"<{len(device_indices)}I", *device_indices)),
+        ("dltype", bytes(dltype_rows)),
+        ("shape", struct.pack(f"<{len(shape_rows)}q", *shape_rows)),
+        ("ndim", struct.pack(f"<{len(shapes)}I", *[len(shape) for shape in shapes])),
+        ("strings", bytes(strings)),
+    ]
+    data = bytearray(4 * GRAPH_BINARY_HEADER_WORDS)
+    offsets = []
+    for _, section in sections:
+        # Every section starts 8-byte aligned, as the shapes need it.
+        data.extend(b"\0" * (-len(data) % 8))
+        offsets.append(len(data))
+        data.extend(section)
+
+    header = [
+        GRAPH_BINARY_MAGIC,
+        GRAPH_BINARY_VERSION,
+        GRAPH_BINARY_MAX_NDIM,
+        GRAPH_BINARY_MAX_STRLEN_DLTYPE,
+        len(graph["nodes"]),
+        len(node_inputs) // 3,
+        len(graph["arg_nodes"]),
+        len(graph["node_row_ptr"]),
+        len(graph["heads"]),
+        len(storage_ids),
+        len(device_indices),
+        *offsets,
+        len(strings),
+        len(data),
+    ]
+    assert len(header) == GRAPH_BINARY_HEADER_WORDS
+    data[: 4 * GRAPH_BINARY_HEADER_WORDS] = struct.pack(f"<{GRAPH_BINARY_HEADER_WORDS}I", *header)
+    return bytes(data)
+
+
+def write_graph_binary_header(header_path, graph_binary=None):
+    """Write the binary graph as byte array the firmware passes to the graph executor module.
+
+    Without `graph_binary` only GRAPH_BINARY_SIZE_BYTES 0 is defined and the firmware expects the
+    graph JSON from the host.
+    """
+    lines = [
+        "// Generated by microtvm_api_server.py from model/executor-config/graph/default.graph",
+        "#ifndef GRAPH_BINARY_H_",
+        "#define GRAPH_BINARY_H_",
+        "",
+        "#include <stdint.h>",
+        "",
+        f"#define GRAPH_BINARY_SIZE_BYTES {len(graph_binary or b'')}",
+    ]
+    if graph_binary:
+        declaration = (
+            "static const uint8_t graph_binary[GRAPH_BINARY_SIZE_BYTES] __attribute__((aligned(8)))"
+        )
+        lines.extend(_c_byte_array_lines(declaration, graph_binary))
+    lines.extend(["", "#endif  // GRAPH_BINARY_H_", ""])
+    pathlib.Path(header_path).parent.mkdir(parents=True, exist_ok=True)
+    pathlib.Path(header_path).write_text("\n".join(lines))
+
+
+# Parameters of the graph executor in the Model Library Format, relative to the extracted MLF.
+MODEL_PARAMS_RELPATH = "parameters/default.params"
+
+# Header holding the parameters embedded with the embed_params option, relative to the project dir.
+EMBEDDED_PARAMS_HEADER_RELPATH = "include/embedded_params.h"
+
+# Magic numbers of the tvm.runtime.save_param_dict format.
+NDARRAY_LIST_MAGIC = 0xF7E58D4F05049CB7
+NDARRAY_MAGIC = 0xDD5E40F096B4A13F
+
+
+def read_params(params_path):
+    """Read a file written by tvm.runtime.save_param_dict, returns a dict mapping each parameter
+    name to its raw data bytes.
+    """
+    data = pathlib.Path(params_path).read_bytes()
+    offset = 0
+
+    def read(fmt):
+        nonlocal offset
+        values = struct.unpack_from(fmt, data, offset)
+        offset += struct.calcsize(fmt)
+        return values
+
+    magic, _ = read("<QQ")
+    if magic != NDARRAY_LIST_MAGIC:
+        raise ValueError(f"{params_path} is not a TVM parameter file")
+    names = []
+    for _ in range(read("<Q")[0]):
+        (name_len,) = read("<Q")
+        names.append(data[offset : offset + name_len].decode())
+        offset += name_len
+    (num_arrays,) = read("<Q")
+    if num_arrays != len(names):
+        raise ValueError(f"{params_path} holds {num_arrays} arrays for {len(names)} names")
+
+    params = {}
+    for name in names:
+        magic, _, _, _, ndim = read("<QQiii")
+        if magic != NDARRAY_MAGIC:
+            raise ValueError(f"Parameter {name} in {params_path} is not a serialized NDArray")
+        read("<BBH")  # dtype
+        read(f"<{ndim}q")  # shape
+        (num_bytes,) = read("<q")
+        params[name] = data[offset : offset + num_bytes]
+        offset += num_bytes
+
+    return params
+
+
+def assign_params_storage(graph, params):
+    """Find the storage pool entry of every parameter in a graph JSON.
+
+    Returns a list of (storage_id, name, data) sorted by storage_id. Raises ValueError for
+    parameters the graph has no input for, whose size differs from it, or whose storage is
+    shared with other tensors.
+    """
+    nodes = graph["nodes"]
+    storage_ids = graph["attrs"]["storage_id"][1]
+    dltypes = graph["attrs"]["dltype"][1]
+    shapes = graph["attrs"]["shape"][1]
+    entry_ids = {nodes[nid]["name"]: graph["node_row_ptr"][nid] for nid in graph["arg_nodes"]}
+    storage_users = collections.Counter(storage_ids)
+    assigned = []
+    for name, data in params.items():
+        if name not in entry_ids:
+            raise ValueError(f"Parameter {name} is not an input of the graph")
+        eid = entry_ids[name]
+        sid = storage_ids[eid]
+        dtype_match = re.match(r"^[a-z]+(?P<bits>[0-9]*)(x(?P<lanes>[0-9]+))?$", dltypes[eid])
+        if dtype_match is None:
+            raise ValueError(f"Parameter {name} has the unsupported dtype {dltypes[eid]}")
+        # bool has no bit width and is stored in bytes.
+        num_bytes = (int(dtype_match.group("bits") or 8) + 7) // 8
+        num_bytes *= int(dtype_match.group("lanes") or 1)
+        for dim in shapes[eid]:
+            num_bytes *= dim
+        if len(data) != num_bytes:
+            raise ValueError(
+                f"Parameter {name} has {len(data)} bytes but its graph input {num_bytes}"
+            )
+        if storage_users[sid] != 1:
+            raise ValueError(
+                f"Parameter {name} shares storage {sid} with other tensors of the graph"
+            )
+        assigned.append((sid, name, data))
+
+    return sorted(assigned)
+
+
+def write_embedded_params_header(header_path, assigned_params=()):
+    """Write the parameters assigned by assign_params_storage as const arrays in .rodata.tvm,
+    the section of linked parameters, and the table the firmware passes to the graph executor.
+    """
+    lines = [
+        "// Generated by microtvm_api_server.py from model/parameters/default.params",
+        "#ifndef EMBEDDED_PARAMS_H_",
+        "#define EMBEDDED_PARAMS_H_",
+        "",
+        "#include <stdint.h>",
+        "#include <tvm/runtime/crt/graph_executor.h>",
+        "",
+        f"#define EMBEDDED_PARAMS_COUNT {len(assigned_params)}",
+        "",
+    ]
+    table = []
+    for index, (sid, name, data) in enumerate(assigned_params):
+        lines.append(f"// {name}")
+        declaration = (
+            f"static const uint8_t embedded_param_{index}[{len(data)}] "
+            '__attribute__((section(".rodata.tvm"), aligned(16)))'
+        )
+        lines.extend(_c_byte_array_lines(declaration, data))
+        table.append(f"    {{{sid}, embedded_param_{index}}},")
+    if assigned_params:
+        lines.extend(
+            ["", "static const TVMGraphExecutorEmbeddedParam embedded_params[] = {", *table, "};"]
+        )
+    lines.extend(["", "#endif  // EMBEDDED_PARAMS_H_", ""])
+    pathlib.Path(header_path).parent.mkdir(parents=True, exist_ok=True)
+    pathlib.Path(header_path).write_text("\n".join(lines))
+
+
+# Supported CMake generators and the command used to run a build with them.
+CMAKE_GENERATORS = {
+    "Unix Makefiles": "make",
+    "Ninja": "ninja",
+}
+
+
+# Linux ioctl to share the extents of a file with another one on copy-on-write filesystems.
+FICLONE = 0x40049409
+
+
+def _reflink_or_copy(src, dst):
+    """shutil copy_function which clones src into dst if the filesystem supports it."""
+    try:
+        with open(src, "rb") as src_f, open(dst, "wb") as dst_f:
+            fcntl.ioctl(dst_f.fileno(), FICLONE, src_f.fileno())
+        shutil.copystat(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _hardlink_or_copy(src, dst):
+    """shutil copy_function which hardlinks dst to src, falling back to a copy across devices."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+# Ways to populate the immutable template and CRT content of generated projects.
+PROJECT_LINK_MODES = ("copy", "hardlink", "reflink", "symlink")
+
+
+def populate_item(src, dst, link_mode):
+    """Place the file or directory src at dst according to link_mode (see PROJECT_LINK_MODES)."""
+    src = pathlib.Path(src)
+    if link_mode == "symlink":
+        os.symlink(src.resolve(), dst, target_is_directory=src.is_dir())
+        return
+
+    copy_function = {
+        "copy": shutil.copy2,
+        "hardlink": _hardlink_or_copy,
+        "reflink": _reflink_or_copy,
+    }[link_mode]
+    if src.is_dir():
+        shutil.copytree(src, dst, copy_function=copy_function)
+    else:
+        copy_function(src, dst)
+
+
+def extract_mlf_members(tar_path, extract_path, prefixes):
+    """Extract the files of a Model Library Format tarball matching prefixes in a single pass.
+
+    Raises RuntimeError for members outside of the archive, whether they match or not.
+    """
+    extract_path = pathlib.Path(extract_path)
+    with tarfile.open(tar_path, mode="r|*") as tf:
+        for member in tf:
+            name = os.path.normpath(member.name)
+            if os.path.isabs(name) or name == os.pardir or name.startswith(os.pardir + os.sep):
+                raise RuntimeError(
+                    f"Model Library Format member outside of the archive: {member.name}"
+                )
+            if not member.isfile() or not name.startswith(prefixes):
+                continue
+
+            dst_path = extract_path / name
+            dst_path.parent.mkdir(parents=True, exist_ok=True)
+            with tf.extractfile(member) as src_f, open(dst_path, "wb") as dst_f:
+                shutil.copyfileobj(src_f, dst_f)
 
 
 PROJECT_OPTIONS = [
@@ -128,8 +1518,9 @@ PROJECT_OPTIONS = [
         "toolchain",
         optional=["build", "flash", "open_transport"],
         type="str",
-        choices=["llvm", "gcc"], # I do not know how to parse it. 
-        help="Choose the toolchain from llvm and gcc.",
+        choices=["llvm", "gcc", "host"], # I do not know how to parse it. 
+        help="Toolchain: llvm, gcc, or host to build and run host-driven projects on the build "
+        "machine.",
     ),
     server.ProjectOption(
         "arch",
@@ -147,13 +1538,13 @@ PROJECT_OPTIONS = [
     ),
     server.ProjectOption(
         "pulp_freertos_path",
-        optional=["build", "flash", "open_transport"],
+        optional=["generate_project", "build", "flash", "open_transport"],
         type="str",
         help="Path to the installed pulp-freertos directory.",
     ),
     server.ProjectOption(
         "pulp_gcc_path",
-        optional=["build"],
+        optional=["build", "flash"],
         type="str",
         help="Path to the installed Pulp GCC directory.",
     ),
@@ -165,17 +1556,80 @@ PROJECT_OPTIONS = [
     ),
     server.ProjectOption(
         "trace_file",
-        optional=["flash"],
+        optional=["open_transport"],
         type="bool",
         default=False,
-        help="Write instruction trace to file.",
+        help=f"Write an instruction trace and a hot-PC histogram ({INSN_HOTSPOTS_RELPATH}).",
+    ),
+    server.ProjectOption(
+        "trace_compression",
+        optional=["open_transport"],
+        type="str",
+        default="gzip",
+        choices=list(TRACE_COMPRESSION_SUFFIXES),
+        help="Compression of the instruction trace, zstd needs the zstandard package.",
     ),
     server.ProjectOption(
         "memory_size_bytes",
         optional=["generate_project"],
         type="int",
-        default=MEMORY_SIZE_BYTES,
-        help="Sets the value of MEMORY_SIZE_BYTES.",
+        help="Sets the value of MEMORY_SIZE_BYTES, the arena of the page allocator. Estimated from "
+        "metadata.json if not given.",
+    ),
+    server.ProjectOption(
+        "memory_placement",
+        optional=["generate_project"],
+        type="str",
+        default="l2",
+        choices=MEMORY_PLACEMENTS,
+        help="Keep the arena and the weights in L2, or place them into L1 if they fit.",
+    ),
+    server.ProjectOption(
+        "l2_size_bytes",
+        optional=["generate_project"],
+        type="int",
+        default=L2_SIZE_BYTES,
+        help="Size of the L2 memory, generate_project fails if the model does not fit.",
+    ),
+    server.ProjectOption(
+        "memory_allocator",
+        optional=["generate_project"],
+        type="str",
+        default="page",
+        choices=MEMORY_ALLOCATORS,
+        help="Allocator behind TVMPlatformMemoryAllocate. stack is for standalone projects only.",
+    ),
+    server.ProjectOption(
+        "project_link_mode",
+        optional=["generate_project"],
+        type="str",
+        default="copy",
+        choices=PROJECT_LINK_MODES,
+        help="How template and CRT files are placed in generated projects.",
+    ),
+    server.ProjectOption(
+        "mlf_extract_mode",
+        optional=["generate_project"],
+        type="str",
+        default="full",
+        choices=["full", "build_only"],
+        help="Extract the full Model Library Format, or only the files the build needs.",
+    ),
+    server.ProjectOption(
+        "graph_binary",
+        optional=["generate_project"],
+        type="bool",
+        help=(
+            "Compile the graph of host_driven projects into the firmware as binary graph. Enabled "
+            "by default if the template CRT overlay is applied."
+        ),
+    ),
+    server.ProjectOption(
+        "embed_params",
+        optional=["generate_project"],
+        type="bool",
+        default=False,
+        help="Compile the parameters of the model into host_driven firmware.",
     ),
     server.ProjectOption(
         "project_type",
@@ -184,6 +1638,102 @@ PROJECT_OPTIONS = [
         type="str",
         help="Type of project to generate.",
     ),
+    server.ProjectOption(
+        "bench_input_npy",
+        optional=["generate_project"],
+        type="str",
+        help="Input data of standalone_bench projects, a .npy or .npz file (default zeros).",
+    ),
+    server.ProjectOption(
+        "bench_warmup",
+        optional=["generate_project"],
+        type="int",
+        default=BENCH_WARMUP,
+        help="Number of untimed inferences before the benchmark of standalone_bench projects.",
+    ),
+    server.ProjectOption(
+        "bench_iterations",
+        optional=["generate_project"],
+        type="int",
+        default=BENCH_ITERATIONS,
+        help="Number of timed inferences of standalone_bench projects.",
+    ),
+    server.ProjectOption(
+        "incremental_build",
+        optional=["build"],
+        type="bool",
+        default=False,
+        help="Reuse an existing build directory if it was configured with the same options.",
+    ),
+    server.ProjectOption(
+        "crt_lib_cache_dir",
+        optional=["build"],
+        type="str",
+        help="Directory of a host-wide cache for the compiled CRT libraries and platform objects.",
+    ),
+    server.ProjectOption(
+        "build_jobs",
+        optional=["build"],
+        type="int",
+        default=os.cpu_count(),
+        help="Number of parallel build jobs, defaults to the number of CPUs.",
+    ),
+    server.ProjectOption(
+        "build_job_budget",
+        optional=["build"],
+        type="int",
+        default=0,
+        help="Build jobs shared by all concurrent builds on this host (0 to disable).",
+    ),
+    server.ProjectOption(
+        "cmake_generator",
+        optional=["build"],
+        type="str",
+        default="Unix Makefiles",
+        choices=list(CMAKE_GENERATORS),
+        help="CMake generator used for the build.",
+    ),
+    server.ProjectOption(
+        "simulator_pool_size",
+        optional=["open_transport"],
+        type="int",
+        default=0,
+        help="Number of GVSoC instances kept pre-launched for this project (0 to disable).",
+    ),
+    server.ProjectOption(
+        "rpc_transport",
+        optional=["build", "open_transport"],
+        type="str",
+        default="stdio",
+        choices=["stdio", "fifo"],
+        help="Channel for RPC traffic: the simulator's stdin/stdout or dedicated named pipes.",
+    ),
+    server.ProjectOption(
+        "core_freq_hz",
+        optional=["build"],
+        type="int",
+        default=CORE_FREQ_HZ,
+        help="Core clock frequency of the simulated PULP configuration.",
+    ),
+    server.ProjectOption(
+        "profiling",
+        optional=["build"],
+        type="bool",
+        default=False,
+        help="Record PULP performance counters around every timed operator.",
+    ),
+    server.ProjectOption(
+        "profiling_events",
+        optional=["build"],
+        type="str",
+        help="Comma-separated performance counter events recorded with profiling, default all.",
+    ),
+    server.ProjectOption(
+        "timing_log",
+        optional=["generate_project", "build", "flash", "open_transport"],
+        type="str",
+        help=f"Append timing records as JSON lines to this file (e.g. {TIMING_LOG_RELPATH}).",
+    ),
     server.ProjectOption("verbose", optional=["build"], type="bool", help="Run build with verbose output."),
     server.ProjectOption("debug", optional=["build"], type="bool", help="Run build in DEBUG mode."),
 ]
@@ -193,6 +1743,10 @@ class Handler(server.ProjectAPIHandler):
     def __init__(self):
         super(Handler, self).__init__()
         self._proc = None
+        self._transport = None
+        self._fifo_fds = []
+        self._session_timing = None
+        self._trace_reader = None
 
     def server_info_query(self, tvm_version):
         return server.ServerInfo(
@@ -207,16 +1761,184 @@ class Handler(server.ProjectAPIHandler):
     # These files and directories will be recursively copied into generated projects from the CRT.
     CRT_COPY_ITEMS = ("include", "src")
 
+    # Files of the template CRT which replace their counterparts of the TVM standalone CRT in
+    # generated projects (the block-wise framer CRC, the binary graph loader and the buddy
+    # allocator), with the SHA-256 of the upstream file they were derived from, or None for new
+    # files. Applied only if all upstream files match.
+    CRT_OVERLAY_ITEMS = {
+        "include/checksum.h": "c44ff47e19711936a16c161b848e280fa4e3ef0c951bda287063cb40cb0a0b30",
+        "src/runtime/crt/microtvm_rpc_common/crcccitt.c": (
+            "b14d4a46b5af45d632bf83a983933485cb691304afa01e7e1fcd9aea79d04367"
+        ),
+        "src/runtime/crt/microtvm_rpc_common/framing.cc": (
+            "de86bbb109f263e4f295a765fb3b4901a5814e5d0adf2bf695bd6658fffa1a07"
+        ),
+        "src/runtime/crt/tab/gentab_ccitt_slice4.inc": None,
+        "include/tvm/runtime/crt/graph_executor.h": (
+            "ae6d67e11a285dcd474ce78eef8fb7344124e7a1ec6346ea6afa22eb3b7fea8c"
+        ),
+        "include/tvm/runtime/crt/graph_executor_module.h": (
+            "b977ab4fe000e267326fc8c497e04e30baa1a4f2af591f57c26ce52349d137d9"
+        ),
+        "include/tvm/runtime/crt/internal/graph_executor/graph_executor.h": (
+            "13647fa3eef0a3a158274f94ff434a0c78737b5d4f8c54516e09b696f72c40c4"
+        ),
+        "src/runtime/crt/graph_executor/graph_executor.c": (
+            "52d49b1beb59ec8f47101bfdeab726ab0f9d20e30ed731493b5a9b166e6fc763"
+        ),
+        "src/runtime/crt/graph_executor_module/graph_executor_module.c": (
+            "4ac0528fdf8d700191a1c8055af25aa549ec40c2bfd9b004a20b24136e142027"
+        ),
+        "include/tvm/runtime/crt/buddy_allocator.h": None,
+        "src/runtime/crt/memory/buddy_allocator.c": None,
+    }
+
     API_SERVER_CRT_LIBS_TOKEN = "<API_SERVER_CRT_LIBS>"
 
+    API_SERVER_EXECUTOR_TOKEN = "<API_SERVER_EXECUTOR>"
+
     # Common needs to be first in the list as other libs depend on it
     CRT_LIBS_BY_PROJECT_TYPE = {
-        "host_driven": "common microtvm_rpc_server microtvm_rpc_common graph_executor graph_executor_module aot_executor aot_executor_module",
+        "host_driven": "common memory microtvm_rpc_server microtvm_rpc_common graph_executor "
+        "graph_executor_module",
+        "aot_host_driven": "common memory microtvm_rpc_server microtvm_rpc_common aot_executor "
+        "aot_executor_module",
+        "aot_standalone": "common memory",
+        "standalone_bench": "common memory",
     }
 
+    def _check_model_executor(self, extract_path, project_type):
+        """Fail early if the model was not built for the executor of the project type."""
+        with open(pathlib.Path(extract_path) / "metadata.json") as metadata_f:
+            metadata = json.load(metadata_f)
+        module_metadata = metadata["modules"]["default"] if "modules" in metadata else metadata
+        executor = PROJECT_TYPES[project_type][1]
+        if executor not in module_metadata["executors"]:
+            raise RuntimeError(
+                f"project_type {project_type} needs a model built with the {executor} executor, "
+                f"but it was built for {module_metadata['executors']}"
+            )
+        if project_type in STANDALONE_PROJECT_TYPES and not (
+            pathlib.Path(extract_path) / "codegen" / "host" / "include" / "tvmgen_default.h"
+        ).exists():
+            raise RuntimeError(
+                f"project_type {project_type} needs a model built with the C interface "
+                '(Executor("aot", {"interface-api": "c", "unpacked-api": True}))'
+            )
+
+        return metadata
+
+    def _can_overlay_crt(self, standalone_crt_dir, link_mode):
+        """Return whether the CRT_OVERLAY_ITEMS can replace their counterparts of the TVM CRT."""
+        if link_mode == "symlink":
+            _LOG.debug("project_link_mode=symlink shares the TVM CRT, not applying the CRT overlay")
+            return False
+
+        for relpath, upstream_sha256 in self.CRT_OVERLAY_ITEMS.items():
+            upstream_path = pathlib.Path(standalone_crt_dir) / relpath
+            if upstream_sha256 is None:
+                continue
+            upstream_digest = None
+            if upstream_path.is_file():
+                upstream_digest = hashlib.sha256(upstream_path.read_bytes()).hexdigest()
+            overlay_path = API_SERVER_DIR / "crt" / relpath
+            overlay_digest = hashlib.sha256(overlay_path.read_bytes()).hexdigest()
+            if upstream_digest not in (upstream_sha256, overlay_digest):
+                _LOG.warning("%s differs from the overlay's base version, not applying it", relpath)
+                return False
+
+        return True
+
+    def _overlay_crt(self, crt_path, link_mode):
+        """Replace the CRT_OVERLAY_ITEMS in the project CRT."""
+        for relpath in self.CRT_OVERLAY_ITEMS:
+            dst = crt_path / relpath
+            # Never write through a hardlink into the TVM CRT.
+            dst.unlink(missing_ok=True)
+            populate_item(API_SERVER_DIR / "crt" / relpath, dst, link_mode)
+
+    def _plan_memory(
+        self,
+        extract_path,
+        metadata,
+        project_type,
+        memory_allocator,
+        options,
+        embedded_params_bytes=0,
+    ):
+        """Size the arena from metadata.json and place it.
+
+        Returns (plan, memory_size_bytes, placement).
+        """
+        memory_plan = compute_memory_plan(metadata)
+        if embedded_params_bytes:
+            # Embedded parameters are weights in .rodata.tvm like linked ones, not arena tensors.
+            memory_plan["constants_bytes"] = max(
+                memory_plan["constants_bytes"], embedded_params_bytes
+            )
+        num_graph_nodes = 0
+        graph_path = pathlib.Path(extract_path) / "executor-config" / "graph" / "default.graph"
+        if PROJECT_TYPES[project_type][1] == "graph" and graph_path.exists():
+            with open(graph_path) as graph_f:
+                num_graph_nodes = len(json.load(graph_f)["nodes"])
+
+        if memory_allocator == "stack":
+            memory_size_bytes = arena_bytes = memory_plan["stack_arena_bytes"]
+        else:
+            estimated_bytes = estimate_page_arena_bytes(
+                memory_plan,
+                project_type,
+                num_graph_nodes,
+                params_in_arena=not embedded_params_bytes,
+                power_of_two_blocks=memory_allocator == "buddy",
+            )
+            memory_size_bytes = int(options.get("memory_size_bytes") or estimated_bytes)
+            arena_bytes = memory_size_bytes
+            if memory_size_bytes < estimated_bytes:
+                _LOG.warning(
+                    "memory_size_bytes=%d is below the %d bytes estimated for the model",
+                    memory_size_bytes,
+                    estimated_bytes,
+                )
+
+        placement = options.get("memory_placement") or "l2"
+        if placement not in MEMORY_PLACEMENTS:
+            raise ValueError(
+                f"memory_placement must be one of {MEMORY_PLACEMENTS}, got {placement}"
+            )
+        l2_size_bytes = int(options.get("l2_size_bytes") or L2_SIZE_BYTES)
+        l1_size_bytes = 0
+        if placement == "auto":
+            l1_size_bytes = self._get_l1_size_bytes(options)
+        memory_placement = plan_memory_placement(
+            memory_plan, arena_bytes, project_type, placement, l2_size_bytes, l1_size_bytes
+        )
+        _LOG.info(
+            "memory plan: %s, arena: %d bytes, placement: %s",
+            memory_plan,
+            arena_bytes,
+            memory_placement,
+        )
+        return memory_plan, memory_size_bytes, memory_placement
+
+    def _get_l1_size_bytes(self, options):
+        """Return the size of the L1 region in the linker script of the PULP target."""
+        if not options.get("pulp_freertos_path"):
+            raise ValueError("memory_placement=auto needs pulp_freertos_path")
+
+        link_script_path = pathlib.Path(options["pulp_freertos_path"]) / PULP_LINK_SCRIPT_RELPATH
+        regions = read_memory_regions(link_script_path)
+        if L1_MEMORY_REGION not in regions:
+            raise RuntimeError(
+                f"memory_placement=auto needs a memory region {L1_MEMORY_REGION} in "
+                f"{link_script_path}"
+            )
+        return regions[L1_MEMORY_REGION][1]
+
     def generate_project(self, model_library_format_path, standalone_crt_dir, project_dir, options):
 
         project_dir = pathlib.Path(project_dir)
+        timing = TimingLog(self._get_timing_log_path(project_dir, options), "generate_project")
         # Make project directory.
         project_dir.mkdir()
 
@@ -227,105 +1949,535 @@ class Handler(server.ProjectAPIHandler):
         # Place Model Library Format tarball in the special location, which this script uses to decide
         # whether it's being invoked in a template or generated project.
         project_model_library_format_tar_path = project_dir / MODEL_LIBRARY_FORMAT_RELPATH
-        shutil.copy2(model_library_format_path, project_model_library_format_tar_path)
-
-        # Extract Model Library Format tarball.into <project_dir>/model.
         extract_path = os.path.splitext(project_model_library_format_tar_path)[0]
-        with tarfile.TarFile(project_model_library_format_tar_path) as tf:
-            os.makedirs(extract_path)
-            tf.extractall(path=extract_path)
+        if options.get("mlf_extract_mode") == "build_only":
+            # Read the tarball once and only write out what the build uses. In place of the copy,
+            # the project gets a tarball of just these files, so that it does not depend on the
+            # original tarball.
+            members = MODEL_LIBRARY_FORMAT_BUILD_MEMBERS
+            if options.get("embed_params"):
+                members += (MODEL_PARAMS_RELPATH,)
+            with timing.phase("extract_mlf"):
+                os.makedirs(extract_path)
+                extract_mlf_members(model_library_format_path, extract_path, members)
+                with tarfile.open(project_model_library_format_tar_path, "w") as tf:
+                    tf.add(extract_path, arcname=".")
+        else:
+            with timing.phase("copy_mlf"):
+                shutil.copy2(model_library_format_path, project_model_library_format_tar_path)
+
+            # Extract Model Library Format tarball.into <project_dir>/model.
+            with timing.phase("extract_mlf"), tarfile.TarFile(
+                project_model_library_format_tar_path
+            ) as tf:
+                os.makedirs(extract_path)
+                tf.extractall(path=extract_path)
+
+        project_type = options["project_type"]
+        if project_type not in PROJECT_TYPES:
+            raise ValueError(
+                f"project_type must be one of {list(PROJECT_TYPES)}, got {project_type}"
+            )
+        metadata = self._check_model_executor(extract_path, project_type)
+        memory_allocator = options.get("memory_allocator") or "page"
+        if memory_allocator not in MEMORY_ALLOCATORS:
+            raise ValueError(
+                f"memory_allocator must be one of {MEMORY_ALLOCATORS}, got {memory_allocator}"
+            )
+        # The RPC server and the graph executor free memory in any order.
+        if memory_allocator == "stack" and project_type not in STANDALONE_PROJECT_TYPES:
+            raise ValueError(
+                f"memory_allocator={memory_allocator} needs one of the project types "
+                f"{STANDALONE_PROJECT_TYPES}"
+            )
+        link_mode = options.get("project_link_mode") or "copy"
+        if link_mode not in PROJECT_LINK_MODES:
+            raise ValueError(
+                f"project_link_mode must be one of {PROJECT_LINK_MODES}, got {link_mode}"
+            )
+        if options.get("embed_params") and project_type != "host_driven":
+            raise ValueError("embed_params needs the host_driven project type")
+        graph_binary = project_type == "host_driven" and options.get("graph_binary") is not False
+
+        # The binary graph, embedded parameters and buddy allocator need the CRT overlay. The stock
+        # CRT would only fail on the device, i.e. when parsing the empty graph JSON.
+        crt_overlay = self._can_overlay_crt(standalone_crt_dir, link_mode)
+        if not crt_overlay:
+            if graph_binary and options.get("graph_binary") is None:
+                _LOG.warning(
+                    "the template CRT overlay is not applied, the graph JSON needs to be passed to "
+                    "create_graph_executor"
+                )
+                graph_binary = False
+            for feature, requested in (
+                ("memory_allocator=buddy", memory_allocator == "buddy"),
+                ("embed_params", options.get("embed_params")),
+                ("graph_binary", graph_binary),
+            ):
+                if requested:
+                    raise RuntimeError(
+                        f"{feature} needs the template CRT overlay, which is not applied with "
+                        "project_link_mode=symlink or a TVM CRT which differs from the version it "
+                        "is based on"
+                    )
+        timing.record["memory_allocator"] = memory_allocator
+
+        graph_path = pathlib.Path(extract_path) / "executor-config" / "graph" / "default.graph"
+        graph = None
+        if graph_binary or options.get("embed_params"):
+            with open(graph_path) as graph_f:
+                graph = json.load(graph_f)
+        assigned_params = []
+        params_path = pathlib.Path(extract_path) / MODEL_PARAMS_RELPATH
+        if options.get("embed_params") and params_path.exists():
+            assigned_params = assign_params_storage(graph, read_params(params_path))
+        embedded_params_bytes = sum(len(data) for _, _, data in assigned_params)
+        timing.record["embedded_params_bytes"] = embedded_params_bytes
+
+        # Fail before populating the project if the model does not fit.
+        memory_plan, memory_size_bytes, memory_placement = self._plan_memory(
+            extract_path, metadata, project_type, memory_allocator, options, embedded_params_bytes
+        )
+        timing.record["memory_size_bytes"] = memory_size_bytes
 
         # Populate CRT.
         crt_path = project_dir / "crt"
         crt_path.mkdir()
-        for item in self.CRT_COPY_ITEMS:
-            src_path = os.path.join(standalone_crt_dir, item)
-            dst_path = crt_path / item
-            if os.path.isdir(src_path):
-                shutil.copytree(src_path, dst_path)
-            else:
-                shutil.copy2(src_path, dst_path)
+        with timing.phase("copy_crt"):
+            for item in self.CRT_COPY_ITEMS:
+                populate_item(os.path.join(standalone_crt_dir, item), crt_path / item, link_mode)
+            if crt_overlay:
+                self._overlay_crt(crt_path, link_mode)
+            timing.record["crt_overlay"] = crt_overlay
 
         # Populate Makefile.
         with open(API_SERVER_DIR / "CMakeLists.txt.template", "r") as cmake_template_f:
             with open(project_dir / "CMakeLists.txt", "w") as cmake_f:
                 for line in cmake_template_f:
                     if self.API_SERVER_CRT_LIBS_TOKEN in line:
-                        crt_libs = self.CRT_LIBS_BY_PROJECT_TYPE[options["project_type"]]
+                        crt_libs = self.CRT_LIBS_BY_PROJECT_TYPE[project_type]
                         line = line.replace("<API_SERVER_CRT_LIBS>", crt_libs)
+                    if self.API_SERVER_EXECUTOR_TOKEN in line:
+                        line = line.replace(
+                            self.API_SERVER_EXECUTOR_TOKEN, PROJECT_TYPES[project_type][1]
+                        )
 
                     cmake_f.write(line)
 
         #self._create_prj_conf(project_dir, options)
 
-        # Populate crt-config.h
-        crt_config_dir = project_dir / "crt_config"
-        crt_config_dir.mkdir()
-        shutil.copy2(
-            API_SERVER_DIR / "crt_config" / "crt_config.h", crt_config_dir / "crt_config.h"
-        )
+        with timing.phase("copy_template"):
+            # Populate crt-config.h
+            crt_config_dir = project_dir / "crt_config"
+            crt_config_dir.mkdir()
+            populate_item(
+                API_SERVER_DIR / "crt_config" / "crt_config.h",
+                crt_config_dir / "crt_config.h",
+                link_mode,
+            )
+
+            # Populate src/
+            src_dir = project_dir / "src"
+            src_template_dir = API_SERVER_DIR / "src" / PROJECT_TYPES[project_type][0]
+            populate_item(src_template_dir, src_dir, link_mode)
+            if project_type in STANDALONE_PROJECT_TYPES:
+                input_data = None
+                if project_type == "standalone_bench":
+                    if options.get("bench_input_npy"):
+                        input_data = load_bench_inputs(metadata, options["bench_input_npy"])
+                    bench_warmup = options.get("bench_warmup")
+                    write_bench_config_header(
+                        project_dir / BENCH_CONFIG_HEADER_RELPATH,
+                        int(BENCH_WARMUP if bench_warmup is None else bench_warmup),
+                        int(options.get("bench_iterations") or BENCH_ITERATIONS),
+                    )
+                write_aot_model_io_header(
+                    metadata, project_dir / AOT_MODEL_IO_HEADER_RELPATH, input_data
+                )
+            write_memory_plan_header(
+                memory_plan, project_dir / MEMORY_PLAN_HEADER_RELPATH, memory_allocator
+            )
+            with open(project_dir / MEMORY_PLAN_JSON_RELPATH, "w") as plan_f:
+                memory_plan_json = dict(
+                    memory_plan,
+                    memory_size_bytes=memory_size_bytes,
+                    memory_allocator=memory_allocator,
+                )
+                json.dump(memory_plan_json, plan_f, indent=2)
+            if project_type == "host_driven":
+                graph_binary_data = None
+                if graph_binary:
+                    graph_binary_data = pack_graph_binary(graph)
+                    timing.record["graph_binary_bytes"] = len(graph_binary_data)
+                write_graph_binary_header(
+                    project_dir / GRAPH_BINARY_HEADER_RELPATH, graph_binary_data
+                )
+                write_embedded_params_header(
+                    project_dir / EMBEDDED_PARAMS_HEADER_RELPATH, assigned_params
+                )
+            write_memory_placement_script(
+                project_dir / MEMORY_PLACEMENT_SCRIPT_RELPATH, memory_placement
+            )
+
+            # Populate cmake/
+            cmake_dir = project_dir / "cmake"
+            populate_item(API_SERVER_DIR / "cmake", cmake_dir, link_mode)
+
+        timing.write()
+
+    def _get_timing_log_path(self, project_dir, options):
+        if not options.get("timing_log"):
+            return None
+
+        return pathlib.Path(project_dir) / options["timing_log"]
+
+    def _get_crt_prebuilt_dir(self, options):
+        """Return the CRT library cache entry for these options, and whether it is populated."""
+        if not options.get("crt_lib_cache_dir"):
+            return None, False
+
+        entry = pathlib.Path(options["crt_lib_cache_dir"]) / self._crt_lib_cache_key(options)
+        return entry, entry.is_dir()
+
+    # Project options with the CMake cache entry they are passed in, see _get_cmake_defines.
+    CMAKE_PATH_OPTIONS = (
+        ("PULP_FREERTOS_DIR", "pulp_freertos_path"),
+        ("RISCV_ELF_GCC_PREFIX", "pulp_gcc_path"),
+        ("LLVM_DIR", "pulp_llvm_path"),
+    )
+
+    def _get_cmake_defines(self, options):
+        """Return the CMake cache entries build configures, as name -> str or bool value.
+
+        An existing build directory is only reused by incremental builds if all of them match.
+        """
+        defines = collections.OrderedDict()
+        defines["TOOLCHAIN"] = options.get("toolchain")
+        defines["RISCV_ARCH"] = options["arch"]
+        defines["RISCV_ABI"] = options["abi"]
+        if not self._is_host_toolchain(options):
+            for cache_key, option_key in self.CMAKE_PATH_OPTIONS:
+                if not options.get(option_key):
+                    raise RuntimeError(f"Project Config '{option_key}' undefined!")
+                defines[cache_key] = options[option_key]
+
+        crt_prebuilt_dir, crt_prebuilt = self._get_crt_prebuilt_dir(options)
+        defines["CRT_PREBUILT_DIR"] = str(crt_prebuilt_dir) if crt_prebuilt else ""
+        memory_size_bytes = self._get_memory_size_bytes(options)
+        if memory_size_bytes:
+            defines["MEMORY_SIZE_BYTES"] = str(memory_size_bytes)
+        defines["RPC_TRANSPORT"] = self._get_rpc_transport(options)
+        defines["CORE_FREQ_HZ"] = str(self._get_core_freq_hz(options))
+        defines["PROFILING"] = bool(options.get("profiling"))
+        if options.get("profiling"):
+            defines["PERF_EVENT_MASK"] = hex(self._get_perf_event_mask(options))
+        defines["CMAKE_BUILD_TYPE"] = "DEBUG" if options.get("debug") else ""
+        defines["CMAKE_VERBOSE_MAKEFILE"] = bool(options.get("verbose"))
+        return defines
+
+    def _can_reuse_build_dir(self, options):
+        if not (BUILD_DIR / "CMakeCache.txt").exists():
+            return False
+
+        CMAKE_CACHE.reload()
+        expected = self._get_cmake_defines(options)
+        expected["CMAKE_GENERATOR"] = self._get_cmake_generator(options)
+        if CMAKE_CACHE.get("CRT_PREBUILT_DIR") == "":
+            # The build dir compiled the CRT itself, which is as good as the cache entry it may
+            # have populated since.
+            del expected["CRT_PREBUILT_DIR"]
+        for cache_key, value in expected.items():
+            if CMAKE_CACHE.get(cache_key) != value:
+                _LOG.debug(
+                    "build dir not reusable: %s=%s (expected %s)",
+                    cache_key,
+                    CMAKE_CACHE.get(cache_key),
+                    value,
+                )
+                return False
 
-        # Populate src/
-        src_dir = project_dir / "src"
-        shutil.copytree(API_SERVER_DIR / "src" / options["project_type"], src_dir)
+        return True
 
-        # Populate cmake/
-        cmake_dir = project_dir / "cmake"
-        shutil.copytree(API_SERVER_DIR / "cmake", cmake_dir)
+    def _get_rpc_transport(self, options):
+        rpc_transport = options.get("rpc_transport") or "stdio"
+        if rpc_transport not in ("stdio", "fifo"):
+            raise ValueError(f"rpc_transport must be stdio or fifo, got {rpc_transport}")
+        return rpc_transport
+
+    def _get_core_freq_hz(self, options):
+        core_freq_hz = int(options.get("core_freq_hz") or CORE_FREQ_HZ)
+        if core_freq_hz <= 0:
+            raise ValueError(f"core_freq_hz must be positive, got {core_freq_hz}")
+        return core_freq_hz
+
+    def _get_perf_event_mask(self, options):
+        """Return the PCER bits of the profiling_events option."""
+        profiling_events = options.get("profiling_events") or ""
+        events = [event.strip() for event in profiling_events.split(",") if event.strip()]
+        mask = 0
+        for event in events or PERF_COUNTER_EVENTS:
+            if event not in PERF_COUNTER_EVENTS:
+                raise ValueError(
+                    f"profiling_events must be some of {list(PERF_COUNTER_EVENTS)}, got {event}"
+                )
+            mask |= 1 << PERF_COUNTER_EVENTS.index(event)
+        return mask
+
+    def _get_memory_size_bytes(self, options):
+        """Return the memory_size_bytes option, or the arena size planned by generate_project."""
+        if options.get("memory_size_bytes") and int(options["memory_size_bytes"]) > 0:
+            return int(options["memory_size_bytes"])
+
+        plan_path = API_SERVER_DIR / MEMORY_PLAN_JSON_RELPATH
+        if not plan_path.exists():
+            return None
+        with open(plan_path) as plan_f:
+            return json.load(plan_f)["memory_size_bytes"]
+
+    def _is_host_toolchain(self, options):
+        return options.get("toolchain") == "host"
+
+    def _get_cmake_generator(self, options):
+        generator = options.get("cmake_generator") or "Unix Makefiles"
+        if generator not in CMAKE_GENERATORS:
+            raise ValueError(
+                f"cmake_generator must be one of {list(CMAKE_GENERATORS)}, got {generator}"
+            )
+        return generator
+
+    # Platform sources from PULP FreeRTOS which are compiled into every app, relative to
+    # pulp_freertos_path. NOTE: keep in sync with ADD_EXECUTABLE_GVSOC_PULP_INTERNAL in
+    # cmake/PulpTarget.cmake.
+    GVSOC_PLATFORM_SRCS = (
+        "target/pulp/system_metal.c",
+        "target/pulp/crt0.S",
+        "target/pulp/vectors_metal.S",
+        "libc/malloc/malloc_internal.c",
+        "libc/malloc/cl_l1_malloc.c",
+        "libc/syscalls.c",
+        "libc/pulp_malloc.c",
+    )
+
+    # Include directories of pulp_freertos_path, which hold the PULP and FreeRTOS config headers.
+    # NOTE: keep in sync with GVSOC_PULP_INCLUDES in cmake/PulpTarget.cmake
+    GVSOC_PULP_INCLUDE_DIRS = (
+        "target/pulp/include",
+        "template/hello_world",
+        "target/arch",
+        "libc/malloc/include",
+        "drivers/include",
+    )
+
+    # Project options which influence how the CRT libraries are compiled.
+    CRT_LIB_CACHE_OPTIONS = ("toolchain", "arch", "abi", "debug", "pulp_gcc_path", "pulp_llvm_path")
+
+    def _get_compilers(self, options):
+        """Return the C and C++ compiler commands CMake is configured with."""
+        if self._is_host_toolchain(options):
+            # The CMake defaults for the build machine, see cmake/toolchain_host.cmake.
+            return [os.environ.get("CC") or "cc", os.environ.get("CXX") or "c++"]
+        if options.get("toolchain") == "gcc":
+            # NOTE: keep in sync with TC_PREFIX in CMakeLists.txt.template
+            bin_dir = pathlib.Path(options.get("pulp_gcc_path") or "") / "bin"
+            prefix = bin_dir / "riscv32-unknown-elf-"
+            return [f"{prefix}gcc", f"{prefix}g++"]
+        llvm_bin_dir = pathlib.Path(options.get("pulp_llvm_path") or "") / "bin"
+        return [str(llvm_bin_dir / "clang"), str(llvm_bin_dir / "clang++")]
+
+    def _get_compiler_identity(self, compiler):
+        """Return the --version output, size and modification time of a compiler."""
+        cmd = shlex.split(compiler)
+        path = shutil.which(cmd[0])
+        if path is None:
+            return f"{compiler} not found".encode()
+
+        stat = os.stat(path)
+        identity = f"{path} {stat.st_size} {stat.st_mtime_ns}\n".encode()
+        try:
+            identity += subprocess.run(
+                cmd + ["--version"], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, check=True
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            pass
+        return identity
+
+    def _crt_lib_cache_key(self, options):
+        """Hash all inputs of the CRT library and platform object compilation."""
+        key = hashlib.sha256()
+        for name in self.CRT_LIB_CACHE_OPTIONS:
+            key.update(f"{name}={options.get(name)}\n".encode())
+        # Another compiler version can be installed under the same path.
+        for compiler in self._get_compilers(options):
+            key.update(self._get_compiler_identity(compiler))
+
+        inputs = [
+            ("CMakeLists.txt", API_SERVER_DIR / "CMakeLists.txt"),
+            ("crt_config.h", API_SERVER_DIR / "crt_config" / "crt_config.h"),
+        ]
+        for item in ("crt", "cmake"):
+            # os.walk is used as it can follow directories linked in with project_link_mode=symlink.
+            for root, dirs, files in os.walk(API_SERVER_DIR / item, followlinks=True):
+                dirs.sort()
+                for name in sorted(files):
+                    path = pathlib.Path(root) / name
+                    inputs.append((str(path.relative_to(API_SERVER_DIR)), path))
+        if not self._is_host_toolchain(options):
+            freertos_dir = pathlib.Path(options["pulp_freertos_path"])
+            for src in self.GVSOC_PLATFORM_SRCS:
+                inputs.append((src, freertos_dir / src))
+            for include_dir in self.GVSOC_PULP_INCLUDE_DIRS:
+                for root, dirs, files in os.walk(freertos_dir / include_dir):
+                    dirs.sort()
+                    for name in sorted(files):
+                        path = pathlib.Path(root) / name
+                        if path.suffix == ".h":
+                            inputs.append((str(path.relative_to(freertos_dir)), path))
+
+        for name, path in inputs:
+            key.update(f"{name}\n".encode())
+            key.update(path.read_bytes())
+
+        return key.hexdigest()
+
+    def _populate_crt_lib_cache(self, cache_entry_dir):
+        """Copy the CRT archives and platform objects of a finished build into the cache."""
+        cache_entry_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = pathlib.Path(tempfile.mkdtemp(prefix=".tmp-", dir=cache_entry_dir.parent))
+        try:
+            for lib in BUILD_DIR.glob("lib*.a"):
+                if lib.name != "libtvm_model.a":
+                    shutil.copy2(lib, tmp_dir / lib.name)
+
+            platform_dir = tmp_dir / "platform"
+            platform_dir.mkdir()
+            for obj in (BUILD_DIR / "CMakeFiles" / "gvsoc_platform.dir").rglob("*"):
+                if obj.suffix in (".o", ".obj"):
+                    shutil.copy2(obj, platform_dir / obj.name)
+
+            # Publish atomically, another build may have populated the same entry in the meantime.
+            os.rename(tmp_dir, cache_entry_dir)
+            _LOG.debug("populated CRT library cache entry %s", cache_entry_dir)
+        except OSError:
+            if not cache_entry_dir.is_dir():
+                raise
+        finally:
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir)
 
     def build(self, options):
+        timing = TimingLog(self._get_timing_log_path(API_SERVER_DIR, options), "build")
+        self._build(options, timing)
+        timing.write()
+
+    def _build(self, options, timing):
+        if options.get("toolchain") not in ["llvm", "gcc", "host"]:
+            raise ValueError(f"toolchain must be llvm, gcc or host, got {options.get('toolchain')}")
+        if self._is_host_toolchain(options):
+            # Only the RPC server firmware has a host port, see MICROTVM_HOST in
+            # src/host_driven/main.cc.
+            if self._is_standalone_project():
+                raise ValueError(
+                    "toolchain=host needs the host_driven or aot_host_driven project type"
+                )
+            if options.get("profiling"):
+                raise ValueError("profiling is not supported with toolchain=host")
+
+        if options.get("incremental_build") and self._can_reuse_build_dir(options):
+            # The CRT libraries are up to date, so building app only recompiles the tvm_model
+            # target and relinks.
+            timing.record["incremental"] = True
+            with timing.phase("compile"):
+                self._run_build(options, ["app"])
+            return
+
+        if BUILD_DIR.exists():
+            shutil.rmtree(BUILD_DIR)
         BUILD_DIR.mkdir()
 
-        cmake_args = ["cmake", ".."]
-        assert options.get("toolchain") in ["llvm", "gcc"], f"toolchain must be llvm or gcc but get {options.get('toolchain')}"
-        cmake_args.append("-DTOOLCHAIN=" + options["toolchain"])
-        
-        cmake_args.append("-DRISCV_ARCH=" + options["arch"])
-        
-        cmake_args.append("-DRISCV_ABI=" + options["abi"])
-
-        if options.get("pulp_freertos_path"):
-            cmake_args.append("-DPULP_FREERTOS_DIR=" + options["pulp_freertos_path"])
-        else:
-            raise RuntimeError("Project Config 'pulp_freertos_path' undefined!")
+        cmake_args = ["cmake", "..", "-G", self._get_cmake_generator(options)]
+        for cache_key, value in self._get_cmake_defines(options).items():
+            if isinstance(value, bool):
+                cmake_args.append(f"-D{cache_key}:BOOL={'ON' if value else 'OFF'}")
+            else:
+                cmake_args.append(f"-D{cache_key}={value}")
+
+        # Populated after the build if the entry does not exist yet.
+        crt_lib_cache_entry, crt_lib_cache_hit = self._get_crt_prebuilt_dir(options)
+        if crt_lib_cache_entry is not None:
+            timing.record["crt_lib_cache_hit"] = crt_lib_cache_hit
+            if crt_lib_cache_hit:
+                _LOG.debug("using CRT library cache entry %s", crt_lib_cache_entry)
+                crt_lib_cache_entry = None
+
+        with timing.phase("configure"):
+            if options.get("verbose"):
+                check_call(cmake_args, cwd=BUILD_DIR)
+            else:
+                check_call(
+                    cmake_args, cwd=BUILD_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT
+                )
 
-        if options.get("pulp_gcc_path"):
-            cmake_args.append("-DRISCV_ELF_GCC_PREFIX=" + options["pulp_gcc_path"])
-        else:
-            raise RuntimeError("Project Config 'pulp_gcc_path' undefined!")
+        # print("BUILD_DIR", BUILD_DIR)
+        # input(">")
+        with timing.phase("compile"):
+            self._run_build(options)
 
-        if options.get("pulp_llvm_path"):
-            cmake_args.append("-DLLVM_DIR=" + options["pulp_llvm_path"])
-        else:
-            raise RuntimeError("Project Config 'pulp_llvm_path' undefined!")
+        if crt_lib_cache_entry is not None:
+            self._populate_crt_lib_cache(crt_lib_cache_entry)
 
-        if options.get("memory_size_bytes"):
-            b = int(options["memory_size_bytes"])
-            if b > 0:
-                cmake_args.append("-DMEMORY_SIZE_BYTES=" + str(b))
+    def _run_build(self, options, targets=()):
+        num_jobs = max(1, int(options.get("build_jobs") or os.cpu_count() or 1))
+        job_server = None
+        if options.get("build_job_budget"):
+            job_server = BuildJobServer(int(options["build_job_budget"]))
+            num_jobs = job_server.acquire(num_jobs)
 
-        if options.get("debug"):
-            cmake_args.append("-DCMAKE_BUILD_TYPE=DEBUG")
+        try:
+            build_tool = CMAKE_GENERATORS[self._get_cmake_generator(options)]
+            args = [build_tool, f"-j{num_jobs}"]
+            args.extend(targets)
+            if options.get("verbose"):
+                args.append("VERBOSE=1" if build_tool == "make" else "-v")
+                check_call(args, cwd=BUILD_DIR)
+            else:
+                check_call(args, cwd=BUILD_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+        finally:
+            if job_server is not None:
+                job_server.release()
 
-        if options.get("verbose"):
-            cmake_args.append("-DCMAKE_VERBOSE_MAKEFILE:BOOL=TRUE")
+    def flash(self, options):
+        # Flashing does nothing on host, except for standalone projects which are run to completion.
+        if self._is_standalone_project():
+            self._run_standalone(options)
 
-        if options.get("verbose"):
-            check_call(cmake_args, cwd=BUILD_DIR)
-        else:
-            check_call(cmake_args, cwd=BUILD_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    def _is_standalone_project(self):
+        return (API_SERVER_DIR / AOT_MODEL_IO_HEADER_RELPATH).exists()
 
-        # print("BUILD_DIR", BUILD_DIR)
-        # input(">")
-        args = ["make", "-j2"]
-        if options.get("verbose"):
-            args.append("VERBOSE=1")
-            check_call(args, cwd=BUILD_DIR)
-        else:
-            check_call(args, cwd=BUILD_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    def _run_standalone(self, options):
+        """Run the standalone firmware in GVSoC and write the cycle counts it prints as JSON."""
+        timing = TimingLog(self._get_timing_log_path(API_SERVER_DIR, options), "standalone")
+        with timing.phase("prepare"):
+            self._prepare_simulator(options)
 
-    def flash(self, options):
-        pass  # Flashing does nothing on host.
+        env = os.environ
+        env["PULP_RISCV_GCC_TOOLCHAIN"] = options["pulp_gcc_path"]
+        with timing.phase("run"):
+            proc = subprocess.run(
+                self._get_gvsoc_args(options, ["run"]),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                cwd=BUILD_DIR,
+                env=env,
+            )
+        output = proc.stdout.decode(errors="replace")
+        (BUILD_DIR / GVSOC_CONSOLE_LOG_RELPATH).write_text(output)
+        results = parse_standalone_output(output)
+        results["core_freq_hz"] = int(CMAKE_CACHE.get("CORE_FREQ_HZ") or CORE_FREQ_HZ)
+        with open(BUILD_DIR / STANDALONE_RESULTS_RELPATH, "w") as results_f:
+            json.dump(results, results_f, indent=2)
+        _LOG.info("standalone results: %s", results)
+        timing.write()
 
     def _set_nonblock(self, fd):
         flag = fcntl.fcntl(fd, fcntl.F_GETFL)
@@ -333,26 +2485,208 @@ class Handler(server.ProjectAPIHandler):
         new_flag = fcntl.fcntl(fd, fcntl.F_GETFL)
         assert (new_flag & os.O_NONBLOCK) != 0, "Cannot set file descriptor {fd} to non-blocking"
 
-    def open_transport(self, options):
-        # print("open_transport")
-        env = os.environ
-        env["PULP_RISCV_GCC_TOOLCHAIN"] = options["pulp_gcc_path"]
+    def _get_gvsoc_args(self, options, commands):
         gvsoc_args = []
         gvsoc_args.append(options["pulp_freertos_path"] + "/support/egvsoc.sh")
         gvsoc_args.append(f"--dir={BUILD_DIR}")
-        gvsoc_args.append("--config-file=pulp@config_file=chips/pulp/pulp.json")
+        gvsoc_args.append(f"--config-file={GVSOC_CONFIG_FILE}")
         gvsoc_args.append("--platform=gvsoc")
         gvsoc_args.append("--binary=app")
-        gvsoc_args.append("prepare")
-        gvsoc_args.append("run")
+        if options.get("trace_file"):
+            gvsoc_args.append(f"--trace=insn:{BUILD_DIR / INSN_TRACE_FIFO_RELPATH}")
+        gvsoc_args.extend(commands)
+        return gvsoc_args
+
+    def _get_simulator_args(self, options, commands):
+        if self._is_host_toolchain(options):
+            # The app was built for the build machine and is run directly, in the build dir so
+            # that it finds the RPC named pipes.
+            return [str(BUILD_DIR / "app")]
+
+        return self._get_gvsoc_args(options, commands)
+
+    def _launch_simulator(self, options, commands):
+        env = os.environ
+        if not self._is_host_toolchain(options):
+            env["PULP_RISCV_GCC_TOOLCHAIN"] = options["pulp_gcc_path"]
+        args = self._get_simulator_args(options, commands)
         # print("env", env)
         # print("cwd", BUILD_DIR)
-        # print("gvsoc_args", gvsoc_args)
-        self._proc = subprocess.Popen(
-            gvsoc_args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0, cwd=BUILD_DIR, env=env
+        if self._get_rpc_transport(options) == "fifo":
+            with open(BUILD_DIR / GVSOC_CONSOLE_LOG_RELPATH, "wb") as console_log:
+                return subprocess.Popen(
+                    args, stdin=subprocess.DEVNULL, stdout=console_log, cwd=BUILD_DIR, env=env
+                )
+
+        proc = subprocess.Popen(
+            args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0, cwd=BUILD_DIR, env=env
         )
-        self._set_nonblock(self._proc.stdin.fileno())
-        self._set_nonblock(self._proc.stdout.fileno())
+        self._set_nonblock(proc.stdin.fileno())
+        self._set_nonblock(proc.stdout.fileno())
+        return proc
+
+    def _open_rpc_fifos(self):
+        """Create and open the host side of the RPC named pipes, returns (read_fd, write_fd)."""
+        fds = []
+        for relpath in (RPC_FIFO_DEVICE_TO_HOST_RELPATH, RPC_FIFO_HOST_TO_DEVICE_RELPATH):
+            path = BUILD_DIR / relpath
+            if not path.exists():
+                os.mkfifo(path)
+            # O_RDWR never blocks on a FIFO (Linux), so the simulator can open its ends in any
+            # order. The downside is that no EOF is seen when the simulator exits.
+            fds.append(os.open(path, os.O_RDWR | os.O_NONBLOCK))
+
+        self._fifo_fds = fds
+        return tuple(fds)
+
+    def _get_prepare_key(self, options):
+        key = hashlib.sha256()
+        key.update(" ".join(self._get_gvsoc_args(options, ["prepare"])).encode())
+        key.update(pathlib.Path(options["pulp_freertos_path"], "support", "egvsoc.sh").read_bytes())
+        key.update((BUILD_DIR / "app").read_bytes())
+        return key.hexdigest()
+
+    def _prepare_simulator(self, options):
+        """Run the egvsoc.sh "prepare" step unless it was done for the same binary and config."""
+        stamp_path = BUILD_DIR / GVSOC_PREPARE_STAMP_RELPATH
+        prepare_key = self._get_prepare_key(options)
+        if stamp_path.exists() and stamp_path.read_text() == prepare_key:
+            _LOG.debug("skipping gvsoc prepare, config and stimuli are up to date")
+            return
+
+        stamp_path.unlink(missing_ok=True)
+        env = os.environ
+        env["PULP_RISCV_GCC_TOOLCHAIN"] = options["pulp_gcc_path"]
+        check_call(self._get_gvsoc_args(options, ["prepare"]), cwd=BUILD_DIR, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+        stamp_path.write_text(prepare_key)
+
+    def _get_simulator_pool_key(self, options):
+        key = hashlib.sha256()
+        key.update(str(options["simulator_pool_size"]).encode())
+        key.update(" ".join(self._get_simulator_args(options, ["run"])).encode())
+        key.update((BUILD_DIR / "app").read_bytes())
+        return key.hexdigest()
+
+    def _start_simulator_pool_daemon(self, options):
+        env = {}
+        if not self._is_host_toolchain(options):
+            env["PULP_RISCV_GCC_TOOLCHAIN"] = options["pulp_gcc_path"]
+        config = {
+            "address": simulator_pool_address(BUILD_DIR),
+            "pool_key": self._get_simulator_pool_key(options),
+            "size": int(options["simulator_pool_size"]),
+            "args": self._get_simulator_args(options, ["run"]),
+            "cwd": str(BUILD_DIR),
+            "env": env,
+            "binary_path": str(BUILD_DIR / "app"),
+        }
+        with open(BUILD_DIR / SIMULATOR_POOL_LOG_RELPATH, "ab") as log:
+            subprocess.Popen(
+                [sys.executable, __file__, SIMULATOR_POOL_DAEMON_ARG, json.dumps(config)],
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+
+    def _checkout_pooled_simulator(self, options):
+        """Check out a simulator from the pool daemon of the project, starting it if needed.
+
+        The daemon outlives this API server, so that the next server process (AutoTVM starts
+        one per measurement) finds a warm simulator. It replaces a simulator only after the
+        session using it was closed.
+        """
+        address = simulator_pool_address(BUILD_DIR)
+        pool_key = self._get_simulator_pool_key(options)
+        deadline = time.monotonic() + SIMULATOR_POOL_START_TIMEOUT_SEC
+        started = False
+        while True:
+            proc = checkout_pooled_simulator(address, pool_key)
+            if proc is not None:
+                break
+            if time.monotonic() > deadline:
+                raise RuntimeError(
+                    "simulator pool daemon did not start, see "
+                    f"{BUILD_DIR / SIMULATOR_POOL_LOG_RELPATH}"
+                )
+            if not started:
+                # Either no daemon is running or it served other options and is shutting down.
+                self._start_simulator_pool_daemon(options)
+                started = True
+            time.sleep(0.05)
+
+        self._set_nonblock(proc.read_fd)
+        self._set_nonblock(proc.write_fd)
+        _LOG.info("simulator pool: %s", proc.stats)
+        return proc
+
+    def _start_trace_reader(self, options):
+        compression = options.get("trace_compression") or "gzip"
+        if compression not in TRACE_COMPRESSION_SUFFIXES:
+            raise ValueError(
+                f"trace_compression must be one of {list(TRACE_COMPRESSION_SUFFIXES)}, "
+                f"got {compression}"
+            )
+        self._trace_reader = InstructionTraceReader(
+            BUILD_DIR / INSN_TRACE_FIFO_RELPATH,
+            BUILD_DIR / (INSN_TRACE_RELPATH + TRACE_COMPRESSION_SUFFIXES[compression]),
+            compression,
+        )
+        self._trace_reader.start()
+
+    def _stop_trace_reader(self):
+        reader = self._trace_reader
+        self._trace_reader = None
+        reader.stop()
+        symbolizer = AddressSymbolizer(BUILD_DIR / "app", BUILD_DIR / "linker.map")
+        reader.write_hotspots(BUILD_DIR / INSN_HOTSPOTS_RELPATH, symbolizer)
+        if self._session_timing is not None:
+            self._session_timing.record["trace_bytes"] = reader.bytes_read
+
+    def _start_simulator(self, options):
+        """Launch or check out a simulator and return the (read_fd, write_fd) of its RPC channel."""
+        if options.get("trace_file"):
+            if self._is_host_toolchain(options):
+                raise ValueError("trace_file is not supported with toolchain=host")
+            # Every traced session needs its own reader, started before the simulator.
+            if options.get("simulator_pool_size"):
+                raise ValueError("simulator_pool_size is not supported with trace_file")
+            self._start_trace_reader(options)
+
+        if self._get_rpc_transport(options) == "fifo":
+            # Parked simulators would share the named pipes in the build dir.
+            if options.get("simulator_pool_size"):
+                raise ValueError("simulator_pool_size is not supported with rpc_transport=fifo")
+            fds = self._open_rpc_fifos()
+            self._proc = self._launch_simulator(options, ["run"])
+            return fds
+
+        if options.get("simulator_pool_size"):
+            self._proc = self._checkout_pooled_simulator(options)
+            return self._proc.read_fd, self._proc.write_fd
+
+        self._proc = self._launch_simulator(options, ["run"])
+        return self._proc.stdout.fileno(), self._proc.stdin.fileno()
+
+    def open_transport(self, options):
+        # print("open_transport")
+        if self._is_standalone_project():
+            raise RuntimeError(
+                "Standalone projects have no RPC server to open a transport to, "
+                "use flash to run them"
+            )
+        timing = TimingLog(self._get_timing_log_path(API_SERVER_DIR, options), "session")
+        self._session_timing = timing
+        # Parked simulators share the build dir, so "prepare" always runs up front instead of
+        # letting every instance regenerate the config concurrently.
+        if not self._is_host_toolchain(options):
+            with timing.phase("prepare"):
+                self._prepare_simulator(options)
+        with timing.phase("launch"):
+            read_fd, write_fd = self._start_simulator(options)
+
+        self._transport = PipeTransport(read_fd, write_fd)
         return server.TransportTimeouts(
             session_start_retry_timeout_sec=0,
             session_start_timeout_sec=0,
@@ -361,69 +2695,61 @@ class Handler(server.ProjectAPIHandler):
 
     def close_transport(self):
         # print("close_transport")
+        if self._transport is not None:
+            _LOG.debug("transport stats: %s", dict(self._transport.stats))
+            if self._session_timing is not None:
+                for key in ("bytes_read", "bytes_written", "reads", "writes", "polls"):
+                    self._session_timing.record[key] = self._transport.stats[key]
+            self._transport.close()
+            self._transport = None
+        for fd in self._fifo_fds:
+            os.close(fd)
+        self._fifo_fds = []
         if self._proc is not None:
             proc = self._proc
             self._proc = None
             proc.terminate()
             proc.wait()
-
-    def _await_ready(self, rlist, wlist, timeout_sec=None, end_time=None):
-        if timeout_sec is None and end_time is not None:
-            timeout_sec = max(0, end_time - time.monotonic())
-
-        rlist, wlist, xlist = select.select(rlist, wlist, rlist + wlist, timeout_sec)
-        if not rlist and not wlist and not xlist:
-            raise server.IoTimeoutError()
-
-        return True
+        if self._trace_reader is not None:
+            self._stop_trace_reader()
+        if self._session_timing is not None:
+            self._session_timing.write()
+            self._session_timing = None
 
     def read_transport(self, n, timeout_sec):
         # print("read_transport", n, timeout_sec)
         if self._proc is None:
             raise server.TransportClosedError()
 
-        fd = self._proc.stdout.fileno()
-        # print("fd", fd)
         end_time = None if timeout_sec is None else time.monotonic() + timeout_sec
-
         try:
-            self._await_ready([fd], [], end_time=end_time)
-            # print("os.ready")
-            to_return = os.read(fd, n)
-            # print("->", to_return)
-        except BrokenPipeError:
-            to_return = 0
-
-        if not to_return:
-            self.disconnect_transport()
-            raise server.TransportClosedError()
+            with self._session_timing.phase("read_transport"):
+                data = self._transport.read(n, end_time)
+        except server.TransportClosedError:
+            self.close_transport()
+            raise
 
-        return to_return
+        # Time until the firmware answered for the first time, i.e. simulator startup.
+        self._session_timing.record.setdefault("first_read_sec", self._session_timing.elapsed())
+        return data
 
     def write_transport(self, data, timeout_sec):
         # print("write_transport", data, timeout_sec)
         if self._proc is None:
             raise server.TransportClosedError()
 
-        fd = self._proc.stdin.fileno()
-        # print("fd", fd)
         end_time = None if timeout_sec is None else time.monotonic() + timeout_sec
-
-        data_len = len(data)
-        while data:
-            self._await_ready([], [fd], end_time=end_time)
-            try:
-                # print("os.write")
-                num_written = os.write(fd, data)
-            except BrokenPipeError:
-                num_written = 0
-
-            if not num_written:
-                self.disconnect_transport()
-                raise server.TransportClosedError()
-
-            data = data[num_written:]
+        try:
+            with self._session_timing.phase("write_transport"):
+                self._transport.write(data, end_time)
+        except server.TransportClosedError:
+            self.close_transport()
+            raise
 
 
 if __name__ == "__main__":
-    server.main(Handler())
+    if len(sys.argv) == 3 and sys.argv[1] == SIMULATOR_POOL_DAEMON_ARG:
+        logging.basicConfig(level="INFO", format="%(asctime)s %(message)s")
+        run_simulator_pool_daemon(json.loads(sys.argv[2]))
+    else:
+        server.main(Handler())
@@ -0,0 +1,248 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Host-side helpers for microTVM sessions with firmware generated from this template."""
+
+import collections
+import json
+
+import numpy as np
+
+import tvm
+from tvm.contrib import graph_executor
+from tvm.rpc.base import RPC_SESS_MASK
+
+# Counters of the memory manager, in the order of tvm.gvsoc.memory.stats.
+# NOTE: keep in sync with kMemoryStatsCount in src/host_driven/main.cc
+MEMORY_STATS = (
+    "buddy_allocator",
+    "num_allocs",
+    "num_frees",
+    "num_failed_allocs",
+    "alloc_cycles",
+    "free_cycles",
+    "max_alloc_cycles",
+    "max_free_cycles",
+    "pool_bytes",
+    "allocated_bytes",
+    "peak_allocated_bytes",
+    "free_bytes",
+    "largest_free_bytes",
+    "requested_bytes_total",
+    "block_bytes_total",
+)
+
+# PULP performance counter events, in the order of their PCER bits and counter CSRs.
+# NOTE: keep in sync with PERF_EVENT_MASK in src/host_driven/main.cc and microtvm_api_server.py
+PERF_COUNTER_EVENTS = (
+    "cycles",
+    "instr",
+    "ld_stall",
+    "jmp_stall",
+    "imiss",
+    "ld",
+    "st",
+    "jump",
+    "branch",
+    "taken_branch",
+    "rvc",
+    "ld_ext",
+    "st_ext",
+    "ld_ext_cyc",
+    "st_ext_cyc",
+    "tcdm_cont",
+)
+
+
+def _profiled_func_names(graph_json):
+    """Return the function name of every node the debug executor times, in execution order."""
+    graph = json.loads(graph_json)
+    func_names = []
+    for node in graph["nodes"]:
+        if node["op"] != "tvm_op":
+            continue
+        func_name = node["attrs"]["func_name"]
+        if func_name != "__nop":
+            func_names.append(func_name)
+
+    return func_names
+
+
+def profile_operators(session, graph_json, debug_executor, number=1):
+    """Run every operator once under the PULP performance counters.
+
+    Needs a project built with the `profiling` option. `debug_executor` is created with
+    `tvm.micro.create_local_debug_executor` for `graph_json` and must already hold the inputs
+    and parameters. The firmware records one set of counters per TVMPlatformTimerStart/Stop
+    pair, so the records are only attributed to operators when they are timed one at a time by
+    `run_individual`, as done here. Other timed calls add records which do not belong to an
+    operator.
+
+    Returns an OrderedDict mapping each fused function name to a dict with the number of
+    calls and the summed counters per call of the events selected with `profiling_events`,
+    sorted by cycles.
+    """
+    func_names = _profiled_func_names(graph_json)
+    event_mask = session.get_function("tvm.gvsoc.perf.event_mask")()
+    events = [event for bit, event in enumerate(PERF_COUNTER_EVENTS) if event_mask & (1 << bit)]
+    session.get_function("tvm.gvsoc.perf.reset")()
+
+    # The firmware records one set of counters per TVMPlatformTimerStart/Stop pair, which
+    # run_individual issues exactly once per operator with repeat=1 and min_repeat_ms=0.
+    debug_executor.run_individual(number, 1, 0)
+
+    num_records = session.get_function("tvm.gvsoc.perf.num_records")()
+    if num_records < 0:
+        raise RuntimeError("Performance counter records were dropped, increase PERF_MAX_RECORDS")
+    if num_records != len(func_names):
+        raise RuntimeError(f"Expected {len(func_names)} performance counter records but got {num_records}")
+
+    records = tvm.nd.empty((num_records, len(events)), "uint32", session.device)
+    session.get_function("tvm.gvsoc.perf.read")(records)
+
+    profile = collections.OrderedDict()
+    for func_name, record in zip(func_names, records.numpy()):
+        entry = profile.setdefault(func_name, {"calls": 0, **{event: 0 for event in events}})
+        entry["calls"] += 1
+        for event, value in zip(events, record):
+            entry[event] += int(value) / number
+
+    return collections.OrderedDict(sorted(profile.items(), key=lambda item: -item[1].get("cycles", 0)))
+
+
+def format_profile_table(profile, events=None):
+    """Format the result of profile_operators as a text table with one row per function.
+
+    `events` defaults to all recorded events. The share and IPC columns need the cycles and
+    instr events.
+    """
+    if events is None:
+        recorded = set().union(*profile.values()) if profile else set()
+        events = [event for event in PERF_COUNTER_EVENTS if event in recorded]
+    total_cycles = sum(entry.get("cycles", 0) for entry in profile.values()) or 1
+    name_width = max([len("function")] + [len(name) for name in profile])
+    header = f"{'function':<{name_width}} {'calls':>5} {'share':>6} {'ipc':>5} " + " ".join(
+        f"{event:>12}" for event in events
+    )
+    lines = [header, "-" * len(header)]
+    for name, entry in profile.items():
+        cycles = entry.get("cycles", 0)
+        ipc = entry.get("instr", 0) / cycles if cycles else 0.0
+        lines.append(
+            f"{name:<{name_width}} {entry['calls']:>5} {cycles / total_cycles:>6.1%} {ipc:>5.2f} "
+            + " ".join(f"{entry[event]:>12.0f}" for event in events)
+        )
+
+    return "\n".join(lines)
+
+
+def create_graph_executor(session, graph_json=""):
+    """Create the graph executor on the device, in a host_driven project.
+
+    With the default empty `graph_json` the executor loads the binary graph generate_project
+    compiled into the firmware, so neither is the graph JSON sent over the transport nor parsed
+    on the device. Projects generated with graph_binary=false need the graph JSON of the model.
+
+    Returns a `tvm.contrib.graph_executor.GraphModule` of the device executor.
+    """
+    device = session.device
+    fcreate = session.get_function("tvm.graph_executor.create")
+    return graph_executor.GraphModule(
+        fcreate(graph_json, session.get_system_lib(), device.device_type % RPC_SESS_MASK, device.device_id)
+    )
+
+
+def _graph_output_info(graph_json, index=0):
+    """Return the shape and dtype of output `index` of the graph."""
+    graph = json.loads(graph_json)
+    node_id, output_index = graph["heads"][index][:2]
+    entry_id = graph["node_row_ptr"][node_id] + output_index
+    return tuple(graph["attrs"]["shape"][1][entry_id]), graph["attrs"]["dltype"][1][entry_id]
+
+
+def run_batch(session, graph_mod, inputs, output_shape=None, output_dtype=None, graph_json=None):
+    """Run the executor once per input set, with a constant number of RPC round trips.
+
+    `graph_mod` is created with `create_graph_executor` and must already hold the parameters,
+    or with `tvm.micro.create_local_aot_executor` in aot_host_driven projects. `inputs` maps
+    input names (at most 7, limited by TVM_CRT_MAX_ARGS) to arrays whose first dimension K
+    indexes the input sets. The shape and dtype of output 0 are given by `output_shape` and
+    `output_dtype`, or read from the `graph_json` of the model. All inputs are uploaded in one
+    tensor, and all outputs and cycle counts are read back in one tensor, which need to fit
+    into the device memory at the same time.
+
+    Returns (outputs, cycles): output 0 of every run stacked along a new first dimension, and
+    the number of core cycles of every run as uint64 array of shape (K,).
+    """
+    if output_shape is None or output_dtype is None:
+        if graph_json is None:
+            raise ValueError("run_batch needs output_shape and output_dtype, or graph_json")
+        graph_output_shape, graph_output_dtype = _graph_output_info(graph_json)
+        output_shape = graph_output_shape if output_shape is None else output_shape
+        output_dtype = graph_output_dtype if output_dtype is None else output_dtype
+
+    inputs = {name: np.asarray(value) for name, value in inputs.items()}
+    batch_sizes = {len(value) for value in inputs.values()}
+    if len(batch_sizes) != 1:
+        raise ValueError(f"All inputs need the same number of input sets, got {sorted(batch_sizes)}")
+    batch_size = batch_sizes.pop()
+
+    # Every row holds one input set, or the cycles and output of one run, packed back to back.
+    input_rows = np.empty(batch_size, [(name, value.dtype, value.shape[1:]) for name, value in inputs.items()])
+    for name, value in inputs.items():
+        input_rows[name] = value
+    result_dtype = np.dtype([("cycles", "<u8"), ("output", output_dtype, tuple(output_shape))])
+
+    results = tvm.nd.empty((batch_size, result_dtype.itemsize), "uint8", session.device)
+    session.get_function("tvm.gvsoc.run_batch")(
+        graph_mod.module,
+        results,
+        tvm.nd.array(input_rows.view(np.uint8).reshape(batch_size, -1), session.device),
+        *inputs,
+    )
+
+    result_rows = results.numpy().view(result_dtype).reshape(batch_size)
+    return np.ascontiguousarray(result_rows["output"]), np.ascontiguousarray(result_rows["cycles"])
+
+
+def memory_stats(session, reset=False):
+    """Read the counters of the memory manager behind TVMPlatformMemoryAllocate.
+
+    Every host-driven project counts the allocations and frees, projects built with profiling
+    also the core cycles spent in them. With memory_allocator=buddy the firmware also reports
+    the occupancy of the arena, from which the fragmentation is derived:
+    `internal_fragmentation` is the share of the handed-out block bytes that was not requested,
+    `external_fragmentation` the share of the free bytes outside the largest free block. The
+    counters include the allocations of the read itself. With `reset` they restart afterwards.
+
+    Returns a dict with the MEMORY_STATS counters, the mean cycles per allocation and free,
+    and the fragmentation ratios (None without the buddy allocator).
+    """
+    values = tvm.nd.empty((len(MEMORY_STATS),), "uint64", session.device)
+    session.get_function("tvm.gvsoc.memory.stats")(values, int(reset))
+    stats = {name: int(value) for name, value in zip(MEMORY_STATS, values.numpy())}
+    stats["buddy_allocator"] = bool(stats["buddy_allocator"])
+
+    stats["mean_alloc_cycles"] = stats["alloc_cycles"] / stats["num_allocs"] if stats["num_allocs"] else 0.0
+    stats["mean_free_cycles"] = stats["free_cycles"] / stats["num_frees"] if stats["num_frees"] else 0.0
+    stats["internal_fragmentation"] = stats["external_fragmentation"] = None
+    if stats["buddy_allocator"]:
+        if stats["block_bytes_total"]:
+            stats["internal_fragmentation"] = 1 - stats["requested_bytes_total"] / stats["block_bytes_total"]
+        if stats["free_bytes"]:
+            stats["external_fragmentation"] = 1 - stats["largest_free_bytes"] / stats["free_bytes"]
+    return stats
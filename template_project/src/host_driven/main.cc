@@ -25,13 +25,34 @@
 #include <stdio.h>
 #include <stdbool.h>
 #include <string.h>
+#include <tvm/runtime/c_runtime_api.h>
 #include <tvm/runtime/crt/logging.h>
 #include <tvm/runtime/crt/microtvm_rpc_server.h>
 #include <tvm/runtime/crt/page_allocator.h>
+#ifdef EXECUTOR_AOT
+#include <tvm/runtime/crt/aot_executor_module.h>
+#else
 #include <tvm/runtime/crt/graph_executor_module.h>
+#endif
 #include <unistd.h>
+#ifdef MICROTVM_HOST
+#include <fcntl.h>
+#include <stdlib.h>
+#include <time.h>
+#endif
 
 #include "crt_config.h"
+// Generated by microtvm_api_server.py from model/metadata.json
+#include "memory_plan.h"
+#ifdef MEMORY_PLAN_BUDDY_ALLOCATOR
+#include <tvm/runtime/crt/buddy_allocator.h>
+#endif
+#ifndef EXECUTOR_AOT
+// Generated by microtvm_api_server.py from model/executor-config/graph/default.graph
+#include "graph_binary.h"
+// Generated by microtvm_api_server.py from model/parameters/default.params
+#include "embedded_params.h"
+#endif
 
 
 #define CSR_PULP_PCMR 0xCC1
@@ -58,6 +79,34 @@
   })
 
 
+#ifdef MICROTVM_HOST
+// Native build for the build machine (toolchain=host). The semihosting calls are replaced by
+// plain file descriptor I/O with the same return values, so the RPC loop below is unchanged.
+#ifdef GVSOC_PROFILING
+#error "the PULP performance counters are not available in the host build"
+#endif
+
+// Like semihosting SYS_READ, return the number of bytes which were NOT read.
+int semihost_read(int fd, uint8_t *buffer, int len)
+{
+    return len - (int)read(fd, buffer, len);
+}
+
+// Like semihosting SYS_WRITE, return the number of bytes which were NOT written.
+int semihost_write(int fd, uint8_t *buffer, int len)
+{
+    return len - (int)write(fd, buffer, len);
+}
+
+#define SEMIHOSTING_OPEN_RB O_RDONLY
+#define SEMIHOSTING_OPEN_WB O_WRONLY
+
+int semihost_open(const char *name, int mode)
+{
+    return open(name, mode);
+}
+
+#else
 enum semihosting_operation_numbers {
 	/*
 	 * ARM/openocd semihosting operations.
@@ -134,9 +183,35 @@ int semihost_write(int fd, uint8_t *buffer, int len)
     return __internal_semihost(SEMIHOSTING_SYS_WRITE, (long) args);
 }
 
+int semihost_open(const char *name, int mode)
+{
+    volatile uint32_t args[3] = {(uint32_t)name,(uint32_t)mode,(uint32_t)strlen(name)};
+    return __internal_semihost(SEMIHOSTING_SYS_OPEN, (long) args);
+}
+
+/* Semihosting SYS_OPEN modes, equivalent to fopen "rb" and "wb" */
+#define SEMIHOSTING_OPEN_RB 1
+#define SEMIHOSTING_OPEN_WB 5
+#endif  // MICROTVM_HOST
+
+#ifdef RPC_TRANSPORT_FIFO
+// RPC traffic goes through named pipes in the simulator's working directory, so it is kept
+// apart from the console output on stdout.
+// NOTE: keep in sync with RPC_FIFO_*_RELPATH in microtvm_api_server.py
+#define RPC_FIFO_HOST_TO_DEVICE "rpc_h2d.fifo"
+#define RPC_FIFO_DEVICE_TO_HOST "rpc_d2h.fifo"
+static int g_rpc_rx_fd = -1;
+static int g_rpc_tx_fd = -1;
+#else
+static const int g_rpc_rx_fd = STDIN_FILENO;
+static const int g_rpc_tx_fd = STDOUT_FILENO;
+#endif
+
 
+#ifndef MICROTVM_HOST
 /* Loops/exits simulation */
 void exit(int i);
+#endif
 
 
 static const struct device* tvm_uart;
@@ -147,13 +222,52 @@ static size_t g_num_bytes_written = 0;
 
 volatile uint32_t ticks = 0;
 
+// Staging buffer for data sent to the host. The framer emits many small fragments (escape
+// bytes, headers, CRC) per packet, which are coalesced here into a single semihosting trap.
+#define TX_BUFFER_SIZE_BYTES TVM_CRT_MAX_PACKET_SIZE_BYTES
+static uint8_t g_tx_buffer[TX_BUFFER_SIZE_BYTES];
+static size_t g_tx_buffer_used = 0;
+
+// Write data to the host, return the number of bytes written before the first failed write.
+size_t write_all_serial(const uint8_t* data, size_t size) {
+  size_t written = 0;
+  while (written < size) {
+    // Semihosting SYS_WRITE returns the number of bytes which were NOT written.
+    int bytes_written =
+        (size - written) - semihost_write(g_rpc_tx_fd, (uint8_t*)data + written, size - written);
+    if (bytes_written <= 0) {
+      break;
+    }
+    written += bytes_written;
+  }
+  g_num_bytes_written += written;
+  return written;
+}
+
+// Write all bytes in the staging buffer to the host, return false if some of them were lost.
+bool flush_serial() {
+  size_t size = g_tx_buffer_used;
+  g_tx_buffer_used = 0;
+  return write_all_serial(g_tx_buffer, size) == size;
+}
+
 // Called by TVM to write serial data to the UART.
 ssize_t write_serial(void* unused_context, const uint8_t* data, size_t size) {
+  if (size > TX_BUFFER_SIZE_BYTES - g_tx_buffer_used && !flush_serial()) {
+    // The framer fails the write on 0.
+    return 0;
+  }
+  if (size >= TX_BUFFER_SIZE_BYTES) {
+    // Too large to be staged, pass through directly. A short count makes the framer retry the
+    // rest, so only the accepted bytes are counted as requested.
+    size_t written = write_all_serial(data, size);
+    g_num_bytes_requested += written;
+    return written;
+  }
+  memcpy(&g_tx_buffer[g_tx_buffer_used], data, size);
+  g_tx_buffer_used += size;
   g_num_bytes_requested += size;
 
-  semihost_write(STDOUT_FILENO, (uint8_t*)data, size);
-  g_num_bytes_written += size;
-
   return size;
 }
 
@@ -166,6 +280,7 @@ size_t TVMPlatformFormatMessage(char* out_buf, size_t out_buf_size_bytes, const
 // Called by TVM when an internal invariant is violated, and execution cannot continue.
 void TVMPlatformAbort(tvm_crt_error_t error) {
   TVMLogf("TVMError: 0x%x", error);
+  flush_serial();
   // TODO
   exit(1);
 }
@@ -206,31 +321,307 @@ tvm_crt_error_t TVMPlatformMemoryFree(void* ptr, DLDevice dev) {
 }*/
 MemoryManagerInterface* memory_manager;
 
+uint64_t timer_read_cycles();
+
+// Counters of the memory manager, read with tvm.gvsoc.memory.stats. The cycle counters are only
+// filled in with GVSOC_PROFILING, as reading the timer twice per call would slow down every
+// allocation. The fragmentation counters are only filled in by the buddy allocator.
+// NOTE: keep in sync with MEMORY_STATS in microtvm_gvsoc.py
+enum {
+  kMemoryStatsBuddyAllocator,
+  kMemoryStatsNumAllocs,
+  kMemoryStatsNumFrees,
+  kMemoryStatsNumFailedAllocs,
+  kMemoryStatsAllocCycles,
+  kMemoryStatsFreeCycles,
+  kMemoryStatsMaxAllocCycles,
+  kMemoryStatsMaxFreeCycles,
+  kMemoryStatsPoolBytes,
+  kMemoryStatsAllocatedBytes,
+  kMemoryStatsPeakAllocatedBytes,
+  kMemoryStatsFreeBytes,
+  kMemoryStatsLargestFreeBytes,
+  kMemoryStatsRequestedBytesTotal,
+  kMemoryStatsBlockBytesTotal,
+  kMemoryStatsCount,
+};
+
+static uint64_t g_memory_stats[kMemoryStatsCount];
+
 tvm_crt_error_t TVMPlatformMemoryAllocate(size_t num_bytes, DLDevice dev, void** out_ptr) {
 #ifdef DBG
   TVMLogf("TVMPlatformMemoryAllocate %u\n", num_bytes);
 #endif
-  return memory_manager->Allocate(memory_manager, num_bytes, dev, out_ptr);
+#ifdef GVSOC_PROFILING
+  uint64_t start_cycles = timer_read_cycles();
+#endif
+  tvm_crt_error_t err = memory_manager->Allocate(memory_manager, num_bytes, dev, out_ptr);
+#ifdef GVSOC_PROFILING
+  uint64_t cycles = timer_read_cycles() - start_cycles;
+  g_memory_stats[kMemoryStatsAllocCycles] += cycles;
+  if (cycles > g_memory_stats[kMemoryStatsMaxAllocCycles]) {
+    g_memory_stats[kMemoryStatsMaxAllocCycles] = cycles;
+  }
+#endif
+  g_memory_stats[err == kTvmErrorNoError ? kMemoryStatsNumAllocs : kMemoryStatsNumFailedAllocs]++;
+  return err;
 }
 
 tvm_crt_error_t TVMPlatformMemoryFree(void* ptr, DLDevice dev) {
 #ifdef DBG
   TVMLogf("TVMPlatformMemoryFree\n");
 #endif
-  return memory_manager->Free(memory_manager, ptr, dev);
+#ifdef GVSOC_PROFILING
+  uint64_t start_cycles = timer_read_cycles();
+#endif
+  tvm_crt_error_t err = memory_manager->Free(memory_manager, ptr, dev);
+#ifdef GVSOC_PROFILING
+  uint64_t cycles = timer_read_cycles() - start_cycles;
+  g_memory_stats[kMemoryStatsFreeCycles] += cycles;
+  if (cycles > g_memory_stats[kMemoryStatsMaxFreeCycles]) {
+    g_memory_stats[kMemoryStatsMaxFreeCycles] = cycles;
+  }
+#endif
+  g_memory_stats[kMemoryStatsNumFrees]++;
+  return err;
+}
+
+// Copy the counters into a uint64 tensor of shape (kMemoryStatsCount,). With a nonzero second
+// argument, the counters are reset afterwards.
+int memory_stats(TVMValue* args, int* type_codes, int num_args, TVMValue* ret_val,
+                 int* ret_type_code, void* resource_handle) {
+  if (num_args != 2) {
+    TVMAPISetLastError("expected 2 arguments");
+    return kTvmErrorFunctionCallNumArguments;
+  }
+  if ((type_codes[0] != kTVMDLTensorHandle && type_codes[0] != kTVMNDArrayHandle) ||
+      type_codes[1] != kTVMArgInt) {
+    TVMAPISetLastError("expected a tensor and an integer argument");
+    return kTvmErrorFunctionCallWrongArgType;
+  }
+  DLTensor* out = (DLTensor*)args[0].v_handle;
+  if (out->ndim != 1 || out->shape[0] != kMemoryStatsCount || out->dtype.code != kDLUInt ||
+      out->dtype.bits != 64) {
+    TVMAPISetLastError("expected a uint64 tensor of shape (kMemoryStatsCount,)");
+    return kTvmErrorFunctionCallWrongArgType;
+  }
+#ifdef MEMORY_PLAN_BUDDY_ALLOCATOR
+  BuddyMemoryManagerStats stats;
+  BuddyMemoryManager_GetStats(memory_manager, &stats);
+  g_memory_stats[kMemoryStatsBuddyAllocator] = 1;
+  g_memory_stats[kMemoryStatsPoolBytes] = stats.pool_bytes;
+  g_memory_stats[kMemoryStatsAllocatedBytes] = stats.allocated_bytes;
+  g_memory_stats[kMemoryStatsPeakAllocatedBytes] = stats.peak_allocated_bytes;
+  g_memory_stats[kMemoryStatsFreeBytes] = stats.free_bytes;
+  g_memory_stats[kMemoryStatsLargestFreeBytes] = stats.largest_free_bytes;
+  g_memory_stats[kMemoryStatsRequestedBytesTotal] = stats.requested_bytes_total;
+  g_memory_stats[kMemoryStatsBlockBytesTotal] = stats.block_bytes_total;
+#endif
+  memcpy(out->data, g_memory_stats, sizeof(g_memory_stats));
+  if (args[1].v_int64 != 0) {
+    memset(g_memory_stats, 0, sizeof(g_memory_stats));
+#ifdef MEMORY_PLAN_BUDDY_ALLOCATOR
+    BuddyMemoryManager_ResetStats(memory_manager);
+#endif
+  }
+  ret_val[0].v_int64 = kMemoryStatsCount;
+  ret_type_code[0] = kTVMArgInt;
+  return kTvmErrorNoError;
+}
+
+
+// Core clock frequency, used to convert cycles into seconds.
+// NOTE: set from the core_freq_hz project option.
+#ifndef CORE_FREQ_HZ
+#define CORE_FREQ_HZ 100000000
+#endif
+
+#ifdef MICROTVM_HOST
+// Elapsed time is taken from the monotonic clock of the build machine in nanoseconds. Cycle
+// counts are reported for a core running at CORE_FREQ_HZ, so the host sees the same units as
+// from GVSoC.
+#define TIMER_TICK_HZ 1e9
+
+void timer_init() {}
+
+uint64_t timer_read_ticks() {
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return (uint64_t)ts.tv_sec * 1000000000 + ts.tv_nsec;
 }
 
+uint64_t timer_read_cycles() {
+  uint64_t ticks = timer_read_ticks();
+  return ticks / 1000000000 * CORE_FREQ_HZ + ticks % 1000000000 * CORE_FREQ_HZ / 1000000000;
+}
+#else
+// The cycle counter CSR is 32 bits wide and wraps after ~43 s at 100 MHz, and the core raises
+// no interrupt on its overflow that could extend it in software. Elapsed time is therefore
+// taken from the FC timer unit, whose two 32-bit counters are cascaded into one 64-bit counter.
+#ifndef FC_TIMER_BASE
+#define FC_TIMER_BASE 0x1B200400
+#endif
+#define FC_TIMER_CFG_LO (*(volatile uint32_t*)(FC_TIMER_BASE + 0x00))
+#define FC_TIMER_CNT_LO (*(volatile uint32_t*)(FC_TIMER_BASE + 0x08))
+#define FC_TIMER_CNT_HI (*(volatile uint32_t*)(FC_TIMER_BASE + 0x0C))
+#define FC_TIMER_CFG_ENABLE (1 << 0)
+#define FC_TIMER_CFG_RESET (1 << 1)
+#define FC_TIMER_CFG_CASCADE (1u << 31)
+#define FC_TIMER_CFG_PRESCALER_ENABLE (1 << 6)
+#define FC_TIMER_CFG_CLOCK_FLL (0 << 7)
+#define FC_TIMER_CFG_PRESCALER_SHIFT 8
+
+// The counter is incremented every FC_TIMER_PRESCALER + 1 cycles of the FLL clock, which also
+// clocks the core.
+#ifndef FC_TIMER_PRESCALER
+#define FC_TIMER_PRESCALER 0
+#endif
+#if FC_TIMER_PRESCALER > 255
+#error "FC_TIMER_PRESCALER is an 8-bit value"
+#endif
+#define TIMER_TICK_HZ ((double)CORE_FREQ_HZ / (FC_TIMER_PRESCALER + 1))
+
+void timer_init() {
+  // Count the FLL clock rather than the 32 kHz reference clock, the high counter is incremented
+  // on each wrap of the low counter.
+  uint32_t cfg =
+      FC_TIMER_CFG_ENABLE | FC_TIMER_CFG_RESET | FC_TIMER_CFG_CASCADE | FC_TIMER_CFG_CLOCK_FLL;
+  if (FC_TIMER_PRESCALER > 0) {
+    cfg |= FC_TIMER_CFG_PRESCALER_ENABLE |
+           ((uint32_t)FC_TIMER_PRESCALER << FC_TIMER_CFG_PRESCALER_SHIFT);
+  }
+  FC_TIMER_CFG_LO = cfg;
+}
+
+uint64_t timer_read_ticks() {
+  uint32_t hi, lo;
+  // Re-read if the low counter wrapped in between.
+  do {
+    hi = FC_TIMER_CNT_HI;
+    lo = FC_TIMER_CNT_LO;
+  } while (hi != FC_TIMER_CNT_HI);
+  return ((uint64_t)hi << 32) | lo;
+}
+
+uint64_t timer_read_cycles() { return timer_read_ticks() * (FC_TIMER_PRESCALER + 1); }
+#endif  // MICROTVM_HOST
 
-unsigned int g_utvm_start_time_micros;
+uint64_t g_utvm_start_ticks;
 int g_utvm_timer_running = 0;
 
+#ifdef GVSOC_PROFILING
+// Performance counter events of the PULP core. Event i is enabled by bit i of PCER and
+// counted in CSR_PULP_PCCR0 + i. Only the events in PERF_EVENT_MASK are enabled and recorded,
+// in the order of their bits.
+// NOTE: keep in sync with PERF_COUNTER_EVENTS in microtvm_gvsoc.py
+#ifndef PERF_EVENT_MASK
+#define PERF_EVENT_MASK 0xffff
+#endif
+#if PERF_EVENT_MASK == 0 || PERF_EVENT_MASK > 0xffff
+#error "PERF_EVENT_MASK selects 1 to 16 of the PULP performance counter events"
+#endif
+#define PERF_NUM_EVENTS __builtin_popcount(PERF_EVENT_MASK)
+
+// Number of timed intervals which are kept until the host reads them.
+#ifndef PERF_MAX_RECORDS
+#define PERF_MAX_RECORDS 256
+#endif
+
+static uint32_t g_perf_start[PERF_NUM_EVENTS];
+static uint32_t g_perf_records[PERF_MAX_RECORDS][PERF_NUM_EVENTS];
+static uint32_t g_perf_num_records = 0;
+static uint32_t g_perf_num_dropped = 0;
+
+// CSR numbers need to be immediates, so every counter is read explicitly. The mask is a
+// constant, the reads of disabled events are removed by the compiler.
+#define PERF_READ_COUNTER(event, csr)        \
+  if (PERF_EVENT_MASK & (1 << (event))) {    \
+    counters[num_read++] = csr_read(csr);    \
+  }
+
+static inline void perf_read_counters(uint32_t* counters) {
+  int num_read = 0;
+  PERF_READ_COUNTER(0, 0x780);
+  PERF_READ_COUNTER(1, 0x781);
+  PERF_READ_COUNTER(2, 0x782);
+  PERF_READ_COUNTER(3, 0x783);
+  PERF_READ_COUNTER(4, 0x784);
+  PERF_READ_COUNTER(5, 0x785);
+  PERF_READ_COUNTER(6, 0x786);
+  PERF_READ_COUNTER(7, 0x787);
+  PERF_READ_COUNTER(8, 0x788);
+  PERF_READ_COUNTER(9, 0x789);
+  PERF_READ_COUNTER(10, 0x78A);
+  PERF_READ_COUNTER(11, 0x78B);
+  PERF_READ_COUNTER(12, 0x78C);
+  PERF_READ_COUNTER(13, 0x78D);
+  PERF_READ_COUNTER(14, 0x78E);
+  PERF_READ_COUNTER(15, 0x78F);
+}
+
+// Return the PCER bits of the recorded events.
+int perf_event_mask(TVMValue* args, int* type_codes, int num_args, TVMValue* ret_val,
+                    int* ret_type_code, void* resource_handle) {
+  ret_val[0].v_int64 = PERF_EVENT_MASK;
+  ret_type_code[0] = kTVMArgInt;
+  return kTvmErrorNoError;
+}
+
+// Discard all recorded intervals.
+int perf_reset(TVMValue* args, int* type_codes, int num_args, TVMValue* ret_val,
+               int* ret_type_code, void* resource_handle) {
+  g_perf_num_records = 0;
+  g_perf_num_dropped = 0;
+  ret_val[0].v_int64 = 0;
+  ret_type_code[0] = kTVMArgInt;
+  return kTvmErrorNoError;
+}
+
+// Return the number of recorded intervals, or -1 if some were dropped because the record
+// buffer was full.
+int perf_num_records(TVMValue* args, int* type_codes, int num_args, TVMValue* ret_val,
+                     int* ret_type_code, void* resource_handle) {
+  ret_val[0].v_int64 = g_perf_num_dropped > 0 ? -1 : g_perf_num_records;
+  ret_type_code[0] = kTVMArgInt;
+  return kTvmErrorNoError;
+}
+
+// Copy the recorded counter deltas into a uint32 tensor of shape (num_records, PERF_NUM_EVENTS),
+// one row per TVMPlatformTimerStart/Stop pair.
+int perf_read(TVMValue* args, int* type_codes, int num_args, TVMValue* ret_val,
+              int* ret_type_code, void* resource_handle) {
+  if (num_args != 1) {
+    TVMAPISetLastError("expected 1 argument");
+    return kTvmErrorFunctionCallNumArguments;
+  }
+  if (type_codes[0] != kTVMDLTensorHandle && type_codes[0] != kTVMNDArrayHandle) {
+    TVMAPISetLastError("expected a tensor argument");
+    return kTvmErrorFunctionCallWrongArgType;
+  }
+  DLTensor* out = (DLTensor*)args[0].v_handle;
+  if (out->ndim != 2 || out->shape[1] != PERF_NUM_EVENTS || out->shape[0] > g_perf_num_records ||
+      out->dtype.code != kDLUInt || out->dtype.bits != 32) {
+    TVMAPISetLastError("expected a uint32 tensor of shape (<=num_records, num_events)");
+    return kTvmErrorFunctionCallWrongArgType;
+  }
+  memcpy(out->data, g_perf_records, out->shape[0] * sizeof(g_perf_records[0]));
+  ret_val[0].v_int64 = out->shape[0];
+  ret_type_code[0] = kTVMArgInt;
+  return kTvmErrorNoError;
+}
+#endif
+
 tvm_crt_error_t TVMPlatformTimerStart() {
   if (g_utvm_timer_running) {
     return kTvmErrorPlatformTimerBadState;
   }
   g_utvm_timer_running = 1;
-  csr_write(0xCC0, 0b11);
-  g_utvm_start_time_micros = csr_read(0x780);
+#ifdef GVSOC_PROFILING
+  csr_write(0xCC0, PERF_EVENT_MASK);
+  csr_write(0xCC1, 1);
+  perf_read_counters(g_perf_start);
+#endif
+  g_utvm_start_ticks = timer_read_ticks();
 
   return kTvmErrorNoError;
 }
@@ -239,22 +630,177 @@ tvm_crt_error_t TVMPlatformTimerStop(double* elapsed_time_seconds) {
   if (!g_utvm_timer_running) {
     return kTvmErrorPlatformTimerBadState;
   }
+  uint64_t stop_ticks = timer_read_ticks();
   g_utvm_timer_running = 0;
-  int g_utvm_stop_time = csr_read(0x780);
-  if (g_utvm_stop_time < g_utvm_start_time_micros) { // overflow
-    *elapsed_time_seconds = (((uint64_t)1 << 32) - (g_utvm_start_time_micros - g_utvm_stop_time)) / 100000000.0;
+#ifdef GVSOC_PROFILING
+  uint32_t perf_stop[PERF_NUM_EVENTS];
+  perf_read_counters(perf_stop);
+  if (g_perf_num_records < PERF_MAX_RECORDS) {
+    uint32_t* record = g_perf_records[g_perf_num_records++];
+    for (int i = 0; i < PERF_NUM_EVENTS; ++i) {
+      // Unsigned subtraction also covers counters which wrapped around once.
+      record[i] = perf_stop[i] - g_perf_start[i];
+    }
   } else {
-    *elapsed_time_seconds = (g_utvm_stop_time - g_utvm_start_time_micros) / 100000000.0;
+    g_perf_num_dropped++;
+  }
+#endif
+  *elapsed_time_seconds = (stop_ticks - g_utvm_start_ticks) / TIMER_TICK_HZ;
+  return kTvmErrorNoError;
+}
+
+static size_t tensor_size_bytes(const DLTensor* tensor) {
+  size_t size_bytes = (tensor->dtype.bits * tensor->dtype.lanes + 7) / 8;
+  for (int i = 0; i < tensor->ndim; ++i) {
+    size_bytes *= tensor->shape[i];
+  }
+  return size_bytes;
+}
+
+// Return row k of a compact uint8 tensor of shape (K, N).
+static uint8_t* batch_row(const DLTensor* batch, int64_t k) {
+  return (uint8_t*)batch->data + batch->byte_offset + k * batch->shape[1];
+}
+
+static bool is_batch_tensor(const DLTensor* batch) {
+  return batch->ndim == 2 && batch->dtype.code == kDLUInt && batch->dtype.bits == 8 &&
+         batch->dtype.lanes == 1;
+}
+
+// Run a graph or AOT executor back to back on K input sets. The host uploads all inputs in one
+// tensor and downloads all outputs and cycle counts in one tensor, so a batch costs the same
+// number of round trips as a single inference.
+//
+// Arguments: (executor module, results, inputs, input name[, input name]...)
+//  - results: uint8 tensor of shape (K, 8 + M), row k receives the cycles of run k as uint64
+//    followed by the M bytes of output 0.
+//  - inputs: uint8 tensor of shape (K, N), row k holds the named inputs of run k back to back.
+int run_batch(TVMValue* args, int* type_codes, int num_args, TVMValue* ret_val,
+              int* ret_type_code, void* resource_handle) {
+  ret_type_code[0] = kTVMNullptr;
+  if (num_args < 4) {
+    TVMAPISetLastError("expected (module, results, inputs, name[, name]...)");
+    return kTvmErrorFunctionCallNumArguments;
+  }
+  if (type_codes[0] != kTVMModuleHandle) {
+    TVMAPISetLastError("expected an executor module");
+    return kTvmErrorFunctionCallWrongArgType;
+  }
+  for (int i = 1; i < num_args; ++i) {
+    bool is_tensor = type_codes[i] == kTVMDLTensorHandle || type_codes[i] == kTVMNDArrayHandle;
+    if ((i < 3 && !is_tensor) || (i >= 3 && type_codes[i] != kTVMStr)) {
+      TVMAPISetLastError("expected (module, results, inputs, name[, name]...)");
+      return kTvmErrorFunctionCallWrongArgType;
+    }
+  }
+
+  // The AOT executor module has no set_input, inputs are copied into the tensors from get_input.
+  TVMFunctionHandle get_input, run, get_output;
+  int err;
+  if ((err = TVMModGetFunction(args[0].v_handle, "get_input", 0, &get_input)) != 0 ||
+      (err = TVMModGetFunction(args[0].v_handle, "run", 0, &run)) != 0 ||
+      (err = TVMModGetFunction(args[0].v_handle, "get_output", 0, &get_output)) != 0) {
+    return err;
+  }
+
+  DLTensor* results = (DLTensor*)args[1].v_handle;
+  DLTensor* inputs = (DLTensor*)args[2].v_handle;
+  if (!is_batch_tensor(results) || !is_batch_tensor(inputs) ||
+      results->shape[0] != inputs->shape[0] || results->shape[1] < (int64_t)sizeof(uint64_t)) {
+    TVMAPISetLastError("results and inputs must be uint8 tensors of shape (K, N)");
+    return kTvmErrorFunctionCallWrongArgType;
+  }
+  int64_t batch_size = results->shape[0];
+  size_t output_size_bytes = results->shape[1] - sizeof(uint64_t);
+  size_t inputs_size_bytes = inputs->shape[1];
+
+  for (int64_t k = 0; k < batch_size; ++k) {
+    TVMValue call_args[1];
+    int call_type_codes[1];
+    TVMValue call_ret;
+    int call_ret_type_code;
+    size_t offset = 0;
+    for (int i = 3; i < num_args; ++i) {
+      call_args[0].v_str = args[i].v_str;
+      call_type_codes[0] = kTVMStr;
+      if ((err = TVMFuncCall(get_input, call_args, call_type_codes, 1, &call_ret,
+                             &call_ret_type_code)) != 0) {
+        return err;
+      }
+      DLTensor* input = (DLTensor*)call_ret.v_handle;
+      size_t size_bytes = tensor_size_bytes(input);
+      if (offset + size_bytes > inputs_size_bytes) {
+        TVMArrayFree(input);
+        break;
+      }
+      memcpy((uint8_t*)input->data + input->byte_offset, batch_row(inputs, k) + offset,
+             size_bytes);
+      offset += size_bytes;
+      TVMArrayFree(input);
+    }
+    if (offset != inputs_size_bytes) {
+      TVMAPISetLastError("input rows must hold the named inputs back to back");
+      return kTvmErrorFunctionCallWrongArgType;
+    }
+
+    uint64_t start_cycles = timer_read_cycles();
+    if ((err = TVMFuncCall(run, NULL, NULL, 0, &call_ret, &call_ret_type_code)) != 0) {
+      return err;
+    }
+    uint64_t cycles = timer_read_cycles() - start_cycles;
+
+    call_args[0].v_int64 = 0;
+    call_type_codes[0] = kTVMArgInt;
+    if ((err = TVMFuncCall(get_output, call_args, call_type_codes, 1, &call_ret,
+                           &call_ret_type_code)) != 0) {
+      return err;
+    }
+    DLTensor* output = (DLTensor*)call_ret.v_handle;
+    if (tensor_size_bytes(output) != output_size_bytes) {
+      TVMArrayFree(output);
+      TVMAPISetLastError("result rows must hold the cycles and output 0");
+      return kTvmErrorFunctionCallWrongArgType;
+    }
+    // Rows are packed, the cycles of row k > 0 are not necessarily aligned.
+    memcpy(batch_row(results, k), &cycles, sizeof(cycles));
+    memcpy(batch_row(results, k) + sizeof(cycles), (uint8_t*)output->data + output->byte_offset,
+           output_size_bytes);
+    // Drop the reference taken by get_output, like the host does when freeing the result.
+    TVMArrayFree(output);
   }
+
   return kTvmErrorNoError;
 }
 
-uint8_t memory[MEMORY_SIZE_BYTES];
+// Section of the memory arena. The default .bss collects it unless generate_project placed it
+// into L1 with the memory_placement.ld fragment.
+#define MEMORY_ARENA_SECTION ".bss.tvm_arena"
+
+uint8_t memory[MEMORY_SIZE_BYTES] __attribute__((section(MEMORY_ARENA_SECTION)));
+
+// Receive buffer for data read from the host, large enough to hold one complete RPC packet.
+static uint8_t g_rx_buffer[TVM_CRT_MAX_PACKET_SIZE_BYTES];
 
 int main(void) {
 
+  timer_init();
+
+#ifdef RPC_TRANSPORT_FIFO
+  g_rpc_rx_fd = semihost_open(RPC_FIFO_HOST_TO_DEVICE, SEMIHOSTING_OPEN_RB);
+  g_rpc_tx_fd = semihost_open(RPC_FIFO_DEVICE_TO_HOST, SEMIHOSTING_OPEN_WB);
+  if (g_rpc_rx_fd < 0 || g_rpc_tx_fd < 0) {
+    fprintf(stderr, "error opening RPC fifos\n");
+    return 3;
+  }
+#endif
+
+#ifdef MEMORY_PLAN_BUDDY_ALLOCATOR
   int status =
-      PageMemoryManagerCreate(&memory_manager, memory, sizeof(memory), 8 /* page_size_log2 */);
+      BuddyMemoryManagerCreate(&memory_manager, memory, sizeof(memory), TVM_CRT_PAGE_BITS);
+#else
+  int status =
+      PageMemoryManagerCreate(&memory_manager, memory, sizeof(memory), TVM_CRT_PAGE_BITS);
+#endif
   if (status != 0) {
     fprintf(stderr, "error initiailizing memory manager\n");
     return 2;
@@ -262,32 +808,63 @@ int main(void) {
 
   // Initialize microTVM RPC server, which will receive commands from the UART and execute them.
   microtvm_rpc_server_t server = MicroTVMRpcServerInit(write_serial, NULL);
+#ifdef EXECUTOR_AOT
+  CHECK_EQ(TVMAotExecutorModule_Register(), kTvmErrorNoError,
+           "failed to register AotExecutor TVMModule");
+#else
   CHECK_EQ(TVMGraphExecutorModule_Register(), kTvmErrorNoError,
            "failed to register GraphExecutor TVMModule");
+#if GRAPH_BINARY_SIZE_BYTES > 0
+  // "tvm.graph_executor.create" called with an empty graph JSON loads this graph instead.
+  TVMGraphExecutorModule_SetBinaryGraph(graph_binary, GRAPH_BINARY_SIZE_BYTES);
+#endif
+#if EMBEDDED_PARAMS_COUNT > 0
+  // Bound in place by the graph executor, set_input is not needed for them.
+  TVMGraphExecutor_SetEmbeddedParams(embedded_params, EMBEDDED_PARAMS_COUNT);
+#endif
+#endif
+  CHECK_EQ(TVMFuncRegisterGlobal("tvm.gvsoc.run_batch", (TVMFunctionHandle)&run_batch, 0),
+           kTvmErrorNoError, "failed to register tvm.gvsoc.run_batch");
+  CHECK_EQ(TVMFuncRegisterGlobal("tvm.gvsoc.memory.stats", (TVMFunctionHandle)&memory_stats, 0),
+           kTvmErrorNoError, "failed to register tvm.gvsoc.memory.stats");
+#ifdef GVSOC_PROFILING
+  CHECK_EQ(TVMFuncRegisterGlobal("tvm.gvsoc.perf.reset", (TVMFunctionHandle)&perf_reset, 0),
+           kTvmErrorNoError, "failed to register tvm.gvsoc.perf.reset");
+  CHECK_EQ(TVMFuncRegisterGlobal("tvm.gvsoc.perf.num_records", (TVMFunctionHandle)&perf_num_records, 0),
+           kTvmErrorNoError, "failed to register tvm.gvsoc.perf.num_records");
+  CHECK_EQ(TVMFuncRegisterGlobal("tvm.gvsoc.perf.read", (TVMFunctionHandle)&perf_read, 0),
+           kTvmErrorNoError, "failed to register tvm.gvsoc.perf.read");
+  CHECK_EQ(TVMFuncRegisterGlobal("tvm.gvsoc.perf.event_mask", (TVMFunctionHandle)&perf_event_mask, 0),
+           kTvmErrorNoError, "failed to register tvm.gvsoc.perf.event_mask");
+#endif
   TVMLogf("microTVM GVSoC runtime - running");
 
   // The main application loop. We continuously read commands from the UART
   // and dispatch them to MicroTVMRpcServerLoop().
   while (true) {
+    // Send any pending responses before blocking on the next read.
+    flush_serial();
 
-    uint8_t c;
-    int ret_code = 1 - semihost_read(STDIN_FILENO, &c, 1);
-    if (ret_code < 0) {
+    // Semihosting SYS_READ returns the number of bytes which were NOT read, so a single trap
+    // fetches everything the host pipe has ready, up to the size of the receive buffer.
+    int bytes_read = sizeof(g_rx_buffer) - semihost_read(g_rpc_rx_fd, g_rx_buffer, sizeof(g_rx_buffer));
+    if (bytes_read < 0) {
       // perror("microTVM runtime: read failed");
       return 1;
-    } else if (ret_code == 0) {
+    } else if (bytes_read == 0) {
       return 2;
     }
-    uint8_t* cursor = &c;
-    size_t bytes_remaining = 1;
+    size_t bytes_remaining = bytes_read;
 
-    uint8_t* arr_ptr = &c;
+    uint8_t* arr_ptr = g_rx_buffer;
     while (bytes_remaining > 0) {
       // Pass the received bytes to the RPC server.
       tvm_crt_error_t err = MicroTVMRpcServerLoop(server, &arr_ptr, &bytes_remaining);
       if (err != kTvmErrorNoError && err != kTvmErrorFramingShortPacket) {
         TVMPlatformAbort(err);
       }
+      // All packets produced by the last call are complete, send them in one go.
+      flush_serial();
       if (g_num_bytes_written != 0 || g_num_bytes_requested != 0) {
         if (g_num_bytes_written != g_num_bytes_requested) {
           TVMPlatformAbort((tvm_crt_error_t)0xbeef5);
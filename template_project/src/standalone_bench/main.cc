@@ -0,0 +1,252 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*
+ *
+ * SPDX-License-Identifier: Apache-2.0
+ */
+
+// Standalone benchmark firmware: runs the model BENCH_WARMUP times and then BENCH_ITERATIONS
+// times under the cycle counter, and prints the min, median and p99 cycles of the timed runs.
+// The inputs are embedded in the generated aot_model_io.h, there is no RPC server.
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <stdint.h>
+#include <stdarg.h>
+#include <string.h>
+#include <tvm/runtime/crt/page_allocator.h>
+#include <tvm/runtime/crt/platform.h>
+#include <tvm/runtime/crt/stack_allocator.h>
+
+#include "crt_config.h"
+extern "C" {
+#include "tvmgen_default.h"
+}
+// Generated by microtvm_api_server.py from model/metadata.json
+#include "aot_model_io.h"
+#include "memory_plan.h"
+#include "bench_config.h"
+#ifdef MEMORY_PLAN_BUDDY_ALLOCATOR
+#include <tvm/runtime/crt/buddy_allocator.h>
+#endif
+
+// Core clock frequency, used to convert cycles into seconds.
+// NOTE: set from the core_freq_hz project option.
+#ifndef CORE_FREQ_HZ
+#define CORE_FREQ_HZ 100000000
+#endif
+
+// NOTE: keep in sync with src/host_driven/main.cc and src/aot_standalone/main.cc
+#ifndef FC_TIMER_BASE
+#define FC_TIMER_BASE 0x1B200400
+#endif
+#define FC_TIMER_CFG_LO (*(volatile uint32_t*)(FC_TIMER_BASE + 0x00))
+#define FC_TIMER_CNT_LO (*(volatile uint32_t*)(FC_TIMER_BASE + 0x08))
+#define FC_TIMER_CNT_HI (*(volatile uint32_t*)(FC_TIMER_BASE + 0x0C))
+#define FC_TIMER_CFG_ENABLE (1 << 0)
+#define FC_TIMER_CFG_RESET (1 << 1)
+#define FC_TIMER_CFG_CASCADE (1u << 31)
+#define FC_TIMER_CFG_PRESCALER_ENABLE (1 << 6)
+#define FC_TIMER_CFG_CLOCK_FLL (0 << 7)
+#define FC_TIMER_CFG_PRESCALER_SHIFT 8
+
+// The counter is incremented every FC_TIMER_PRESCALER + 1 cycles of the FLL clock, which also
+// clocks the core.
+#ifndef FC_TIMER_PRESCALER
+#define FC_TIMER_PRESCALER 0
+#endif
+#if FC_TIMER_PRESCALER > 255
+#error "FC_TIMER_PRESCALER is an 8-bit value"
+#endif
+#define TIMER_TICK_HZ ((double)CORE_FREQ_HZ / (FC_TIMER_PRESCALER + 1))
+
+void timer_init() {
+  // Count the FLL clock rather than the 32 kHz reference clock, the high counter is incremented
+  // on each wrap of the low counter.
+  uint32_t cfg =
+      FC_TIMER_CFG_ENABLE | FC_TIMER_CFG_RESET | FC_TIMER_CFG_CASCADE | FC_TIMER_CFG_CLOCK_FLL;
+  if (FC_TIMER_PRESCALER > 0) {
+    cfg |= FC_TIMER_CFG_PRESCALER_ENABLE |
+           ((uint32_t)FC_TIMER_PRESCALER << FC_TIMER_CFG_PRESCALER_SHIFT);
+  }
+  FC_TIMER_CFG_LO = cfg;
+}
+
+uint64_t timer_read_ticks() {
+  uint32_t hi, lo;
+  // Re-read if the low counter wrapped in between.
+  do {
+    hi = FC_TIMER_CNT_HI;
+    lo = FC_TIMER_CNT_LO;
+  } while (hi != FC_TIMER_CNT_HI);
+  return ((uint64_t)hi << 32) | lo;
+}
+
+uint64_t timer_read_cycles() { return timer_read_ticks() * (FC_TIMER_PRESCALER + 1); }
+
+// printf of the PULP libc has no 64-bit integer conversions.
+const char* format_u64(char* buf, size_t size, uint64_t value) {
+  char* cursor = buf + size - 1;
+  *cursor = '\0';
+  do {
+    *--cursor = '0' + value % 10;
+    value /= 10;
+  } while (value != 0 && cursor > buf);
+  return cursor;
+}
+
+// Called by TVM when a message needs to be formatted.
+size_t TVMPlatformFormatMessage(char* out_buf, size_t out_buf_size_bytes, const char* fmt,
+                                va_list args) {
+  return vsnprintf(out_buf, out_buf_size_bytes, fmt, args);
+}
+
+// Used by the CRT (e.g. the page allocator) to report errors, there is no RPC log channel.
+void TVMLogf(const char* format, ...) {
+  va_list args;
+  va_start(args, format);
+  vprintf(format, args);
+  va_end(args);
+}
+
+// Called by TVM when an internal invariant is violated, and execution cannot continue.
+void TVMPlatformAbort(tvm_crt_error_t error) {
+  printf("TVMError: 0x%x\n", error);
+  exit(1);
+}
+
+// Section of the memory arena. The default .bss collects it unless generate_project placed it
+// into L1 with the memory_placement.ld fragment.
+#define MEMORY_ARENA_SECTION ".bss.tvm_arena"
+
+// Workspace allocations of the generated operators (TVMBackendAllocWorkspace).
+#ifdef MEMORY_PLAN_STACK_ALLOCATOR
+// The AOT code frees its workspaces in reverse order of allocation, so a stack sized from
+// metadata.json serves every allocation in O(1) without any bookkeeping.
+tvm_workspace_t g_workspace;
+uint8_t memory[MEMORY_PLAN_ARENA_BYTES]
+    __attribute__((section(MEMORY_ARENA_SECTION), aligned(TVM_RUNTIME_ALLOC_ALIGNMENT_BYTES)));
+
+int memory_init() { return StackMemoryManager_Init(&g_workspace, memory, sizeof(memory)); }
+
+tvm_crt_error_t TVMPlatformMemoryAllocate(size_t num_bytes, DLDevice dev, void** out_ptr) {
+  return StackMemoryManager_Allocate(&g_workspace, num_bytes, out_ptr);
+}
+
+tvm_crt_error_t TVMPlatformMemoryFree(void* ptr, DLDevice dev) {
+  return StackMemoryManager_Free(&g_workspace, ptr);
+}
+#else
+MemoryManagerInterface* memory_manager;
+uint8_t memory[MEMORY_SIZE_BYTES] __attribute__((section(MEMORY_ARENA_SECTION)));
+
+int memory_init() {
+#ifdef MEMORY_PLAN_BUDDY_ALLOCATOR
+  return BuddyMemoryManagerCreate(&memory_manager, memory, sizeof(memory), TVM_CRT_PAGE_BITS);
+#else
+  return PageMemoryManagerCreate(&memory_manager, memory, sizeof(memory), TVM_CRT_PAGE_BITS);
+#endif
+}
+
+tvm_crt_error_t TVMPlatformMemoryAllocate(size_t num_bytes, DLDevice dev, void** out_ptr) {
+  return memory_manager->Allocate(memory_manager, num_bytes, dev, out_ptr);
+}
+
+tvm_crt_error_t TVMPlatformMemoryFree(void* ptr, DLDevice dev) {
+  return memory_manager->Free(memory_manager, ptr, dev);
+}
+#endif  // MEMORY_PLAN_STACK_ALLOCATOR
+
+uint64_t g_utvm_start_ticks;
+int g_utvm_timer_running = 0;
+
+tvm_crt_error_t TVMPlatformTimerStart() {
+  if (g_utvm_timer_running) {
+    return kTvmErrorPlatformTimerBadState;
+  }
+  g_utvm_timer_running = 1;
+  g_utvm_start_ticks = timer_read_ticks();
+  return kTvmErrorNoError;
+}
+
+tvm_crt_error_t TVMPlatformTimerStop(double* elapsed_time_seconds) {
+  if (!g_utvm_timer_running) {
+    return kTvmErrorPlatformTimerBadState;
+  }
+  g_utvm_timer_running = 0;
+  *elapsed_time_seconds = (timer_read_ticks() - g_utvm_start_ticks) / TIMER_TICK_HZ;
+  return kTvmErrorNoError;
+}
+
+uint64_t g_bench_cycles[BENCH_ITERATIONS];
+
+int compare_u64(const void* a, const void* b) {
+  uint64_t x = *(const uint64_t*)a;
+  uint64_t y = *(const uint64_t*)b;
+  return (x > y) - (x < y);
+}
+
+// Nearest-rank percentile of the sorted cycle counts.
+uint64_t percentile(const uint64_t* sorted, size_t count, unsigned int percent) {
+  size_t rank = (count * percent + 99) / 100;
+  return sorted[rank > 0 ? rank - 1 : 0];
+}
+
+int main(void) {
+  char buf[24];
+  timer_init();
+
+  uint64_t start_cycles = timer_read_cycles();
+  int status = memory_init();
+  if (status != 0) {
+    printf("error initiailizing memory manager\n");
+    return 2;
+  }
+  struct tvmgen_default_inputs inputs;
+  struct tvmgen_default_outputs outputs;
+  aot_model_io_bind(&inputs, &outputs);
+  printf("init cycles: %s\n", format_u64(buf, sizeof(buf), timer_read_cycles() - start_cycles));
+
+  for (int i = 0; i < BENCH_WARMUP + BENCH_ITERATIONS; i++) {
+    start_cycles = timer_read_cycles();
+    status = tvmgen_default_run(&inputs, &outputs);
+    uint64_t run_cycles = timer_read_cycles() - start_cycles;
+    if (status != 0) {
+      printf("tvmgen_default_run failed: %d\n", status);
+      return 1;
+    }
+    if (i >= BENCH_WARMUP) {
+      g_bench_cycles[i - BENCH_WARMUP] = run_cycles;
+    }
+  }
+
+  qsort(g_bench_cycles, BENCH_ITERATIONS, sizeof(g_bench_cycles[0]), compare_u64);
+  printf("warmup: %d\n", BENCH_WARMUP);
+  printf("iterations: %d\n", BENCH_ITERATIONS);
+  printf("min cycles: %s\n", format_u64(buf, sizeof(buf), g_bench_cycles[0]));
+  printf("median cycles: %s\n",
+         format_u64(buf, sizeof(buf), percentile(g_bench_cycles, BENCH_ITERATIONS, 50)));
+  printf("p99 cycles: %s\n",
+         format_u64(buf, sizeof(buf), percentile(g_bench_cycles, BENCH_ITERATIONS, 99)));
+  printf("max cycles: %s\n", format_u64(buf, sizeof(buf), g_bench_cycles[BENCH_ITERATIONS - 1]));
+
+  printf("microTVM GVSoC standalone benchmark - done\n");
+  return 0;
+}
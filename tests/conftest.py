@@ -0,0 +1,69 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import importlib.util
+import os
+import pathlib
+import shlex
+import shutil
+import subprocess
+
+import pytest
+
+TESTS_DIR = pathlib.Path(__file__).resolve().parent
+TEMPLATE_PROJECT_DIR = TESTS_DIR.parent / "template_project"
+CRT_DIR = TEMPLATE_PROJECT_DIR / "crt"
+
+
+@pytest.fixture(scope="session")
+def api_server():
+    """The template microtvm_api_server.py, skipping the test if TVM is not installed."""
+    pytest.importorskip("yaml")
+    pytest.importorskip("tvm.micro.project_api.server")
+    spec = importlib.util.spec_from_file_location(
+        "microtvm_api_server", TEMPLATE_PROJECT_DIR / "microtvm_api_server.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def build_crt_test(tmp_path):
+    """Compile a C test of tests/crt with template CRT sources (relative to template_project/crt)
+    using the host C compiler, skipping the test if there is none. Returns the executable path.
+    """
+    cc = shlex.split(os.environ.get("CC", "")) or [shutil.which("cc")]
+    if cc[0] is None:
+        pytest.skip("No host C compiler")
+
+    def build(test_source, *crt_sources):
+        executable = tmp_path / pathlib.Path(test_source).stem
+        cmd = cc + [
+            "-O2",
+            "-Wall",
+            f"-I{CRT_DIR / 'include'}",
+            f"-I{TEMPLATE_PROJECT_DIR / 'crt_config'}",
+            "-o",
+            str(executable),
+            str(TESTS_DIR / "crt" / test_source),
+            *[str(CRT_DIR / source) for source in crt_sources],
+        ]
+        subprocess.check_call(cmd)
+        return executable
+
+    return build
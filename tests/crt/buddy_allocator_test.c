@@ -0,0 +1,200 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * \file buddy_allocator_test.c
+ * \brief Checks how the buddy allocator splits and merges blocks, run by test_buddy_allocator.py.
+ */
+
+#include <stdarg.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <tvm/runtime/crt/buddy_allocator.h>
+
+#define MIN_BLOCK_BYTES_LOG2 8
+#define MIN_BLOCK_BYTES (1 << MIN_BLOCK_BYTES_LOG2)
+#define NUM_BLOCKS 16
+#define POOL_BYTES (NUM_BLOCKS * MIN_BLOCK_BYTES)
+
+#define EXPECT(cond)                                                      \
+  do {                                                                    \
+    if (!(cond)) {                                                        \
+      fprintf(stderr, "%s:%d: expected %s\n", __FILE__, __LINE__, #cond); \
+      exit(1);                                                            \
+    }                                                                     \
+  } while (0)
+
+void TVMLogf(const char* fmt, ...) {
+  va_list args;
+  va_start(args, fmt);
+  vfprintf(stderr, fmt, args);
+  va_end(args);
+}
+
+void __attribute__((noreturn)) TVMPlatformAbort(tvm_crt_error_t error_code) {
+  fprintf(stderr, "TVMPlatformAbort: 0x%08x\n", error_code);
+  exit(2);
+}
+
+static uint8_t memory_pool[64 * 1024] __attribute__((aligned(16)));
+static const DLDevice kDevice = {kDLCPU, 0};
+
+/*! \brief Create an allocator whose pool has exactly NUM_BLOCKS minimum blocks. */
+static MemoryManagerInterface* CreateManager(void) {
+  MemoryManagerInterface* manager;
+  BuddyMemoryManagerStats stats;
+  for (size_t size = 0; size <= sizeof(memory_pool); size++) {
+    if (BuddyMemoryManagerCreate(&manager, memory_pool, size, MIN_BLOCK_BYTES_LOG2) ==
+        kTvmErrorNoError) {
+      BuddyMemoryManager_GetStats(manager, &stats);
+      if (stats.pool_bytes == POOL_BYTES) {
+        return manager;
+      }
+    }
+  }
+  EXPECT(!"no pool size with NUM_BLOCKS blocks");
+  return NULL;
+}
+
+static BuddyMemoryManagerStats GetStats(MemoryManagerInterface* manager) {
+  BuddyMemoryManagerStats stats;
+  BuddyMemoryManager_GetStats(manager, &stats);
+  return stats;
+}
+
+static void* Allocate(MemoryManagerInterface* manager, size_t num_bytes) {
+  void* ptr;
+  EXPECT(manager->Allocate(manager, num_bytes, kDevice, &ptr) == kTvmErrorNoError);
+  EXPECT((uintptr_t)ptr % 16 == 0);
+  return ptr;
+}
+
+static void Free(MemoryManagerInterface* manager, void* ptr) {
+  EXPECT(manager->Free(manager, ptr, kDevice) == kTvmErrorNoError);
+}
+
+static void TestSplitAndMerge(void) {
+  MemoryManagerInterface* manager = CreateManager();
+  EXPECT(GetStats(manager).largest_free_bytes == POOL_BYTES);
+
+  // Splitting the pool for a minimum block leaves one free block of every smaller order.
+  uint8_t* a = Allocate(manager, 1);
+  BuddyMemoryManagerStats stats = GetStats(manager);
+  EXPECT(stats.allocated_bytes == MIN_BLOCK_BYTES);
+  EXPECT(stats.free_bytes == POOL_BYTES - MIN_BLOCK_BYTES);
+  EXPECT(stats.largest_free_bytes == POOL_BYTES / 2);
+
+  // The next minimum block is the buddy of the first, the next larger block follows them.
+  uint8_t* b = Allocate(manager, MIN_BLOCK_BYTES);
+  EXPECT(b == a + MIN_BLOCK_BYTES);
+  uint8_t* c = Allocate(manager, MIN_BLOCK_BYTES + 1);
+  EXPECT(c == a + 2 * MIN_BLOCK_BYTES);
+  EXPECT(GetStats(manager).largest_free_bytes == POOL_BYTES / 2);
+
+  // A free block does not merge while its buddy is allocated.
+  Free(manager, a);
+  EXPECT(GetStats(manager).largest_free_bytes == POOL_BYTES / 2);
+  EXPECT(Allocate(manager, 1) == a);
+  Free(manager, a);
+  Free(manager, b);
+  EXPECT(GetStats(manager).largest_free_bytes == POOL_BYTES / 2);
+  EXPECT(Allocate(manager, 2 * MIN_BLOCK_BYTES) == a);
+  Free(manager, a);
+
+  // Freeing the last block merges all the way up to the whole pool.
+  Free(manager, c);
+  stats = GetStats(manager);
+  EXPECT(stats.allocated_bytes == 0);
+  EXPECT(stats.free_bytes == POOL_BYTES);
+  EXPECT(stats.largest_free_bytes == POOL_BYTES);
+  EXPECT(manager->vleak_size == 0);
+
+  // The whole pool is one block again.
+  void* ptr;
+  EXPECT(manager->Allocate(manager, POOL_BYTES + 1, kDevice, &ptr) == kTvmErrorPlatformNoMemory);
+  EXPECT(Allocate(manager, POOL_BYTES) == a);
+  EXPECT(manager->Allocate(manager, 1, kDevice, &ptr) == kTvmErrorPlatformNoMemory);
+  EXPECT(ptr == NULL);
+  Free(manager, a);
+  EXPECT(GetStats(manager).largest_free_bytes == POOL_BYTES);
+}
+
+static void TestStats(void) {
+  MemoryManagerInterface* manager = CreateManager();
+  void* a = Allocate(manager, 100);
+  void* b = Allocate(manager, 3 * MIN_BLOCK_BYTES);
+  BuddyMemoryManagerStats stats = GetStats(manager);
+  EXPECT(stats.requested_bytes_total == 100 + 3 * MIN_BLOCK_BYTES);
+  EXPECT(stats.block_bytes_total == MIN_BLOCK_BYTES + 4 * MIN_BLOCK_BYTES);
+  EXPECT(stats.peak_allocated_bytes == stats.block_bytes_total);
+  Free(manager, b);
+  BuddyMemoryManager_ResetStats(manager);
+  stats = GetStats(manager);
+  EXPECT(stats.peak_allocated_bytes == MIN_BLOCK_BYTES);
+  EXPECT(stats.requested_bytes_total == 0 && stats.block_bytes_total == 0);
+  Free(manager, a);
+}
+
+/*! \brief Allocate and free random sizes, checking that blocks do not overlap. */
+static void TestRandomMerge(void) {
+  MemoryManagerInterface* manager;
+  EXPECT(BuddyMemoryManagerCreate(&manager, memory_pool + 1, sizeof(memory_pool) - 1,
+                                  MIN_BLOCK_BYTES_LOG2) == kTvmErrorNoError);
+  BuddyMemoryManagerStats initial = GetStats(manager);
+
+  enum { kNumSlots = 64 };
+  uint8_t* ptrs[kNumSlots] = {NULL};
+  size_t sizes[kNumSlots];
+  srand(1);
+  for (int iteration = 0; iteration < 20000; iteration++) {
+    int slot = rand() % kNumSlots;
+    if (ptrs[slot] != NULL) {
+      for (size_t i = 0; i < sizes[slot]; i++) {
+        EXPECT(ptrs[slot][i] == (uint8_t)slot);
+      }
+      Free(manager, ptrs[slot]);
+      ptrs[slot] = NULL;
+    } else {
+      sizes[slot] = rand() % (rand() % 4 ? 300 : 4000);
+      if (manager->Allocate(manager, sizes[slot], kDevice, (void**)&ptrs[slot]) ==
+          kTvmErrorNoError) {
+        memset(ptrs[slot], slot, sizes[slot]);
+      }
+    }
+  }
+  for (int slot = 0; slot < kNumSlots; slot++) {
+    if (ptrs[slot] != NULL) {
+      Free(manager, ptrs[slot]);
+    }
+  }
+
+  BuddyMemoryManagerStats stats = GetStats(manager);
+  EXPECT(stats.allocated_bytes == 0);
+  EXPECT(stats.largest_free_bytes == initial.largest_free_bytes);
+  EXPECT(manager->vleak_size == 0);
+}
+
+int main(void) {
+  TestSplitAndMerge();
+  TestStats();
+  TestRandomMerge();
+  printf("ok\n");
+  return 0;
+}
@@ -0,0 +1,77 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+
+/*!
+ * \file crcccitt_test.c
+ * \brief Checks that the block-wise CRC-CCITT of the RPC framer agrees with the byte-wise one,
+ * run by test_crcccitt.py. Prints the CRCs of TEST_DATA_BYTES bytes of test data (byte i is
+ * i * 31 + 7) for each start value, for comparison with a reference implementation.
+ */
+
+#include <checksum.h>
+#include <stdio.h>
+#include <stdlib.h>
+
+#define TEST_DATA_BYTES 1000
+
+static const uint16_t kStartValues[] = {CRC_START_XMODEM, CRC_START_CCITT_FFFF,
+                                        CRC_START_CCITT_1D0F, 0x1234};
+
+static uint16_t ByteWise(uint16_t crc, const unsigned char* data, size_t num_bytes) {
+  for (size_t i = 0; i < num_bytes; i++) {
+    crc = update_crc_ccitt(crc, data[i]);
+  }
+  return crc;
+}
+
+int main(void) {
+  // Room for every misalignment of the block loop.
+  static unsigned char data[TEST_DATA_BYTES + 8];
+  for (size_t i = 0; i < sizeof(data); i++) {
+    data[i] = (unsigned char)(i * 31 + 7);
+  }
+
+  int failures = 0;
+  for (size_t start = 0; start < sizeof(kStartValues) / sizeof(kStartValues[0]); start++) {
+    uint16_t crc = kStartValues[start];
+    for (size_t offset = 0; offset < 8; offset++) {
+      // Every length up to 64 bytes, then sparser.
+      for (size_t num_bytes = 0; num_bytes <= TEST_DATA_BYTES;
+           num_bytes += num_bytes < 64 ? 1 : 37) {
+        uint16_t expected = ByteWise(crc, data + offset, num_bytes);
+        uint16_t actual = update_crc_ccitt_block(crc, data + offset, num_bytes);
+        if (actual != expected) {
+          fprintf(stderr,
+                  "start 0x%04x offset %zu bytes %zu: block-wise 0x%04x, byte-wise 0x%04x\n", crc,
+                  offset, num_bytes, actual, expected);
+          failures++;
+        }
+      }
+    }
+    // A CRC continued over two blocks equals the CRC over both.
+    uint16_t split = update_crc_ccitt_block(update_crc_ccitt_block(crc, data, 333), data + 333,
+                                            TEST_DATA_BYTES - 333);
+    if (split != update_crc_ccitt_block(crc, data, TEST_DATA_BYTES)) {
+      fprintf(stderr, "start 0x%04x: CRC continued over two blocks differs\n", crc);
+      failures++;
+    }
+    printf("0x%04x 0x%04x\n", crc, update_crc_ccitt_block(crc, data, TEST_DATA_BYTES));
+  }
+  return failures != 0;
+}
@@ -0,0 +1,33 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+
+def test_acquire_up_to_max_jobs(api_server, tmp_path):
+    job_server = api_server.BuildJobServer(4, tmp_path)
+    assert job_server.acquire(3) == 3
+    job_server.release()
+
+
+def test_concurrent_builds_share_slots(api_server, tmp_path):
+    first = api_server.BuildJobServer(4, tmp_path)
+    second = api_server.BuildJobServer(4, tmp_path)
+    assert first.acquire(3) == 3
+    assert second.acquire(3) == 1
+    second.release()
+    first.release()
+    assert second.acquire(3) == 3
+    second.release()
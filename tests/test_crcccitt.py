@@ -0,0 +1,37 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import binascii
+import subprocess
+
+# NOTE: keep in sync with TEST_DATA_BYTES in crt/crcccitt_test.c
+TEST_DATA_BYTES = 1000
+
+
+def test_block_wise_crc(build_crt_test):
+    executable = build_crt_test(
+        "crcccitt_test.c", "src/runtime/crt/microtvm_rpc_common/crcccitt.c"
+    )
+    result = subprocess.run([executable], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+    # binascii.crc_hqx is the CRC-CCITT (XMODEM) continued from a start value.
+    data = bytes((i * 31 + 7) % 256 for i in range(TEST_DATA_BYTES))
+    crcs = [[int(value, 16) for value in line.split()] for line in result.stdout.splitlines()]
+    assert len(crcs) == 4
+    for start, crc in crcs:
+        assert crc == binascii.crc_hqx(data, start), f"start 0x{start:04x}"
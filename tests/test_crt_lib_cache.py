@@ -0,0 +1,154 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import shutil
+
+import pytest
+
+
+def make_project(path):
+    """A generated project holding the inputs of the CRT library compilation."""
+    files = {
+        "CMakeLists.txt": "project(gvsoc)\n",
+        "crt_config/crt_config.h": "#define TVM_CRT_MAX_NDIM 6\n",
+        "crt/include/tvm/runtime/crt/crt.h": "void TVMInitializeRuntime(void);\n",
+        "crt/src/runtime/crt/common/crt_runtime_api.c": "int x;\n",
+        "cmake/toolchain.cmake": "set(CMAKE_SYSTEM_NAME Generic)\n",
+        # Project content which is not compiled into the CRT libraries.
+        "src/main.cc": "int main(void) { return 0; }\n",
+        "model/codegen/host/src/default_lib0.c": "int y;\n",
+    }
+    for relpath, content in files.items():
+        (path / relpath).parent.mkdir(parents=True, exist_ok=True)
+        (path / relpath).write_text(content)
+    return path
+
+
+def make_freertos(api_server, path):
+    headers = ("target/pulp/include/pulp.h", "template/hello_world/FreeRTOSConfig.h")
+    for src in api_server.Handler.GVSOC_PLATFORM_SRCS + headers:
+        (path / src).parent.mkdir(parents=True, exist_ok=True)
+        (path / src).write_text(f"// {src}\n")
+    return path
+
+
+def make_compiler(path, version):
+    """A compiler which only prints its version."""
+    path.write_text(f"#!/bin/sh\necho {version}\n")
+    path.chmod(0o755)
+    return path
+
+
+@pytest.fixture
+def options(api_server, tmp_path):
+    return {
+        "toolchain": "gcc",
+        "arch": "rv32imc",
+        "abi": "ilp32",
+        "pulp_freertos_path": str(make_freertos(api_server, tmp_path / "freertos")),
+        "pulp_gcc_path": str(tmp_path / "gcc"),
+        "pulp_llvm_path": str(tmp_path / "llvm"),
+    }
+
+
+@pytest.fixture
+def cache_key(api_server, monkeypatch, options):
+    """Compute the CRT library cache key of the project in a directory."""
+
+    def compute(project_dir, options=options):
+        monkeypatch.setattr(api_server, "API_SERVER_DIR", project_dir)
+        return api_server.Handler()._crt_lib_cache_key(options)
+
+    return compute
+
+
+def test_key_is_stable(cache_key, options, tmp_path):
+    project_dir = make_project(tmp_path / "project")
+    key = cache_key(project_dir)
+    assert key == cache_key(project_dir)
+
+    # The key only depends on the content, not on the project location or file times.
+    other_dir = tmp_path / "other_project"
+    shutil.copytree(project_dir, other_dir)
+    for path in other_dir.rglob("*"):
+        os.utime(path, (0, 0))
+    assert cache_key(other_dir) == key
+
+    # project_link_mode=symlink links in the CRT.
+    linked_dir = make_project(tmp_path / "linked_project")
+    shutil.rmtree(linked_dir / "crt")
+    (linked_dir / "crt").symlink_to(project_dir / "crt")
+    assert cache_key(linked_dir) == key
+
+    # Neither the model nor the firmware sources are compiled into the CRT libraries.
+    (other_dir / "src" / "main.cc").write_text("int main(void) { return 1; }\n")
+    (other_dir / "model" / "codegen" / "host" / "src" / "default_lib0.c").write_text("int z;\n")
+    assert cache_key(other_dir) == key
+    assert cache_key(project_dir, dict(options, verbose=True)) == key
+
+
+@pytest.mark.parametrize(
+    "relpath", ["CMakeLists.txt", "crt_config/crt_config.h", "crt/src/runtime/crt/common/new.c"]
+)
+def test_key_changes_with_inputs(cache_key, tmp_path, relpath):
+    project_dir = make_project(tmp_path / "project")
+    key = cache_key(project_dir)
+    (project_dir / relpath).write_text("// changed\n")
+    assert cache_key(project_dir) != key
+
+
+def test_key_changes_with_renamed_input(cache_key, tmp_path):
+    project_dir = make_project(tmp_path / "project")
+    key = cache_key(project_dir)
+    cmake_dir = project_dir / "cmake"
+    (cmake_dir / "toolchain.cmake").rename(cmake_dir / "other.cmake")
+    assert cache_key(project_dir) != key
+
+
+def test_key_changes_with_options(api_server, cache_key, options, tmp_path):
+    project_dir = make_project(tmp_path / "project")
+    freertos_dir = tmp_path / "freertos"
+    key = cache_key(project_dir, options)
+    for name in api_server.Handler.CRT_LIB_CACHE_OPTIONS:
+        assert cache_key(project_dir, dict(options, **{name: "changed"})) != key
+
+    # The platform sources of PULP FreeRTOS are compiled with the CRT.
+    (freertos_dir / api_server.Handler.GVSOC_PLATFORM_SRCS[0]).write_text("// changed\n")
+    assert cache_key(project_dir, options) != key
+
+
+@pytest.mark.parametrize(
+    "relpath", ["target/pulp/include/pulp.h", "template/hello_world/FreeRTOSConfig.h"]
+)
+def test_key_changes_with_pulp_headers(cache_key, tmp_path, relpath):
+    project_dir = make_project(tmp_path / "project")
+    key = cache_key(project_dir)
+    (tmp_path / "freertos" / relpath).write_text("#define CONFIG_CHANGED 1\n")
+    assert cache_key(project_dir) != key
+
+
+def test_key_changes_with_compiler(cache_key, tmp_path):
+    project_dir = make_project(tmp_path / "project")
+    (tmp_path / "gcc" / "bin").mkdir(parents=True)
+    compiler = make_compiler(tmp_path / "gcc" / "bin" / "riscv32-unknown-elf-gcc", "gcc 1.0")
+    key = cache_key(project_dir)
+    assert cache_key(project_dir) == key
+
+    # Another version installed under the same path.
+    make_compiler(compiler, "gcc 2.0")
+    assert cache_key(project_dir) != key
@@ -0,0 +1,131 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import struct
+
+import numpy as np
+import pytest
+
+# dtype codes of DLDataType.
+DLDATATYPE_CODES = {"i": 0, "u": 1, "f": 2, "b": 1}
+
+
+def save_params(path, params):
+    """Write a dict of numpy arrays in the format of tvm.runtime.save_param_dict."""
+    data = bytearray(struct.pack("<QQQ", 0xF7E58D4F05049CB7, 0, len(params)))
+    for name in params:
+        data += struct.pack("<Q", len(name)) + name.encode()
+    data += struct.pack("<Q", len(params))
+    for array in params.values():
+        # magic, reserved, DLDevice (kDLCPU, 0) and ndim
+        data += struct.pack("<QQiii", 0xDD5E40F096B4A13F, 0, 1, 0, array.ndim)
+        data += struct.pack("<BBH", DLDATATYPE_CODES[array.dtype.kind], 8 * array.itemsize, 1)
+        data += struct.pack(f"<{array.ndim}q", *array.shape)
+        data += struct.pack("<q", array.nbytes) + array.tobytes()
+    path.write_bytes(bytes(data))
+
+
+def make_graph(dltypes, shapes, storage_ids):
+    """A graph JSON whose every entry is an input node named p<index>, except for the first one
+    which is named "input".
+    """
+    names = ["input"] + [f"p{index}" for index in range(len(dltypes) - 1)]
+    return {
+        "nodes": [{"op": "null", "name": name, "inputs": []} for name in names],
+        "arg_nodes": list(range(len(names))),
+        "heads": [[0, 0, 0]],
+        "node_row_ptr": list(range(len(names) + 1)),
+        "attrs": {
+            "dltype": ["list_str", dltypes],
+            "storage_id": ["list_int", storage_ids],
+            "shape": ["list_shape", shapes],
+        },
+    }
+
+
+def test_read_params(api_server, tmp_path):
+    params = {
+        "p0": np.arange(12, dtype="float32").reshape(3, 4),
+        "p1": np.array([-1, 2], dtype="int8"),
+        "p2": np.zeros((), dtype="uint16"),
+    }
+    save_params(tmp_path / "default.params", params)
+    read = api_server.read_params(tmp_path / "default.params")
+    assert list(read) == list(params)
+    for name, array in params.items():
+        assert read[name] == array.tobytes()
+
+
+def test_read_params_saved_by_tvm(api_server, tmp_path):
+    tvm_runtime = pytest.importorskip("tvm.runtime")
+    params = {"p0": np.arange(12, dtype="float32").reshape(3, 4), "p1": np.ones(2, dtype="int8")}
+    (tmp_path / "default.params").write_bytes(
+        tvm_runtime.save_param_dict(
+            {name: tvm_runtime.ndarray.array(array) for name, array in params.items()}
+        )
+    )
+    read = api_server.read_params(tmp_path / "default.params")
+    assert read == {name: array.tobytes() for name, array in params.items()}
+
+
+def test_read_params_invalid(api_server, tmp_path):
+    (tmp_path / "default.params").write_bytes(struct.pack("<QQQ", 0, 0, 0))
+    with pytest.raises(ValueError, match="not a TVM parameter file"):
+        api_server.read_params(tmp_path / "default.params")
+
+    save_params(tmp_path / "default.params", {"p0": np.ones(4, dtype="float32")})
+    data = bytearray((tmp_path / "default.params").read_bytes())
+    # Corrupt the magic of the array, it follows the name of the parameter.
+    struct.pack_into("<Q", data, 24 + 8 + 2 + 8, 0)
+    (tmp_path / "default.params").write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="not a serialized NDArray"):
+        api_server.read_params(tmp_path / "default.params")
+
+
+def test_assign_params_storage(api_server):
+    graph = make_graph(
+        ["float32", "float32", "int8", "bool", "float32x4"],
+        [[1, 8], [4, 8], [3], [5], [2]],
+        [0, 4, 1, 3, 2],
+    )
+    params = {
+        "p0": b"\1" * 4 * 4 * 8,
+        "p1": b"\2" * 3,
+        # bool has no bit width and takes a byte per element.
+        "p2": b"\3" * 5,
+        "p3": b"\4" * 4 * 4 * 2,
+    }
+    assert api_server.assign_params_storage(graph, params) == [
+        (1, "p1", params["p1"]),
+        (2, "p3", params["p3"]),
+        (3, "p2", params["p2"]),
+        (4, "p0", params["p0"]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "params, storage_ids, message",
+    [
+        ({"p9": b"\0" * 4}, [0, 1], "not an input of the graph"),
+        ({"p0": b"\0" * 8}, [0, 1], "has 8 bytes but its graph input 4"),
+        ({"p0": b"\0" * 4}, [1, 1], "shares storage 1"),
+    ],
+)
+def test_assign_params_storage_invalid(api_server, params, storage_ids, message):
+    graph = make_graph(["float32", "float32"], [[1], [1]], storage_ids)
+    with pytest.raises(ValueError, match=message):
+        api_server.assign_params_storage(graph, params)
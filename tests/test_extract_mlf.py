@@ -0,0 +1,79 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import io
+import tarfile
+
+import pytest
+
+
+def write_tar(path, members, mode="w"):
+    """Write a tarball of (name, data) files, data None adds a symlink to /etc/passwd."""
+    with tarfile.open(path, mode) as tf:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            if data is None:
+                info.type = tarfile.SYMTYPE
+                info.linkname = "/etc/passwd"
+                tf.addfile(info)
+            else:
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+
+@pytest.mark.parametrize("mode", ["w", "w:gz"])
+def test_extract_matching_members(api_server, tmp_path, mode):
+    write_tar(
+        tmp_path / "model.tar",
+        [
+            ("./metadata.json", b"{}"),
+            ("./codegen/host/src/default_lib0.c", b"lib0"),
+            ("./codegen/host/src/link", None),
+            ("./src/relay.txt", b"relay"),
+            ("./parameters/default.params", b"params"),
+        ],
+        mode,
+    )
+    extract_path = tmp_path / "model"
+    api_server.extract_mlf_members(
+        tmp_path / "model.tar", extract_path, api_server.MODEL_LIBRARY_FORMAT_BUILD_MEMBERS
+    )
+    extracted = sorted(
+        str(path.relative_to(extract_path)) for path in extract_path.rglob("*") if path.is_file()
+    )
+    assert extracted == ["codegen/host/src/default_lib0.c", "metadata.json"]
+    assert (extract_path / "codegen/host/src/default_lib0.c").read_bytes() == b"lib0"
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "codegen/host/src/../../../../escaped.c",
+        "../codegen/host/src/escaped.c",
+        "/codegen/host/src/escaped.c",
+        # Rejected even though it does not match any of the prefixes.
+        "../escaped.c",
+    ],
+)
+def test_reject_members_outside_of_archive(api_server, tmp_path, name):
+    write_tar(tmp_path / "model.tar", [("metadata.json", b"{}"), (name, b"escaped")])
+    extract_path = tmp_path / "project" / "model"
+    with pytest.raises(RuntimeError, match="outside of the archive"):
+        api_server.extract_mlf_members(
+            tmp_path / "model.tar", extract_path, api_server.MODEL_LIBRARY_FORMAT_BUILD_MEMBERS
+        )
+    assert not list(tmp_path.rglob("escaped.c"))
@@ -0,0 +1,180 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import struct
+
+import pytest
+
+# A graph JSON of dense(input, p0) followed by relu, as written by the graph executor codegen.
+GRAPH = {
+    "nodes": [
+        {"op": "null", "name": "input", "inputs": []},
+        {"op": "null", "name": "p0", "inputs": []},
+        {
+            "op": "tvm_op",
+            "name": "tvmgen_default_fused_nn_dense",
+            "attrs": {
+                "func_name": "tvmgen_default_fused_nn_dense",
+                "num_inputs": "2",
+                "num_outputs": "1",
+                "flatten_data": "0",
+            },
+            "inputs": [[0, 0, 0], [1, 0, 0]],
+        },
+        {
+            "op": "tvm_op",
+            "name": "tvmgen_default_fused_nn_relu",
+            "attrs": {
+                "func_name": "tvmgen_default_fused_nn_relu",
+                "num_inputs": "1",
+                "num_outputs": "1",
+                "flatten_data": "0",
+            },
+            "inputs": [[2, 0, 0]],
+        },
+    ],
+    "arg_nodes": [0, 1],
+    "heads": [[3, 0, 0]],
+    "node_row_ptr": [0, 1, 2, 3, 4],
+    "attrs": {
+        "dltype": ["list_str", ["float32", "float32", "float32", "float32"]],
+        "device_index": ["list_int", [1, 1, 1, 1]],
+        "storage_id": ["list_int", [0, 1, 2, 3]],
+        "shape": ["list_shape", [[1, 8], [4, 8], [1, 4], [1, 4]]],
+    },
+}
+
+# Fields of TVMGraphBinaryHeader in
+# template_project/crt/include/tvm/runtime/crt/internal/graph_executor/graph_executor.h
+HEADER_FIELDS = (
+    "magic",
+    "version",
+    "max_ndim",
+    "max_strlen_dltype",
+    "nodes_count",
+    "node_inputs_count",
+    "input_nodes_count",
+    "node_row_ptr_count",
+    "outputs_count",
+    "entries_count",
+    "device_index_count",
+    "nodes_offset",
+    "node_inputs_offset",
+    "input_nodes_offset",
+    "node_row_ptr_offset",
+    "outputs_offset",
+    "storage_id_offset",
+    "device_index_offset",
+    "dltype_offset",
+    "shape_offset",
+    "ndim_offset",
+    "strings_offset",
+    "strings_size",
+    "size",
+)
+
+
+def unpack_header(api_server, binary):
+    words = struct.unpack_from(f"<{api_server.GRAPH_BINARY_HEADER_WORDS}I", binary)
+    return dict(zip(HEADER_FIELDS, words))
+
+
+def read_words(binary, offset, count, fmt="I"):
+    return list(struct.unpack_from(f"<{count}{fmt}", binary, offset))
+
+
+def read_string(binary, header, offset):
+    start = header["strings_offset"] + offset
+    return binary[start : binary.index(b"\0", start)].decode()
+
+
+def test_header(api_server):
+    assert len(HEADER_FIELDS) == api_server.GRAPH_BINARY_HEADER_WORDS
+    binary = api_server.pack_graph_binary(GRAPH)
+    header = unpack_header(api_server, binary)
+    assert header["magic"] == api_server.GRAPH_BINARY_MAGIC
+    assert header["version"] == api_server.GRAPH_BINARY_VERSION
+    assert header["max_ndim"] == api_server.GRAPH_BINARY_MAX_NDIM
+    assert header["max_strlen_dltype"] == api_server.GRAPH_BINARY_MAX_STRLEN_DLTYPE
+    assert header["nodes_count"] == 4
+    assert header["node_inputs_count"] == 3
+    assert header["input_nodes_count"] == 2
+    assert header["node_row_ptr_count"] == 5
+    assert header["outputs_count"] == 1
+    assert header["entries_count"] == 4
+    assert header["device_index_count"] == 4
+    assert header["size"] == len(binary)
+    offsets = [value for name, value in header.items() if name.endswith("_offset")]
+    assert offsets == sorted(offsets)
+    assert all(offset % 8 == 0 for offset in offsets)
+    assert header["strings_offset"] + header["strings_size"] == len(binary)
+
+
+def test_nodes(api_server):
+    binary = api_server.pack_graph_binary(GRAPH)
+    header = unpack_header(api_server, binary)
+    nodes = read_words(binary, header["nodes_offset"], 8 * header["nodes_count"])
+    dense = nodes[16:24]
+    assert read_string(binary, header, dense[0]) == "tvm_op"
+    assert read_string(binary, header, dense[1]) == "tvmgen_default_fused_nn_dense"
+    # The name and the function name of an operator share their string.
+    assert dense[2] == dense[1]
+    # num_inputs, num_outputs, flatten_data, first input and number of inputs.
+    assert dense[3:] == [2, 1, 0, 0, 2]
+    relu = nodes[24:32]
+    assert relu[6:] == [2, 1]
+    # Nodes without attrs have an empty function name.
+    assert read_string(binary, header, nodes[2]) == ""
+    assert read_words(binary, header["node_inputs_offset"], 9) == [0, 0, 0, 1, 0, 0, 2, 0, 0]
+    assert read_words(binary, header["input_nodes_offset"], 2) == [0, 1]
+    assert read_words(binary, header["node_row_ptr_offset"], 5) == [0, 1, 2, 3, 4]
+    assert read_words(binary, header["outputs_offset"], 3) == [3, 0, 0]
+
+
+def test_entries(api_server):
+    binary = api_server.pack_graph_binary(GRAPH)
+    header = unpack_header(api_server, binary)
+    max_ndim = api_server.GRAPH_BINARY_MAX_NDIM
+    max_strlen = api_server.GRAPH_BINARY_MAX_STRLEN_DLTYPE
+    assert read_words(binary, header["storage_id_offset"], 4) == [0, 1, 2, 3]
+    assert read_words(binary, header["device_index_offset"], 4) == [1, 1, 1, 1]
+    dltypes = binary[header["dltype_offset"] : header["dltype_offset"] + 4 * max_strlen]
+    assert dltypes == b"float32".ljust(max_strlen, b"\0") * 4
+    shapes = read_words(binary, header["shape_offset"], 4 * max_ndim, "q")
+    assert shapes[:max_ndim] == [1, 8] + [0] * (max_ndim - 2)
+    assert shapes[max_ndim : 2 * max_ndim] == [4, 8] + [0] * (max_ndim - 2)
+    assert read_words(binary, header["ndim_offset"], 4) == [2, 2, 2, 2]
+
+
+def test_without_device_index(api_server):
+    graph = dict(GRAPH, attrs={k: v for k, v in GRAPH["attrs"].items() if k != "device_index"})
+    header = unpack_header(api_server, api_server.pack_graph_binary(graph))
+    assert header["device_index_count"] == 0
+
+
+@pytest.mark.parametrize(
+    "attr, value, message",
+    [
+        ("shape", [[1, 8], [4, 8], [1, 4], [1] * 7], "TVM_CRT_MAX_NDIM"),
+        ("dltype", ["float32", "float32", "float32", "custom[int]32"], "TVM_CRT_MAX_STRLEN_DLTYPE"),
+        ("storage_id", [0, 1, 2], "differ in length"),
+    ],
+)
+def test_invalid_graph(api_server, attr, value, message):
+    graph = dict(GRAPH, attrs=dict(GRAPH["attrs"], **{attr: [GRAPH["attrs"][attr][0], value]}))
+    with pytest.raises(ValueError, match=message):
+        api_server.pack_graph_binary(graph)
@@ -0,0 +1,102 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+
+@pytest.fixture
+def options(api_server, tmp_path):
+    """Build options with a PULP FreeRTOS tree holding just the platform sources."""
+    freertos = tmp_path / "freertos"
+    for src in api_server.Handler.GVSOC_PLATFORM_SRCS:
+        (freertos / src).parent.mkdir(parents=True, exist_ok=True)
+        (freertos / src).write_text(f"// {src}\n")
+    return {
+        "toolchain": "gcc",
+        "arch": "rv32imc",
+        "abi": "ilp32",
+        "pulp_freertos_path": str(freertos),
+        "pulp_gcc_path": str(tmp_path / "gcc"),
+        "pulp_llvm_path": str(tmp_path / "llvm"),
+    }
+
+
+@pytest.fixture
+def project(api_server, tmp_path, monkeypatch):
+    """A generated project whose CMake configure, build and cache population are recorded
+    instead of run. Returns the list of recorded steps.
+    """
+    project_dir = tmp_path / "project"
+    (project_dir / "crt_config").mkdir(parents=True)
+    (project_dir / "CMakeLists.txt").write_text("project(gvsoc)\n")
+    (project_dir / "crt_config" / "crt_config.h").write_text("#define TVM_CRT_MAX_NDIM 6\n")
+    build_dir = project_dir / "build"
+    monkeypatch.setattr(api_server, "API_SERVER_DIR", project_dir)
+    monkeypatch.setattr(api_server, "BUILD_DIR", build_dir)
+    cmake_cache = api_server.CMakeCache(build_dir / "CMakeCache.txt")
+    monkeypatch.setattr(api_server, "CMAKE_CACHE", cmake_cache)
+    steps = []
+
+    def configure(args, cwd, **kwargs):
+        """Write the -D and -G arguments of cmake into CMakeCache.txt like CMake does."""
+        assert args[0] == "cmake"
+        steps.append("configure")
+        lines = []
+        if "-G" in args:
+            lines.append(f"CMAKE_GENERATOR:INTERNAL={args[args.index('-G') + 1]}")
+        for arg in args:
+            if arg.startswith("-D"):
+                name, value = arg[2:].split("=", 1)
+                lines.append(f"{name}={value}" if ":" in name else f"{name}:STRING={value}")
+        (cwd / "CMakeCache.txt").write_text("\n".join(lines) + "\n")
+
+    def run_build(self, options, targets=()):
+        steps.append(("compile",) + tuple(targets))
+
+    def populate_crt_lib_cache(self, cache_entry_dir):
+        steps.append("populate")
+        cache_entry_dir.mkdir(parents=True)
+
+    monkeypatch.setattr(api_server, "check_call", configure)
+    monkeypatch.setattr(api_server.Handler, "_run_build", run_build)
+    monkeypatch.setattr(api_server.Handler, "_populate_crt_lib_cache", populate_crt_lib_cache)
+    return steps
+
+
+def build(api_server, options):
+    api_server.Handler().build(options)
+
+
+def test_second_build_does_not_reconfigure(api_server, project, options):
+    options = dict(options, incremental_build=True)
+    build(api_server, options)
+    build(api_server, options)
+    assert project == ["configure", ("compile",), ("compile", "app")]
+
+
+def test_populated_crt_lib_cache_keeps_build_dir(api_server, project, options, tmp_path):
+    """The cache entry populated by the first build does not invalidate its build dir."""
+    options = dict(options, incremental_build=True, crt_lib_cache_dir=str(tmp_path / "cache"))
+    build(api_server, options)
+    build(api_server, options)
+    assert project == ["configure", ("compile",), "populate", ("compile", "app")]
+
+
+def test_changed_options_reconfigure(api_server, project, options):
+    build(api_server, dict(options, incremental_build=True))
+    build(api_server, dict(options, incremental_build=True, debug=True))
+    assert project == ["configure", ("compile",), "configure", ("compile",)]
@@ -0,0 +1,63 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+
+import pytest
+
+
+@pytest.fixture
+def src_dir(tmp_path):
+    src_dir = tmp_path / "src"
+    (src_dir / "sub").mkdir(parents=True)
+    (src_dir / "a.c").write_text("int a;\n")
+    (src_dir / "sub" / "b.h").write_text("#define B 1\n")
+    return src_dir
+
+
+@pytest.mark.parametrize("link_mode", ["copy", "hardlink", "reflink"])
+def test_populate_dir(api_server, src_dir, tmp_path, link_mode):
+    dst_dir = tmp_path / "dst"
+    api_server.populate_item(src_dir, dst_dir, link_mode)
+    assert not dst_dir.is_symlink()
+    assert (dst_dir / "a.c").read_text() == "int a;\n"
+    assert (dst_dir / "sub" / "b.h").read_text() == "#define B 1\n"
+    shares_inode = os.path.samefile(src_dir / "a.c", dst_dir / "a.c")
+    assert shares_inode == (link_mode == "hardlink")
+
+
+def test_populate_file(api_server, src_dir, tmp_path):
+    api_server.populate_item(src_dir / "a.c", tmp_path / "a.c", "hardlink")
+    assert os.path.samefile(src_dir / "a.c", tmp_path / "a.c")
+
+
+def test_populate_symlink(api_server, src_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    api_server.populate_item("src", tmp_path / "dst", "symlink")
+    # The link is absolute, so it stays valid wherever the project is used from.
+    assert os.readlink(tmp_path / "dst") == str(src_dir)
+    assert (tmp_path / "dst" / "sub" / "b.h").read_text() == "#define B 1\n"
+
+
+def test_hardlink_falls_back_to_copy(api_server, src_dir, tmp_path, monkeypatch):
+    def link(src, dst):
+        raise OSError("Invalid cross-device link")
+
+    monkeypatch.setattr(api_server.os, "link", link)
+    api_server.populate_item(src_dir / "a.c", tmp_path / "a.c", "hardlink")
+    assert (tmp_path / "a.c").read_text() == "int a;\n"
+    assert not os.path.samefile(src_dir / "a.c", tmp_path / "a.c")
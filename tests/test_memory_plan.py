@@ -0,0 +1,194 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+
+def make_metadata(constants_size_bytes=100, operator_workspaces=((32,), (16, 20), (0,))):
+    """A metadata.json of the Model Library Format with one input, one output and operators
+    whose workspaces have the given sizes.
+    """
+    return {
+        "modules": {
+            "default": {
+                "memory": {
+                    "functions": {
+                        "main": [
+                            {
+                                "constants_size_bytes": constants_size_bytes,
+                                "device": 1,
+                                "inputs": {"input": {"dtype": "float32", "size": 4}},
+                                "io_size_bytes": 8,
+                                "outputs": {"output": {"dtype": "float32", "size": 4}},
+                                "workspace_size_bytes": 160,
+                            }
+                        ],
+                        "operator_functions": [
+                            {
+                                "function_name": f"tvmgen_default_fused_{index}",
+                                "workspace": [
+                                    {"device": 1, "workspace_size_bytes": size} for size in sizes
+                                ],
+                            }
+                            for index, sizes in enumerate(operator_workspaces)
+                        ],
+                    }
+                }
+            }
+        }
+    }
+
+
+def test_compute_memory_plan(api_server):
+    plan = api_server.compute_memory_plan(make_metadata())
+    assert plan == {
+        "workspace_bytes": 160,
+        "io_bytes": 8,
+        "constants_bytes": 100,
+        "num_io": 2,
+        "io_tensor_bytes": [4, 4],
+        "num_operators": 3,
+        # The second operator allocates 16 and 20 bytes, each padded to 16 bytes.
+        "max_operator_workspace_bytes": 48,
+        "max_operator_workspaces": [16, 20],
+        # The main workspace, the largest operator workspace and a padding per operator and
+        # for the main workspace.
+        "stack_arena_bytes": 160 + 48 + 4 * 16,
+    }
+
+
+def test_compute_memory_plan_without_modules(api_server):
+    """metadata.json of older TVM versions has the memory at the top level."""
+    metadata = make_metadata()["modules"]["default"]
+    assert api_server.compute_memory_plan(metadata) == api_server.compute_memory_plan(
+        make_metadata()
+    )
+
+
+def test_estimate_page_arena_bytes(api_server):
+    plan = api_server.compute_memory_plan(make_metadata())
+    page_bytes = api_server.PAGE_ALLOCATOR_PAGE_BYTES
+
+    standalone_bytes = api_server.estimate_page_arena_bytes(plan, "aot_standalone")
+    aot_bytes = api_server.estimate_page_arena_bytes(plan, "aot_host_driven")
+    graph_bytes = api_server.estimate_page_arena_bytes(plan, "host_driven", num_graph_nodes=5)
+    embedded_bytes = api_server.estimate_page_arena_bytes(
+        plan, "host_driven", num_graph_nodes=5, params_in_arena=False
+    )
+
+    for arena_bytes in (standalone_bytes, aot_bytes, graph_bytes, embedded_bytes):
+        assert arena_bytes % page_bytes == 0
+        assert arena_bytes >= plan["stack_arena_bytes"]
+    # Host-driven projects additionally hold the RPC server and the inputs and outputs.
+    assert aot_bytes - standalone_bytes >= api_server.HOST_DRIVEN_RUNTIME_BYTES + plan["io_bytes"]
+    # The graph executor additionally holds its nodes and the parameters.
+    assert graph_bytes - aot_bytes >= 5 * api_server.GRAPH_EXECUTOR_NODE_BYTES
+    # Without embedded parameters, they are also uploaded into the arena by the host.
+    assert graph_bytes - embedded_bytes >= 2 * plan["constants_bytes"]
+
+
+def test_estimate_buddy_arena_bytes(api_server):
+    page_bytes = api_server.PAGE_ALLOCATOR_PAGE_BYTES
+    plan = api_server.compute_memory_plan(make_metadata(operator_workspaces=((0,),)))
+    margin = 1 + api_server.ARENA_ESTIMATE_MARGIN
+
+    def estimate(workspace_bytes):
+        return api_server.estimate_page_arena_bytes(
+            dict(plan, workspace_bytes=workspace_bytes), "aot_standalone", power_of_two_blocks=True
+        )
+
+    # The main workspace is the only allocation, rounded up to a power-of-two number of pages,
+    # plus a byte of block state per page.
+    assert estimate(3 * page_bytes) == api_server._align_up(int(4 * 257 * margin), page_bytes)
+    assert estimate(4 * page_bytes) == estimate(3 * page_bytes)
+    assert estimate(4 * page_bytes + 1) > estimate(4 * page_bytes)
+
+
+@pytest.mark.parametrize("project_type", ["host_driven", "aot_standalone"])
+def test_plan_memory_placement_l2(api_server, project_type):
+    plan = api_server.compute_memory_plan(make_metadata())
+    placement = api_server.plan_memory_placement(
+        plan, 4096, project_type, "l2", api_server.L2_SIZE_BYTES
+    )
+    assert placement == {"arena": "l2", "weights": "l2"}
+
+
+def test_plan_memory_placement_auto(api_server):
+    l1_bytes = 64 * 1024
+    plan = api_server.compute_memory_plan(make_metadata(constants_size_bytes=1024))
+    l2_size_bytes = api_server.L2_SIZE_BYTES
+
+    def place(arena_bytes):
+        return api_server.plan_memory_placement(
+            plan, arena_bytes, "aot_standalone", "auto", l2_size_bytes, l1_bytes
+        )
+
+    assert place(4096) == {"arena": "l1", "weights": "l1"}
+    # The arena comes first, the weights only get the L1 it leaves.
+    assert place(l1_bytes - 512) == {"arena": "l1", "weights": "l2"}
+    assert place(l1_bytes + 1) == {"arena": "l2", "weights": "l1"}
+
+
+def test_plan_memory_placement_exceeds_l2(api_server):
+    plan = api_server.compute_memory_plan(make_metadata())
+    available_bytes = api_server.L2_SIZE_BYTES - api_server.L2_RESERVED_BYTES
+    # The standalone firmware keeps its inputs and outputs in static buffers besides the weights.
+    max_arena_bytes = available_bytes - plan["constants_bytes"] - plan["io_bytes"]
+
+    def place(arena_bytes):
+        return api_server.plan_memory_placement(
+            plan, arena_bytes, "aot_standalone", "l2", api_server.L2_SIZE_BYTES
+        )
+
+    place(max_arena_bytes)
+    with pytest.raises(RuntimeError, match="L2"):
+        place(max_arena_bytes + 1)
+
+
+def test_read_memory_regions(api_server, tmp_path):
+    link_script_path = tmp_path / "link.ld"
+    link_script_path.write_text(
+        """OUTPUT_ARCH(riscv)
+ENTRY(_start)
+MEMORY
+{
+  L2           : ORIGIN = 0x1c000004, LENGTH = 0x0007fffc
+  /* L0 : ORIGIN = 0, LENGTH = 4K */
+  L1 (rwx)     : ORIGIN = 0x10000004, LENGTH = 64K - 4
+  ROM          : org = 0x1a000000, len = 8K
+}
+SECTIONS
+{
+}
+"""
+    )
+    # The L1 length is an expression, which is not evaluated.
+    assert api_server.read_memory_regions(link_script_path) == {
+        "L2": (0x1C000004, 0x7FFFC),
+        "ROM": (0x1A000000, 8 * 1024),
+    }
+
+
+def test_write_memory_placement_script(api_server, tmp_path):
+    script_path = tmp_path / "memory_placement.ld"
+    api_server.write_memory_placement_script(script_path, {"arena": "l1", "weights": "l2"})
+    script = script_path.read_text()
+    assert "*(.bss.tvm_arena)\n  } > L1" in script
+    assert ".rodata.tvm" not in script
+
+    api_server.write_memory_placement_script(script_path, {"arena": "l2", "weights": "l2"})
+    assert not script_path.exists()
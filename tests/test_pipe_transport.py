@@ -0,0 +1,83 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def pipes(api_server):
+    """A PipeTransport reading from and writing to two non-blocking pipes, returns
+    (transport, device_write_fd, device_read_fd) where the device_* ends stand for the simulator.
+    """
+    to_host_read, to_host_write = os.pipe()
+    to_device_read, to_device_write = os.pipe()
+    os.set_blocking(to_host_read, False)
+    os.set_blocking(to_device_write, False)
+    transport = api_server.PipeTransport(to_host_read, to_device_write)
+    yield transport, to_host_write, to_device_read
+    transport.close()
+    for fd in (to_host_read, to_device_write, to_device_read):
+        os.close(fd)
+    try:
+        os.close(to_host_write)
+    except OSError:
+        pass
+
+
+def test_read_is_served_from_read_ahead(pipes):
+    transport, device_write_fd, _ = pipes
+    os.write(device_write_fd, b"abcdef")
+    assert transport.read(2) == b"ab"
+    assert transport.read(10) == b"cdef"
+    assert transport.stats["reads"] == 1
+    assert transport.stats["bytes_read"] == 6
+
+
+def test_read_times_out(api_server, pipes):
+    transport, _, _ = pipes
+    with pytest.raises(api_server.server.IoTimeoutError):
+        transport.read(1, time.monotonic() + 0.05)
+
+
+def test_read_after_device_exit(api_server, pipes):
+    transport, device_write_fd, _ = pipes
+    os.write(device_write_fd, b"a")
+    os.close(device_write_fd)
+    assert transport.read(2) == b"a"
+    with pytest.raises(api_server.server.TransportClosedError):
+        transport.read(1)
+
+
+def test_write_waits_for_full_pipe(pipes):
+    transport, _, device_read_fd = pipes
+    data = bytes(range(256)) * 1024
+    received = bytearray()
+
+    def drain():
+        while len(received) < len(data):
+            received.extend(os.read(device_read_fd, 4096))
+
+    thread = threading.Thread(target=drain)
+    thread.start()
+    transport.write(data, time.monotonic() + 10)
+    thread.join(timeout=10)
+    assert received == data
+    assert transport.stats["bytes_written"] == len(data)
@@ -0,0 +1,60 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import pytest
+
+
+@pytest.fixture
+def prepare_calls(api_server, tmp_path, monkeypatch):
+    """Options of a fake PULP FreeRTOS and build dir whose egvsoc.sh calls are recorded instead
+    of run. Returns (options, calls).
+    """
+    freertos = tmp_path / "freertos"
+    (freertos / "support").mkdir(parents=True)
+    (freertos / "support" / "egvsoc.sh").write_text("#!/bin/sh\n")
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    (build_dir / "app").write_bytes(b"\x7fELF")
+    monkeypatch.setattr(api_server, "BUILD_DIR", build_dir)
+    # _prepare_simulator exports the toolchain path into os.environ.
+    monkeypatch.setenv("PULP_RISCV_GCC_TOOLCHAIN", "")
+    calls = []
+    monkeypatch.setattr(api_server, "check_call", lambda args, **kwargs: calls.append(args))
+    options = {
+        "toolchain": "gcc",
+        "arch": "rv32imc",
+        "abi": "ilp32",
+        "pulp_freertos_path": str(freertos),
+        "pulp_gcc_path": str(tmp_path / "gcc"),
+    }
+    return options, calls
+
+
+def test_prepare_runs_once(api_server, prepare_calls):
+    options, calls = prepare_calls
+    api_server.Handler()._prepare_simulator(options)
+    api_server.Handler()._prepare_simulator(options)
+    assert len(calls) == 1
+    assert "prepare" in calls[0]
+
+
+def test_prepare_reruns_for_new_binary(api_server, prepare_calls):
+    options, calls = prepare_calls
+    api_server.Handler()._prepare_simulator(options)
+    (api_server.BUILD_DIR / "app").write_bytes(b"\x7fELF rebuilt")
+    api_server.Handler()._prepare_simulator(options)
+    assert len(calls) == 2
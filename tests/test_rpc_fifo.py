@@ -0,0 +1,75 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import stat
+
+import pytest
+
+HOST_OPTIONS = {"toolchain": "host", "arch": "rv32imc", "abi": "ilp32", "rpc_transport": "fifo"}
+
+
+@pytest.fixture
+def build_dir(api_server, tmp_path, monkeypatch):
+    """A build dir whose app echoes the host-to-device FIFO into the device-to-host one."""
+    build_dir = tmp_path / "build"
+    build_dir.mkdir()
+    monkeypatch.setattr(api_server, "API_SERVER_DIR", tmp_path)
+    monkeypatch.setattr(api_server, "BUILD_DIR", build_dir)
+    app = build_dir / "app"
+    app.write_text(
+        "#!/bin/sh\n"
+        "echo console output\n"
+        f"exec cat {api_server.RPC_FIFO_HOST_TO_DEVICE_RELPATH} "
+        f"> {api_server.RPC_FIFO_DEVICE_TO_HOST_RELPATH}\n"
+    )
+    app.chmod(0o755)
+    return build_dir
+
+
+def test_open_rpc_fifos(api_server, build_dir):
+    handler = api_server.Handler()
+    read_fd, write_fd = handler._open_rpc_fifos()
+    try:
+        for relpath in (
+            api_server.RPC_FIFO_HOST_TO_DEVICE_RELPATH,
+            api_server.RPC_FIFO_DEVICE_TO_HOST_RELPATH,
+        ):
+            assert stat.S_ISFIFO(os.stat(build_dir / relpath).st_mode)
+        # The FIFOs which exist already are reused.
+        os.close(read_fd)
+        os.close(write_fd)
+        read_fd, write_fd = handler._open_rpc_fifos()
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+def test_session_over_fifos(api_server, build_dir):
+    handler = api_server.Handler()
+    handler.open_transport(HOST_OPTIONS)
+    try:
+        handler.write_transport(b"rpc bytes", 5)
+        data = b""
+        while len(data) < len(b"rpc bytes"):
+            data += handler.read_transport(64, 5)
+    finally:
+        handler.close_transport()
+
+    assert data == b"rpc bytes"
+    # The console output of the simulator does not mix with the RPC bytes.
+    assert (build_dir / api_server.GVSOC_CONSOLE_LOG_RELPATH).read_text() == "console output\n"
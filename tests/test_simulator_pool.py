@@ -0,0 +1,127 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import select
+import subprocess
+import threading
+import uuid
+
+import pytest
+
+
+class FakeSimulator:
+    def __init__(self, returncode=None):
+        self.returncode = returncode
+        self.terminated = False
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.terminated = True
+
+    def wait(self):
+        return self.returncode
+
+
+def test_checkout_parked_simulator(api_server):
+    launched = []
+
+    def launch():
+        launched.append(FakeSimulator())
+        return launched[-1]
+
+    pool = api_server.SimulatorPool(2, launch)
+    pool.fill()
+    assert pool.checkout() is launched[0]
+    assert pool.stats() == {"size": 2, "parked": 1, "hits": 1, "misses": 0}
+    pool.shutdown()
+    assert launched[1].terminated
+
+
+def test_checkout_discards_exited_simulator(api_server):
+    launched = [FakeSimulator(returncode=1), FakeSimulator()]
+    pool = api_server.SimulatorPool(1, lambda: launched.pop(0))
+    pool.fill()
+    proc = pool.checkout()
+    assert proc.returncode is None
+    assert pool.stats() == {"size": 1, "parked": 0, "hits": 0, "misses": 1}
+
+
+@pytest.fixture
+def daemon(api_server, tmp_path):
+    """A SimulatorPoolDaemon serving `cat` instances from a thread, stopped by removing its
+    binary. Returns (address, binary_path).
+    """
+    binary_path = tmp_path / "app"
+    binary_path.write_bytes(b"")
+    address = f"\0microtvm-gvsoc-test-{uuid.uuid4().hex}"
+    listen_sock = api_server.socket.socket(api_server.socket.AF_UNIX)
+    listen_sock.bind(address)
+    listen_sock.listen()
+
+    def launch():
+        return subprocess.Popen(
+            ["cat"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, bufsize=0
+        )
+
+    pool = api_server.SimulatorPool(1, launch)
+    daemon = api_server.SimulatorPoolDaemon(listen_sock, pool, "key", binary_path, 60)
+    thread = threading.Thread(target=daemon.serve)
+    thread.start()
+    yield address, binary_path
+    binary_path.unlink(missing_ok=True)
+    thread.join(timeout=10)
+    assert not thread.is_alive()
+
+
+def echo(proc, data):
+    os.write(proc.write_fd, data)
+    select.select([proc.read_fd], [], [], 5)
+    return os.read(proc.read_fd, len(data))
+
+
+def test_daemon_passes_simulator_pipes(api_server, daemon):
+    address, _ = daemon
+    proc = api_server.checkout_pooled_simulator(address, "key")
+    assert echo(proc, b"rpc") == b"rpc"
+    # The replacement is launched only after the session is closed.
+    assert proc.stats["parked"] == 0 and proc.stats["hits"] == 1
+    proc.terminate()
+    proc.wait()
+
+    proc = api_server.checkout_pooled_simulator(address, "key")
+    assert proc.stats["hits"] == 2 and proc.stats["misses"] == 0
+    proc.terminate()
+    proc.wait()
+
+
+def test_daemon_stops_on_other_pool_key(api_server, daemon):
+    address, _ = daemon
+    assert api_server.checkout_pooled_simulator(address, "other key") is None
+    # The daemon has released its address.
+    assert api_server.checkout_pooled_simulator(address, "key") is None
+
+
+def test_daemon_keeps_running_sessions(api_server, daemon):
+    address, binary_path = daemon
+    proc = api_server.checkout_pooled_simulator(address, "key")
+    binary_path.unlink()
+    assert echo(proc, b"rpc") == b"rpc"
+    proc.terminate()
+    proc.wait()
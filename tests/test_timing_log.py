@@ -0,0 +1,46 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import json
+
+
+def test_phases_are_appended_as_json_lines(api_server, tmp_path):
+    path = tmp_path / "timing.jsonl"
+    for event in ("build", "session"):
+        timing = api_server.TimingLog(path, event)
+        with timing.phase("compile"):
+            pass
+        with timing.phase("compile"):
+            pass
+        timing.add("bytes_read", 3)
+        timing.write()
+
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [record["event"] for record in records] == ["build", "session"]
+    for record in records:
+        assert record["compile_sec"] >= 0
+        assert record["total_sec"] >= record["compile_sec"]
+        assert record["bytes_read"] == 3
+
+
+def test_no_path_writes_nothing(api_server, tmp_path):
+    timing = api_server.TimingLog(None, "build")
+    with timing.phase("configure"):
+        pass
+    timing.write()
+    assert "configure_sec" in timing.record
+    assert not list(tmp_path.iterdir())